@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the alphabet registry
+
+Times the first use of every alphabet of morse_alphabets when it is
+compiled from its JSON file and when it is loaded from the pickled
+tables, then the encoder and decoder of each alphabet on random text of
+its own characters (checking that decoding gives the text back).
+
+Usage: python benchmarks/bench_alphabets.py [--size CHARS] [--repeat N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_alphabets import AlphabetRegistry
+
+
+# Declare functions for benchmark ==================================
+def first_use(name, cache_dir, repeat):
+    """
+    Time the loading of an alphabet by a new registry
+    :param name: Name of the alphabet
+    :param cache_dir: Directory of the compiled tables, or '' to compile every time
+    :param repeat: Number of runs
+    :return: Shortest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        registry = AlphabetRegistry(cache_dir=cache_dir)
+        start = time.perf_counter()
+        registry.get(name)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_text(alphabet, size, seed=0):
+    """
+    Build random text from the characters an alphabet decodes to
+    :param alphabet: Alphabet
+    :param size: Number of characters
+    :param seed: Seed of the random generator
+    :return: String
+    """
+    rng = random.Random(seed)
+    characters = sorted(v for v in set(alphabet.decode_table.values()) if len(v) == 1 and v not in '゛゜')
+    return ''.join(rng.choice(characters) for _ in range(size))
+
+
+def best_time(func, args, repeat):
+    """
+    Time a function
+    :return: Shortest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=10 ** 5, help='characters of text (default: 100 K)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case (default: 5)')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        registry = AlphabetRegistry(cache_dir=cache_dir)
+        print('%-9s %12s %12s %12s %12s' % ('alphabet', 'compile ms', 'cached ms', 'encode MB/s', 'decode MB/s'))
+        for name in registry.names():
+            alphabet = registry.get(name)  # also writes the pickle
+            compiled = first_use(name, '', args.repeat)
+            cached = first_use(name, cache_dir, args.repeat)
+            text = make_text(alphabet, args.size)
+            code = alphabet.encode(text)
+            if alphabet.decode(code) != text:
+                raise AssertionError('%s does not decode its own code' % name)
+            encode = best_time(alphabet.encode, (text,), args.repeat)
+            decode = best_time(alphabet.decode, (code,), args.repeat)
+            print('%-9s %12.3f %12.3f %12.1f %12.1f'
+                  % (name, compiled * 1e3, cached * 1e3, len(text) / encode / 1e6, len(code) / decode / 1e6))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
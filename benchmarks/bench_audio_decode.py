@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the audio decoder
+
+Renders text with morse_audio at several speeds, adds white noise, writes
+it to a WAV file and decodes it back with morse_audio_decoder (from the
+memory-mapped file). Prints the real-time factor (seconds of audio per
+second of decoding) and the share of characters decoded correctly.
+Needs NumPy.
+
+Usage: python benchmarks/bench_audio_decode.py [--repeat N] [--noise SIGMA]
+"""
+
+# Import modules ===================================================
+import argparse
+import difflib
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_audio import SAMPLE_RATE, render
+from morse_audio_decoder import decode_wav
+from morse_codec import decode_text, encode_text
+
+
+TEXTS = {'eng': 'cq cq de ja1xyz the quick brown fox jumps over the lazy dog 0123456789 k',
+         'jpn': 'カタカナ ガギグ パピプ ヨロシク'}
+SPEEDS = (15, 25, 40, 60)
+
+
+# Declare functions for benchmark ==================================
+def noisy_wav(path, text, select, wpm, noise, seed):
+    """
+    Write a rendered text with white noise added
+    :return: Seconds of audio
+    """
+    pcm = np.frombuffer(render(text, select, wpm=wpm), dtype='<i2').astype(np.float64)
+    pcm += np.random.default_rng(seed).normal(0, noise * 32767, len(pcm))
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(np.clip(pcm, -32768, 32767).astype('<i2').tobytes())
+    return len(pcm) / SAMPLE_RATE
+
+
+def expected_text(text, select):
+    """
+    Text the decoder should give back (katakana come back as hiragana)
+    :return: String
+    """
+    return ' '.join(decode_text(encode_text(word, select), select) for word in text.split())
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=20, help='copies of the text per recording (default: 20)')
+    parser.add_argument('--noise', type=float, default=0.4,
+                        help='standard deviation of the noise, tone peak = 0.8 (default: 0.4)')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the noise (default: 1)')
+    args = parser.parse_args()
+
+    print('%-4s %5s %12s %12s %12s %10s' % ('lang', 'wpm', 'audio (s)', 'decode (s)', 'real-time x', 'accuracy'))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'noisy.wav')
+        for select, text in TEXTS.items():
+            text = ' '.join([text] * args.repeat)
+            expected = expected_text(text, select)
+            for wpm in SPEEDS:
+                seconds = noisy_wav(path, text, select, wpm, args.noise, args.seed)
+                start = time.perf_counter()
+                result = decode_wav(path, select)
+                elapsed = time.perf_counter() - start
+                accuracy = difflib.SequenceMatcher(None, expected, result, autojunk=False).ratio()
+                print('%-4s %5d %12.1f %12.3f %12.0f %9.1f%%'
+                      % (select, wpm, seconds, elapsed, seconds / elapsed, 100 * accuracy))
+
+
+if __name__ == '__main__':
+    main()
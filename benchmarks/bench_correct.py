@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the error-tolerant decoder
+
+Corrupts a share of the codes of encoded English prose and Japanese text
+(one element dropped, added or swapped per corrupted code) and compares
+the plain decoder with morse_correct at distance 1 and 2: accuracy over
+all characters and over the corrupted codes which are no longer valid
+(a code corrupted into another valid code cannot be noticed), and
+throughput. A scan of the whole table per unknown code shows what the
+deletion index saves.
+
+Usage: python benchmarks/bench_correct.py [--size CHARS] [--rate SHARE] [--repeat N] [--seed N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import english_prose, fit
+from morse_codec import decode_tables, encode_text
+from morse_correct import CorrectionIndex, correction_index, edit_distance
+from morse_segment import default_model
+
+
+JAPANESE_TEXT = ('けさはそらがくもっていましたが、ひるからはれてきました。ばんごはんのあとで、'
+                 'ちちとむせんきょくへいきました。とおくのくにのしんごうがきこえて、とてもうれしかったです。')
+
+
+# Declare functions for benchmark ==================================
+def corrupt(tokens, rate, seed):
+    """
+    Apply one random edit to a share of the codes
+    :param tokens: List of codes
+    :param rate: Share of the codes corrupted
+    :param seed: Seed of the random generator
+    :return: List of codes
+    """
+    rng = random.Random(seed)
+    corrupted = []
+    for token in tokens:
+        if rng.random() < rate:
+            kind = rng.choice(('drop', 'add', 'swap'))
+            n = rng.randrange(len(token))
+            if kind == 'drop' and len(token) > 1:
+                token = token[:n] + token[n + 1:]
+            elif kind == 'swap':
+                token = token[:n] + ('-' if token[n] == '.' else '.') + token[n + 1:]
+            else:
+                token = token[:n] + rng.choice('.-') + token[n:]
+        corrupted.append(token)
+    return corrupted
+
+
+def scan_decode(tokens, table, max_distance):
+    """
+    Correct unknown codes by measuring the distance to every code of the table
+    :return: List of characters
+    """
+    output = []
+    for token in tokens:
+        if token in table:
+            output.append(table[token])
+            continue
+        distance, code = min((edit_distance(token, c), c) for c in table)
+        output.append(table[code] if distance <= max_distance else '[?]')
+    return output
+
+
+def best_time(func, args, repeat):
+    """
+    Time a function
+    :return: Tuple of (shortest run in seconds, result of the last run)
+    """
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=20000, help='characters of text (default: 20 K)')
+    parser.add_argument('--rate', type=float, default=0.1, help='share of corrupted codes (default: 0.1)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the corruption (default: 0)')
+    args = parser.parse_args()
+
+    samples = [('eng', english_prose(args.size).lower()), ('jpn', fit(JAPANESE_TEXT, args.size // 2))]
+    print('%-4s %-14s %9s %10s %10s %12s' % ('lang', 'decoder', 'build ms', 'accuracy', 'invalid', 'tokens/s'))
+    for select, text in samples:
+        table = decode_tables[select]
+        tokens = encode_text(text, select).split()
+        expected = [table[t] for t in tokens]
+        noisy = corrupt(tokens, args.rate, args.seed)
+        invalid = [n for n, t in enumerate(noisy) if t not in table]
+
+        default_model(select)  # trained once for the frequencies, not part of the index
+        engines = [('plain', lambda t: [table.get(c, '[?]') for c in t], 0.0)]
+        for distance in (1, 2):
+            start = time.perf_counter()
+            index = correction_index(select, distance)
+            built = (time.perf_counter() - start) * 1e3
+            engines.append(('index k=%d' % distance, lambda t, index=index: list(map(index.correct, t)), built))
+        engines.append(('scan k=1', lambda t: scan_decode(t, table, 1), 0.0))
+
+        for name, func, build in engines:
+            seconds, output = best_time(func, (noisy,), 1 if name.startswith('scan') else args.repeat)
+            right = sum(a == b for a, b in zip(output, expected))
+            fixed = sum(output[n] == expected[n] for n in invalid)
+            print('%-4s %-14s %9.2f %10.3f %10.3f %12.0f'
+                  % (select, name, build, right / len(expected), fixed / max(len(invalid), 1), len(noisy) / seconds))
+
+    cold = CorrectionIndex(decode_tables['eng'], 1)
+    unknown = sorted({t for t in corrupt(encode_text(samples[0][1], 'eng').split(), 1.0, args.seed)
+                      if t not in cold.table})
+    start = time.perf_counter()
+    for token in unknown:
+        cold.nearest(token)
+    print('\n%d distinct unknown English codes corrected in %.2f us each, without the memo'
+          % (len(unknown), (time.perf_counter() - start) / max(len(unknown), 1) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
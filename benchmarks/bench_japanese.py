@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the Japanese encoder
+
+Compares the single-pass folded table (morse_codec.encode_text) with the
+Ver 1.3.0 chain of katakana, dakuten, handakuten and small kana lookups
+followed by text_to_morse, on a large Japanese corpus.
+
+Usage: python benchmarks/bench_japanese.py [--size CHARS] [--repeat N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy
+from morse_codec import encode_text
+
+
+CORPUS = ('イロハニホヘト　チリヌルヲ　ワカヨタレソ　ツネナラム　ウヰノオクヤマ　ケフコエテ　アサキユメミシ　ヱヒモセス。'
+          'がぎぐげご　ざじずぜぞ　だぢづでど　ばびぶべぼ　ぱぴぷぺぽ、ヴァイオリン　ちょっと　キャッシュ　１２３！')
+
+
+# Declare functions for benchmark ==================================
+def best_time(func, text, repeat):
+    """
+    Time a conversion
+    :param func: Conversion function
+    :param text: Input of the function
+    :param repeat: Number of runs
+    :return: Shortest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=5 * 10 ** 6, help='characters of the corpus (default: 5 M)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine (default: 3)')
+    args = parser.parse_args()
+
+    text = (CORPUS * (args.size // len(CORPUS) + 1))[:args.size]
+    if encode_text(text, 'jpn') != legacy.change_japanese_to_morse(text):
+        raise AssertionError('the folded table differs from Ver 1.3.0')
+
+    new = best_time(lambda t: encode_text(t, 'jpn'), text, args.repeat)
+    old = best_time(legacy.change_japanese_to_morse, text, args.repeat)
+    print('%-14s %10s %12s' % ('engine', 'seconds', 'M chars/s'))
+    print('%-14s %10.3f %12.2f' % ('v1.3.0', old, len(text) / old / 1e6))
+    print('%-14s %10.3f %12.2f' % ('folded table', new, len(text) / new / 1e6))
+    print('speedup: %.1fx' % (old / new))
+
+
+if __name__ == '__main__':
+    main()
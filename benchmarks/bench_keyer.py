@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the live keyer decoder
+
+Keys text at several speeds, with the timing drifting slowly, and feeds
+the key events (and the rendered audio, frame by frame) to morse_keyer.
+Prints how many times faster than the sender the decoder runs, the
+latency of the characters and the share of the text decoded correctly
+(the first characters go by while the decoder learns the speed).
+
+Usage: python benchmarks/bench_keyer.py [--repeat N]
+"""
+
+# Import modules ===================================================
+import argparse
+import difflib
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_audio import SAMPLE_RATE, render
+from morse_codec import encode_text
+from morse_keyer import KeyerDecoder, ToneKeyer
+
+
+TEXT = 'cq cq de ja1xyz the quick brown fox jumps over the lazy dog 0123456789 k'
+SPEEDS = (20, 40, 60, 80)
+DRIFT = 0.15  # the speed swings by this share along the text
+FRAME = 24  # samples per audio frame (3 ms at 8 kHz)
+POLL = 0.003  # seconds between polls of the event decoder
+
+
+# Declare functions for benchmark ==================================
+def key_events(text, wpm):
+    """
+    Timed key events of a text with a drifting speed
+    :return: List of (time, down) pairs
+    """
+    events = []
+    at = 0.0
+    words = text.split()
+    for n, word in enumerate(words):
+        unit = 1.2 / wpm * (1 + DRIFT * math.sin(2 * math.pi * n / len(words)))
+        for code in encode_text(word, 'eng').split():
+            for element in code:
+                events.append((at, True))
+                at += unit if element == '.' else 3 * unit
+                events.append((at, False))
+                at += unit
+            at += 2 * unit
+        at += 4 * unit
+    return events
+
+
+def run_events(events):
+    """
+    Feed the events, polling every POLL seconds as a live loop would
+    :return: Tuple of (text, decoder, seconds)
+    """
+    decoder = KeyerDecoder('eng', wpm=20)
+    output = []
+    clock = 0.0
+    start = time.perf_counter()
+    for at, down in events:
+        while clock < at:
+            decoder.poll(clock)
+            clock += POLL
+        if down:
+            decoder.key_down(at)
+        else:
+            decoder.key_up(at)
+        output.extend(c.text for c in decoder.read())
+    decoder.poll(events[-1][0] + 10)
+    output.extend(c.text for c in decoder.read())
+    return ''.join(output).strip(), decoder, time.perf_counter() - start
+
+
+def run_audio(text, wpm):
+    """
+    Feed rendered audio frame by frame
+    :return: Tuple of (text, decoder, seconds)
+    """
+    pcm = render(text, wpm=wpm) + bytes(2 * SAMPLE_RATE)
+    decoder = KeyerDecoder('eng', wpm=20)
+    keyer = ToneKeyer(decoder, sample_rate=SAMPLE_RATE)
+    output = []
+    start = time.perf_counter()
+    for offset in range(0, len(pcm), 2 * FRAME):
+        keyer.feed(pcm[offset:offset + 2 * FRAME])
+        output.extend(c.text for c in decoder.read())
+    return ''.join(output).strip(), decoder, time.perf_counter() - start
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=10, help='copies of the text (default: 10)')
+    args = parser.parse_args()
+    text = ' '.join([TEXT] * args.repeat)
+
+    print('%-6s %5s %12s %12s %14s %14s %9s' % ('input', 'wpm', 'keyed (s)', 'decode (s)', 'real-time x',
+                                             'p99 latency', 'accuracy'))
+    for wpm in SPEEDS:
+        events = key_events(text, wpm)
+        for name, (result, decoder, seconds) in (('events', run_events(events)),
+                                                 ('audio', run_audio(text, wpm))):
+            keyed = events[-1][0]
+            stats = decoder.stats()
+            accuracy = difflib.SequenceMatcher(None, text, result, autojunk=False).ratio()
+            print('%-6s %5d %12.1f %12.3f %14.0f %11.1f ms %8.1f%%'
+                  % (name, wpm, keyed, seconds, keyed / seconds, 1000 * stats['latency_p99'], 100 * accuracy))
+
+
+if __name__ == '__main__':
+    main()
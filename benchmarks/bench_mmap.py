@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the memory-mapped bulk decoder
+
+Writes a file of ASCII morse code of the given size, then decodes it in
+a fresh process with the str path (read the file, decode_stream, write
+the text) and with morse_mmap.decode_file, and prints the time, MB/s and
+peak memory of each. The memory of the str path grows with the file; the
+memory of the mmap path stays near the size of one window whatever the
+size of the file, so a file larger than the memory can be decoded (its
+peak counts the pages of the file read so far, which the system drops
+when it needs the memory). The str path is skipped when the file and
+its copies would not fit in the memory.
+
+Usage: python benchmarks/bench_mmap.py [--size MB] [--lang eng|jpn] [--window BYTES] [--keep]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpora import english_prose, fit
+from morse_codec import encode_text
+from morse_mmap import WINDOW_SIZE
+
+
+JAPANESE_TEXT = ('けさはそらがくもっていましたが、ひるからはれてきました。ばんごはんのあとで、'
+                 'ちちとむせんきょくへいきました。とおくのくにのしんごうがきこえて、とてもうれしかったです。')
+
+# each statement runs in its own process and prints seconds and peak memory in KB
+STATEMENTS = {
+    'str': ('import resource, time\n'
+            'from morse_codec import decode_stream\n'
+            'start = time.perf_counter()\n'
+            'with open(%(source)r) as f, open(%(target)r, "w", encoding="utf-8") as out:\n'
+            '    out.writelines(decode_stream(f.read(), %(lang)r))\n'
+            'print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n'),
+    'mmap': ('import resource, time\n'
+             'from morse_mmap import decode_file\n'
+             'start = time.perf_counter()\n'
+             'decode_file(%(source)r, %(target)r, %(lang)r, %(window)d)\n'
+             'print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n'),
+}
+
+
+# Declare functions for benchmark ==================================
+def write_input(path, size, lang):
+    """
+    Write a file of morse code, a block at a time
+    :param path: Path of the file
+    :param size: Bytes of the file
+    :param lang: A parameter for language
+    :return: None
+    """
+    text = english_prose(20000).lower() if lang == 'eng' else fit(JAPANESE_TEXT, 5000)
+    block = (encode_text(text, lang) + ' ').encode('ascii')
+    with open(path, 'wb') as f:
+        while size > 0:
+            f.write(block[:size])
+            size -= len(block)
+
+
+def memory_size():
+    """
+    Physical memory of the machine
+    :return: Bytes, or None if unknown
+    """
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def run(name, source, target, lang, window):
+    """
+    Decode the file in a fresh process
+    :return: Tuple of (seconds, peak memory in MB)
+    """
+    statement = STATEMENTS[name] % {'source': source, 'target': target, 'lang': lang, 'window': window}
+    result = subprocess.run([sys.executable, '-c', statement], cwd=ROOT, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True)
+    seconds, peak = result.stdout.split()
+    return float(seconds), int(peak) / 1024
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=256, help='MB of morse code (default: 256)')
+    parser.add_argument('--lang', choices=('eng', 'jpn'), default='eng', help='language (default: eng)')
+    parser.add_argument('--window', type=int, default=WINDOW_SIZE,
+                        help='bytes decoded at once by the mmap path (default: %d)' % WINDOW_SIZE)
+    parser.add_argument('--keep', action='store_true', help='keep the files in the temporary directory')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, 'input.txt')
+    size = args.size * 10 ** 6
+    write_input(source, size, args.lang)
+    memory = memory_size()
+    print('input: %d MB, memory: %s MB' % (args.size, memory // 10 ** 6 if memory else 'unknown'))
+
+    print('%-6s %10s %10s %12s' % ('path', 'seconds', 'MB/s', 'peak MB'))
+    outputs = []
+    for name in ('str', 'mmap'):
+        if name == 'str' and memory and size * 6 > memory:  # the file, its str and the output
+            print('%-6s %10s %10s %12s' % (name, '-', '-', 'too large'))
+            continue
+        target = os.path.join(directory, name + '.txt')
+        seconds, peak = run(name, source, target, args.lang, args.window)
+        outputs.append(target)
+        print('%-6s %10.3f %10.1f %12.1f' % (name, seconds, args.size / seconds, peak))
+
+    if len(outputs) == 2:
+        with open(outputs[0], 'rb') as a, open(outputs[1], 'rb') as b:
+            if a.read() != b.read():
+                raise AssertionError('the outputs of the two paths differ')
+    if args.keep:
+        print('files kept in %s' % directory)
+    else:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the vectorized batch encoder
+
+Compares morse_numpy.encode_batch with encoding the same column row by
+row through morse_codec.encode_text, and checks the results are equal.
+Needs NumPy.
+
+Usage: python benchmarks/bench_numpy.py [--rows N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_codec import encode_text
+from morse_numpy import encode_batch, get_token_table
+
+
+COLUMNS = {'eng': 'CQ CQ DE JA1XYZ K / status %d OK',
+           'jpn': 'カタカナ　ガギグ　パピプ　ひらがな　%d'}
+
+
+# Declare functions for benchmark ==================================
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--rows', type=int, default=200000, help='rows per column (default: 200000)')
+    args = parser.parse_args()
+
+    print('%-4s %10s %12s %12s %8s' % ('lang', 'rows', 'rows (s)', 'batch (s)', 'speedup'))
+    for select, pattern in COLUMNS.items():
+        column = [pattern % n for n in range(args.rows)]
+        get_token_table(select)  # built once per process, not part of the timing
+
+        start = time.perf_counter()
+        expected = [encode_text(text, select) for text in column]
+        per_row = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = encode_batch(column, select)
+        batch = time.perf_counter() - start
+
+        if result != expected:
+            raise AssertionError('encode_batch differs from encode_text (%s)' % select)
+        print('%-4s %10d %12.3f %12.3f %8.2f' % (select, args.rows, per_row, batch, per_row / batch))
+
+
+if __name__ == '__main__':
+    main()
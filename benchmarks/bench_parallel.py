@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scaling benchmark of the parallel conversion
+
+Times translate_parallel with 1, 2, 4 and N (all CPUs) workers on a
+synthetic corpus and prints the speedup over the single-process codec.
+
+Usage: python benchmarks/bench_parallel.py [--size CHARS] [--chunk-size CHARS]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_codec import convert
+from morse_parallel import PARALLEL_CHUNK_SIZE, translate_parallel
+
+
+SAMPLES = {'eng2morse': 'The quick brown fox jumps over the lazy dog, 1234567890 times! ',
+           'jpn2morse': 'イロハニホヘト　チリヌルヲ　ワカヨタレソ　ツネナラム、がぎぐげご　ぱぴぷぺぽ。'}
+
+
+# Declare functions for benchmark ==================================
+def make_corpora(size):
+    """
+    Build an input of the given size for every direction
+    :param size: Number of characters of the texts
+    :return: Dictionary of direction to input
+    """
+    corpora = {}
+    for direction, sample in SAMPLES.items():
+        text = (sample * (size // len(sample) + 1))[:size]
+        corpora[direction] = text
+        corpora['morse2' + direction[:3]] = convert(text, direction)
+    return corpora
+
+
+def timed(func, *args):
+    """
+    Time one call
+    :param func: Function to call
+    :param args: Arguments of the function
+    :return: Tuple of (result, seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=20 * 10 ** 6, help='characters of text (default: 20 M)')
+    parser.add_argument('--chunk-size', type=int, default=PARALLEL_CHUNK_SIZE, help='characters per job')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cpus})
+    print('CPUs: %d' % cpus)
+    print('%-10s %8s %10s %10s %8s' % ('direction', 'workers', 'seconds', 'MB/s', 'speedup'))
+    for direction, text in make_corpora(args.size).items():
+        expected, serial = timed(convert, text, direction)
+        print('%-10s %8s %10.3f %10.1f %8.2f' % (direction, 'serial', serial, len(text) / serial / 1e6, 1.0))
+        for workers in counts:
+            result, seconds = timed(translate_parallel, text, direction, workers, args.chunk_size)
+            if result != expected:
+                raise AssertionError('%s with %d workers differs from the serial result' % (direction, workers))
+            print('%-10s %8d %10.3f %10.1f %8.2f' % (direction, workers, seconds,
+                                                     len(text) / seconds / 1e6, serial / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the translation worker pool
+
+Converts many short messages (the load of a service) with a
+ProcessPoolExecutor taking one job per call, and with morse_pool's
+TranslationPool without and with batching. Prints jobs/s, the mean
+latency of a job and the utilization of the workers reported by the pool.
+
+Usage: python benchmarks/bench_pool.py [--jobs N] [--workers N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import english_prose
+from morse_codec import convert
+from morse_pool import TranslationPool
+
+
+# Declare functions for benchmark ==================================
+def messages(count):
+    """
+    Short messages of 10 to 80 characters, half English text and half morse code
+    :param count: Number of messages
+    :return: List of (direction, text)
+    """
+    prose = english_prose(100 * count)
+    jobs = []
+    for n in range(count):
+        text = prose[100 * n:100 * n + 10 + n % 71]
+        jobs.append(('eng2morse', text) if n % 2 else ('morse2eng', convert(text, 'eng2morse')))
+    return jobs
+
+
+def run(submit, jobs):
+    """
+    Submit every job, then wait for all of them
+    :param submit: Function of (direction, text) returning a Future
+    :param jobs: List of (direction, text)
+    :return: Tuple of (seconds, mean latency in ms, results)
+    """
+    start = time.perf_counter()
+    sent = []
+    for direction, text in jobs:
+        sent.append((time.perf_counter(), submit(direction, text)))
+    latencies = []
+    results = []
+    for at, future in sent:
+        results.append(future.result())
+        latencies.append(time.perf_counter() - at)
+    return time.perf_counter() - start, sum(latencies) / len(latencies) * 1e3, results
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=20000, help='number of messages (default: 20000)')
+    parser.add_argument('--workers', type=int, default=0, help='processes, 0 for one per CPU (default: 0)')
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    jobs = messages(args.jobs)
+    expected = [convert(text, direction) for direction, text in jobs]
+    print('%d jobs, %d worker(s)' % (len(jobs), workers))
+    print('%-22s %10s %10s %14s %12s' % ('pool', 'seconds', 'jobs/s', 'latency ms', 'utilization'))
+
+    with ProcessPoolExecutor(workers) as executor:
+        executor.submit(convert, 'a', 'eng2morse').result()  # start the processes
+        seconds, latency, results = run(lambda d, t: executor.submit(convert, t, d), jobs)
+    if results != expected:
+        raise AssertionError('ProcessPoolExecutor gave different results')
+    print('%-22s %10.3f %10.0f %14.2f %12s' % ('ProcessPoolExecutor', seconds, len(jobs) / seconds, latency, '-'))
+
+    for name, batch_jobs in (('TranslationPool, 1/job', 1), ('TranslationPool', None)):
+        options = {} if batch_jobs is None else {'batch_jobs': batch_jobs}
+        with TranslationPool(workers, **options) as pool:
+            pool.submit('eng2morse', 'a').result()
+            seconds, latency, results = run(pool.submit, jobs)
+            stats = pool.stats()
+        if results != expected:
+            raise AssertionError('%s gave different results' % name)
+        utilization = sum(w['utilization'] for w in stats['workers']) / len(stats['workers'])
+        print('%-22s %10.3f %10.0f %14.2f %11.1f%%' % (name, seconds, len(jobs) / seconds, latency,
+                                                        100 * utilization))
+        print('%-22s %d batches, %.1f jobs per batch' % ('', stats['batches'], stats['jobs_per_batch']))
+
+
+if __name__ == '__main__':
+    main()
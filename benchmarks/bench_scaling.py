@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scaling benchmark of the encoder and decoder
+
+Times change_english_to_morse and change_morse_to_english on inputs from
+1 KB up to 100 MB and prints the cost per input byte. A linear-time
+engine keeps ns/byte roughly flat as the input grows. The Ver 1.3.0
+functions (benchmarks/legacy.py) are timed next to them up to
+--legacy-max bytes.
+
+Usage: python benchmarks/bench_scaling.py [--max-size BYTES] [--legacy-max BYTES]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy
+from morse_codec import change_english_to_morse, change_morse_to_english
+
+
+SAMPLE = 'The quick brown fox jumps over the lazy dog, 1234567890 times! (Really?) '
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+
+
+# Declare functions for benchmark ==================================
+def make_input(sample, size):
+    """
+    Repeat a sample up to the given size
+    :param sample: Text to repeat
+    :param size: Length of the result
+    :return: Text of the given length
+    """
+    return (sample * (size // len(sample) + 1))[:size]
+
+
+def best_time(func, text, repeat):
+    """
+    Time a conversion
+    :param func: Conversion function
+    :param text: Input of the function
+    :param repeat: Number of runs
+    :return: Shortest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--max-size', type=int, default=10 ** 8, help='largest input in bytes (default: 100 MB)')
+    parser.add_argument('--legacy-max', type=int, default=10 ** 6, help='largest input for Ver 1.3.0 (default: 1 MB)')
+    args = parser.parse_args()
+
+    morse_sample = change_english_to_morse(SAMPLE)
+    cases = [('eng -> morse', SAMPLE, change_english_to_morse, legacy.change_english_to_morse),
+             ('morse -> eng', morse_sample, change_morse_to_english, legacy.change_morse_to_english)]
+
+    print('%-13s %12s %10s %10s %10s %10s' % ('direction', 'size', 'seconds', 'MB/s', 'ns/byte', 'v1.3 ns/B'))
+    for name, sample, func, legacy_func in cases:
+        for size in [s for s in SIZES if s <= args.max_size]:
+            text = make_input(sample, size)
+            repeat = 5 if size <= 10 ** 6 else 1
+            seconds = best_time(func, text, repeat)
+            legacy_cost = '-'
+            if size <= args.legacy_max:
+                legacy_cost = '%.1f' % (best_time(legacy_func, text, repeat) / size * 1e9)
+            print('%-13s %12d %10.4f %10.1f %10.1f %10s' % (name, size, seconds, size / seconds / 1e6,
+                                                            seconds / size * 1e9, legacy_cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the segmentation of unspaced morse code
+
+Removes and adds spaces at random in encoded English prose and Japanese
+text, then compares the character accuracy of the plain decoder
+(morse_codec.decode_text, which trusts every space) with the Viterbi
+decoder of morse_segment. A second table times the Viterbi decoder on
+longer and longer transmissions: the time per dot or dash should stay
+flat.
+
+Usage: python benchmarks/bench_segment.py [--beam N] [--sizes N ...] [--seed N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import english_prose, fit
+from morse_codec import decode_text, encode_text
+from morse_segment import BEAM, Segmenter, default_model
+
+
+JAPANESE_TEXT = ('けさはそらがくもっていましたが、ひるからはれてきました。ばんごはんのあとで、'
+                 'ちちとむせんきょくへいきました。とおくのくにのしんごうがきこえて、とてもうれしかったです。')
+
+# name, probability of a missing space, probability of an extra space inside a code
+NOISES = [('clean', 0.0, 0.0), ('10% missing', 0.1, 0.0), ('10% missing, 2% extra', 0.1, 0.02),
+          ('30% missing, 5% extra', 0.3, 0.05), ('no spaces', 1.0, 0.0)]
+
+
+# Declare functions for benchmark ==================================
+def add_noise(code, missing, extra, seed):
+    """
+    Remove spaces between codes and add spaces inside codes at random
+    :param code: Codes separated by spaces
+    :param missing: Probability that a space is removed
+    :param extra: Probability that a code is cut in two
+    :param seed: Seed of the random generator
+    :return: Noisy morse code
+    """
+    rng = random.Random(seed)
+    pieces = []
+    for token in code.split():
+        if len(token) > 1 and rng.random() < extra:
+            cut = rng.randrange(1, len(token))
+            token = token[:cut] + ' ' + token[cut:]
+        pieces.append(token)
+        pieces.append('' if rng.random() < missing else ' ')
+    return ''.join(pieces)
+
+
+def accuracy(output, expected):
+    """
+    Character accuracy: 1 - edit distance / length of the expected text
+    :return: Share of the expected text (may be below 0)
+    """
+    previous = list(range(len(expected) + 1))
+    for i, a in enumerate(output, 1):
+        current = [i]
+        for j, b in enumerate(expected, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a != b)))
+        previous = current
+    return 1 - previous[-1] / max(len(expected), 1)
+
+
+def main():
+    """
+    Run the benchmark and print two tables
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--beam', type=int, default=BEAM, help='beam width (default: %d)' % BEAM)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5],
+                        help='characters of text in the timing table (default: 1 K, 10 K, 100 K)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the noise (default: 0)')
+    args = parser.parse_args()
+
+    samples = [('eng', english_prose(600).lower()), ('jpn', fit(JAPANESE_TEXT, 200))]
+    start = time.perf_counter()
+    for select, _ in samples:
+        default_model(select)
+    print('models trained in %.3f s' % (time.perf_counter() - start))
+
+    print('%-4s %-22s %10s %10s' % ('lang', 'noise', 'plain', 'viterbi'))
+    for select, text in samples:
+        code = encode_text(text, select)
+        expected = decode_text(code, select)
+        segmenter = Segmenter(select, beam=args.beam)
+        for name, missing, extra in NOISES:
+            noisy = add_noise(code, missing, extra, args.seed)
+            print('%-4s %-22s %10.3f %10.3f' % (select, name, accuracy(decode_text(noisy, select), expected),
+                                                accuracy(segmenter.decode(noisy), expected)))
+
+    print()
+    print('%10s %10s %10s %14s' % ('chars', 'symbols', 'seconds', 'us per symbol'))
+    segmenter = Segmenter('eng', beam=args.beam)
+    for size in args.sizes:
+        noisy = add_noise(encode_text(english_prose(size), 'eng'), 0.1, 0.02, args.seed)
+        symbols = noisy.count('.') + noisy.count('-')
+        start = time.perf_counter()
+        segmenter.decode(noisy)
+        seconds = time.perf_counter() - start
+        print('%10d %10d %10.3f %14.1f' % (size, symbols, seconds, seconds / symbols * 1e6))
+
+
+if __name__ == '__main__':
+    main()
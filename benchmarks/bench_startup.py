@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Startup benchmark
+
+Compares how long a fresh interpreter takes to import the headless codec
+(morse_codec) with the imports the GUI script performs before it opens
+its window (tkinter, ttk, messagebox, pyperclip and the codec).
+
+Usage: python benchmarks/bench_startup.py [--runs N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [('interpreter only', 'pass'),
+         ('headless codec', 'import morse_codec'),
+         ('tkinter only', 'import tkinter; from tkinter import messagebox, ttk'),
+         ('GUI script imports', 'import tkinter; from tkinter import messagebox, ttk; '
+                                'import pyperclip; import morse_codec')]
+
+
+# Declare functions for benchmark ==================================
+def time_statement(statement, runs):
+    """
+    Time a statement in fresh interpreters
+    :param statement: Python code to run with -c
+    :param runs: Number of interpreters to start
+    :return: List of wall times in seconds, or None if the statement fails
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', statement], cwd=ROOT,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return times
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--runs', type=int, default=20, help='interpreters per case (default: 20)')
+    args = parser.parse_args()
+
+    baseline = None
+    print('%-20s %12s %12s' % ('case', 'median ms', 'over base'))
+    for name, statement in CASES:
+        times = time_statement(statement, args.runs)
+        if times is None:
+            print('%-20s %12s' % (name, 'skipped (import failed)'))
+            continue
+        median = statistics.median(times) * 1000
+        if baseline is None:
+            baseline = median
+        print('%-20s %12.1f %12.1f' % (name, median, median - baseline))
+
+
+if __name__ == '__main__':
+    main()
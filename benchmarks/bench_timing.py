@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the keying timing
+
+Compares two ways of getting the on/off timing of a text: encoding it to
+a morse string and parsing the string again (morse_timing.morse_timing),
+and encoding it straight into the timing (morse_timing.encode_timing).
+Prints the time, the peak memory and the size of the result of each, and
+times the audio rendering and the duration estimate from the timing.
+
+Usage: python benchmarks/bench_timing.py [--size CHARS] [--repeat N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import english_prose, fit
+from morse_audio import render, render_timing
+from morse_codec import encode_text
+from morse_timing import duration, encode_timing, get_timing_table, morse_timing
+
+
+JAPANESE_TEXT = ('けさはそらがくもっていましたが、ひるからはれてきました。ばんごはんのあとで、'
+                 'ちちとむせんきょくへいきました。とおくのくにのしんごうがきこえて、とてもうれしかったです。')
+
+
+# Declare functions for benchmark ==================================
+def through_string(text, select):
+    """
+    Timing of a text through its morse string
+    :return: array('H')
+    """
+    return morse_timing(' / '.join(encode_text(word, select) for word in text.split()))
+
+
+def measure(func, args, repeat):
+    """
+    Time a function and trace its peak memory
+    :return: Tuple of (shortest run in seconds, peak bytes, result)
+    """
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=10 ** 6, help='characters of text (default: 1 M)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case (default: 3)')
+    args = parser.parse_args()
+
+    samples = [('eng', english_prose(args.size)), ('jpn', fit(JAPANESE_TEXT, args.size // 2))]
+    print('%-4s %-16s %10s %12s %12s' % ('lang', 'path', 'seconds', 'peak MB', 'result MB'))
+    for select, text in samples:
+        get_timing_table(select)  # built once, not part of the runs
+        expected = None
+        for name, func in (('string + parse', through_string), ('encode_timing', encode_timing)):
+            seconds, peak, timing = measure(func, (text, select), args.repeat)
+            if expected is not None and timing != expected:
+                raise AssertionError('%s: the two timings differ' % select)
+            expected = timing
+            print('%-4s %-16s %10.3f %12.1f %12.1f' % (select, name, seconds, peak / 1e6,
+                                                       len(timing) * timing.itemsize / 1e6))
+        seconds, _, estimate = measure(duration, (expected,), args.repeat)
+        print('%-4s %-16s %10.3f   (%.0f s of keying at 20 WPM)' % (select, 'duration', seconds, estimate))
+
+    short = english_prose(2000)
+    seconds, _, pcm = measure(render, (short,), 1)
+    print('\nrender 2 K characters: text %.3f s' % seconds, end='')
+    timing = encode_timing(short)
+    seconds, _, same = measure(render_timing, (timing,), 1)
+    if same != pcm:
+        raise AssertionError('render_timing differs from render')
+    print(', timing %.3f s' % seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the binary tree decoder
+
+Compares morse_tree.decode_tree with the dictionary decoder of the codec
+(morse_codec.decode_text) and with the Ver 1.3.0 functions on English and
+Japanese morse code, including a share of malformed codes.
+
+Usage: python benchmarks/bench_tree.py [--size CHARS] [--repeat N]
+"""
+
+# Import modules ===================================================
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy
+from morse_codec import decode_text, morse_eng, morse_eng_sym, morse_jpn, morse_jpn_sym
+from morse_tree import decode_tree
+
+
+# Declare functions for benchmark ==================================
+def make_morse(codes, size, bad_ratio, seed=0):
+    """
+    Build random morse code
+    :param codes: List of valid codes
+    :param size: Approximate number of characters
+    :param bad_ratio: Share of malformed codes
+    :param seed: Seed of the random generator
+    :return: Codes separated by spaces
+    """
+    rng = random.Random(seed)
+    bad = ['.-.-.-.-', '..--..--', 'x', '.-?']
+    tokens = []
+    length = 0
+    while length < size:
+        token = rng.choice(bad) if rng.random() < bad_ratio else rng.choice(codes)
+        tokens.append(token)
+        length += len(token) + 1
+    return ' '.join(tokens)
+
+
+def best_time(func, args, repeat):
+    """
+    Time a function
+    :param func: Function to call
+    :param args: Arguments of the function
+    :param repeat: Number of runs
+    :return: Shortest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """
+    Run the benchmark and print a table
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size', type=int, default=10 ** 6, help='characters of morse code (default: 1 M)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case (default: 3)')
+    args = parser.parse_args()
+
+    engines = [('dict (codec)', lambda text, select: decode_text(text, select)),
+               ('tree', decode_tree),
+               ('v1.3.0', lambda text, select: (legacy.change_morse_to_english(text) if select == 'eng'
+                                                else legacy.change_morse_to_japanese(text)))]
+    inputs = [('eng', 'clean', make_morse(list(morse_eng) + list(morse_eng_sym), args.size, 0.0)),
+              ('eng', '5% bad', make_morse(list(morse_eng) + list(morse_eng_sym), args.size, 0.05)),
+              ('jpn', 'clean', make_morse(list(morse_jpn) + list(morse_jpn_sym), args.size, 0.0))]
+
+    print('%-4s %-7s %-13s %10s %10s' % ('lang', 'input', 'engine', 'seconds', 'MB/s'))
+    for select, name, text in inputs:
+        expected = decode_text(text, select)
+        for engine, func in engines:
+            if engine != 'v1.3.0' and func(text, select) != expected:
+                raise AssertionError('%s gives a different result' % engine)
+            seconds = best_time(func, (text, select), args.repeat)
+            print('%-4s %-7s %-13s %10.4f %10.1f' % (select, name, engine, seconds, len(text) / seconds / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+Corpora of the benchmarks
+
+Deterministic synthetic and realistic inputs for every direction. Every
+builder takes the number of characters wanted and a seed, so two runs
+(or two machines) time exactly the same text.
+"""
+
+# Import modules ===================================================
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_codec import (dakuten_to_kana, encode_text, handakuten_to_kana, katakana_to_hiragana,
+                         morse_eng, morse_eng_sym, morse_jpn, morse_jpn_sym, reverse_morse_eng_sym)
+
+
+PROSE = ('It was the best of times, it was the worst of times, it was the age of wisdom, it was the '
+         'age of foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the '
+         'season of Light, it was the season of Darkness, it was the spring of hope, it was the winter '
+         'of despair. CQ CQ DE W1AW K. QTH: Newington, CT; RST 599? 73! ')
+
+KATAKANA = [k for k in katakana_to_hiragana if k not in 'ァィゥェォャュョッヮ']
+VOICED = [k for k, v in katakana_to_hiragana.items() if v in dakuten_to_kana or v in handakuten_to_kana]
+
+
+# Declare functions for corpora ====================================
+def fit(text, size):
+    """
+    Repeat or cut a text to the given size
+    :param text: Sample text
+    :param size: Number of characters
+    :return: Text of the given size
+    """
+    return (text * (size // max(len(text), 1) + 1))[:size]
+
+
+def english_prose(size, seed=0):
+    """
+    English prose with a little punctuation
+    :param size: Number of characters
+    :param seed: Unused, for a common signature
+    :return: Text
+    """
+    return fit(PROSE, size)
+
+
+def symbol_heavy(size, seed=0):
+    """
+    Digits and punctuation with a few letters
+    :param size: Number of characters
+    :param seed: Seed of the random generator
+    :return: Text
+    """
+    rng = random.Random(seed)
+    symbols = list(reverse_morse_eng_sym) + list('abcxyz ')
+    return ''.join(rng.choice(symbols) for _ in range(size))
+
+
+def katakana_dakuten(size, seed=0):
+    """
+    Katakana words where half of the characters are voiced
+    :param size: Number of characters
+    :param seed: Seed of the random generator
+    :return: Text
+    """
+    rng = random.Random(seed)
+    chars = []
+    while len(chars) < size:
+        chars.extend(rng.choice(VOICED) if rng.random() < 0.5 else rng.choice(KATAKANA)
+                     for _ in range(rng.randint(2, 8)))
+        chars.append('　')
+    return ''.join(chars[:size])
+
+
+def morse_of(builder, direction):
+    """
+    Make a morse corpus builder from a text corpus builder
+    :param builder: Text corpus builder
+    :param direction: 'eng2morse' or 'jpn2morse'
+    :return: Builder of morse code of about the given size
+    """
+    select = direction[:3]
+
+    def build(size, seed=0):
+        morse = encode_text(builder(size // 4 + 1, seed), select)
+        return fit(morse, size).rsplit(' ', 1)[0] + ' '
+
+    return build
+
+
+def malformed_morse(select):
+    """
+    Make a builder of morse code with missing and extra spaces and broken codes
+    :param select: A parameter for language
+    :return: Builder of morse code
+    """
+    codes = list(morse_eng) + list(morse_eng_sym) if select == 'eng' else list(morse_jpn) + list(morse_jpn_sym)
+
+    def build(size, seed=0):
+        rng = random.Random(seed)
+        parts = []
+        length = 0
+        while length < size:
+            roll = rng.random()
+            if roll < 0.05:
+                part = rng.choice(codes) + rng.choice(codes) + ' '  # missing space
+            elif roll < 0.10:
+                part = rng.choice(codes) + '   '  # extra spaces
+            elif roll < 0.15:
+                part = rng.choice(['.-.-.-.-.', '--x-', '?', '._.']) + ' '  # broken code
+            else:
+                part = rng.choice(codes) + ' '
+            parts.append(part)
+            length += len(part)
+        return ''.join(parts)[:size]
+
+    return build
+
+
+CORPORA = {'english-prose': english_prose,
+           'symbol-heavy': symbol_heavy,
+           'katakana-dakuten': katakana_dakuten,
+           'morse-english': morse_of(english_prose, 'eng2morse'),
+           'morse-symbols': morse_of(symbol_heavy, 'eng2morse'),
+           'morse-katakana': morse_of(katakana_dakuten, 'jpn2morse'),
+           'malformed-english': malformed_morse('eng'),
+           'malformed-japanese': malformed_morse('jpn')}
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+
+"""
+Differential fuzz harness of the conversion engines
+
+Generates random English, kana and symbol texts (katakana, voiced and
+small kana, half-width forms, unknown characters and odd whitespace
+included) and random morse code (unknown and overlong codes, detached
+points, runs of whitespace), and checks that every fast path gives
+exactly what the functions of Ver 1.3.0 (benchmarks/legacy.py) give:
+
+    codec      morse_codec.convert
+    stream     morse_codec.convert_stream, on input cut at random places
+    parallel   morse_parallel.translate_parallel, with small chunks
+    live       morse_live.IncrementalTranslator, after a random edit
+    alphabets  morse_alphabets.convert_alphabet
+    tree       morse_tree.decode_tree (decoding)
+    mmap       morse_mmap.decode_bytes with random windows (ASCII morse code, NumPy)
+    numpy      morse_numpy.encode_batch (encoding, NumPy)
+    timing     morse_timing.encode_timing against the timing of the legacy codes
+
+It also checks round trips: decoding the encoding of known characters
+gives them back (lower-case English, normalized Japanese which does not
+change when it is converted again), and encoding the decoding of valid
+codes gives the same codes.
+
+Two differences from Ver 1.3.0 are intended and left out: the codec also
+folds half-width katakana, combining points and full-width punctuation
+(Ver 1.3.0 gave '[?]'), so the reference gets these characters folded
+first; and Ver 1.3.0 raised IndexError on Japanese code starting with a
+point, so such cases are skipped.
+
+The time of every engine and of the reference on the same cases is
+recorded in the same run, so a speedup or a regression shows up next to
+the check. The exit status is 1 if any output differs.
+
+Usage: python benchmarks/fuzz_differential.py [--cases N] [--seed N] [--max-length N]
+                                              [--engines NAME ...] [--save FILE]
+"""
+
+# Import modules ===================================================
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy
+from morse_alphabets import convert_alphabet
+from morse_codec import (DIRECTIONS, combining_to_ten, convert, convert_stream, dakuten_to_kana,
+                         fullwidth_to_jpn_sym, handakuten_to_kana, japanese_folding, katakana_to_hiragana,
+                         morse_eng, morse_eng_sym, morse_jpn, morse_jpn_sym, parse_direction,
+                         reverse_morse_eng, reverse_morse_eng_sym, reverse_morse_jpn, reverse_morse_jpn_sym,
+                         small_kana)
+from morse_live import IncrementalTranslator
+from morse_parallel import translate_parallel
+from morse_timing import encode_timing, morse_timing
+from morse_tree import decode_tree
+
+try:
+    from morse_mmap import decode_bytes
+    from morse_numpy import encode_batch
+except ImportError:  # NumPy is not installed
+    decode_bytes = encode_batch = None
+
+
+# characters the codec folds and Ver 1.3.0 did not know
+FOLDED_EXTENSIONS = {k: v for k, v in japanese_folding.items()
+                     if k in combining_to_ten or k in fullwidth_to_jpn_sym or 0xFF61 <= ord(k) < 0xFFA0}
+
+SPACES = [' ', ' ', ' ', '  ', '\t', '\n', '　', '\x1c']
+UNKNOWN_CHARS = list('~[]{}^漢字éß€\\') + ['\U0001F600']
+ENGLISH_CHARS = list(reverse_morse_eng) + [c.upper() for c in reverse_morse_eng] + list(reverse_morse_eng_sym)
+JAPANESE_CHARS = (list(reverse_morse_jpn) + list(reverse_morse_jpn_sym) + list(katakana_to_hiragana)
+                  + list(dakuten_to_kana) + list(handakuten_to_kana) + list(small_kana))
+BROKEN_CODES = ['........', '.-.-.-.-', '-.-.-.-.-', 'x', '[?]', '.-x', '/', '—', '．']
+
+
+# Declare functions for inputs =====================================
+def case_length(rng, max_length):
+    """
+    Length of one case: mostly short, sometimes long
+    :return: Number of characters or codes
+    """
+    draw = rng.random()
+    if draw < 0.7:
+        return rng.randrange(0, 20)
+    if draw < 0.95:
+        return rng.randrange(20, 300)
+    return rng.randrange(300, max(max_length, 301))
+
+
+def random_text(rng, select, length, known=False):
+    """
+    Random English or Japanese text
+    :param known: Only characters of the code table and spaces
+    :return: String
+    """
+    chars = ENGLISH_CHARS if select == 'eng' else JAPANESE_CHARS
+    pieces = []
+    for _ in range(length):
+        draw = rng.random()
+        if draw < 0.15:
+            pieces.append(rng.choice(SPACES) if not known else ' ')
+        elif draw < 0.2 and not known:
+            pieces.append(rng.choice(UNKNOWN_CHARS + (list(FOLDED_EXTENSIONS) if select == 'jpn' else [])))
+        else:
+            pieces.append(rng.choice(chars))
+    return ''.join(pieces)
+
+
+def random_morse(rng, select, length, known=False, ascii_only=False):
+    """
+    Random morse code
+    :param known: Only valid codes separated by single spaces
+    :param ascii_only: Only ASCII characters
+    :return: String
+    """
+    table = dict(morse_eng_sym, **morse_eng) if select == 'eng' else dict(morse_jpn_sym, **morse_jpn)
+    codes = list(table)
+    if select == 'jpn':
+        codes += ['..', '..--.'] * 4  # detached points, often
+    if known:
+        return ' '.join(rng.choice(codes) for _ in range(length))
+    spaces = [s for s in SPACES if s.isascii()] if ascii_only else SPACES
+    broken = [c for c in BROKEN_CODES if c.isascii()] if ascii_only else BROKEN_CODES
+    pieces = [rng.choice(spaces)] if rng.random() < 0.2 else []
+    for _ in range(length):
+        pieces.append(rng.choice(broken) if rng.random() < 0.05 else rng.choice(codes))
+        pieces.append(rng.choice(spaces))
+    if pieces and rng.random() < 0.5:
+        pieces.pop()  # no whitespace at the end
+    return ''.join(pieces)
+
+
+def random_input(rng, direction, max_length):
+    """
+    Random input of a direction
+    :return: String
+    """
+    encode, select = parse_direction(direction)
+    length = case_length(rng, max_length)
+    if encode:
+        return random_text(rng, select, length)
+    return random_morse(rng, select, length, ascii_only=rng.random() < 0.5)
+
+
+def random_pieces(rng, text):
+    """
+    Cut a text at random places, as a stream would deliver it
+    :return: List of strings
+    """
+    cuts = sorted(rng.randrange(len(text) + 1) for _ in range(rng.randrange(0, 6)))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+# Declare functions for reference ==================================
+LEGACY = dict(zip(DIRECTIONS, (legacy.change_english_to_morse, legacy.change_morse_to_english,
+                               legacy.change_japanese_to_morse, legacy.change_morse_to_japanese)))
+
+
+def reference(text, direction):
+    """
+    Output of Ver 1.3.0, with the intended extensions applied to its input
+    :param text: String to convert
+    :param direction: One of DIRECTIONS
+    :return: Converted text
+    :raise IndexError: Where Ver 1.3.0 failed
+    """
+    if direction == 'jpn2morse':
+        text = ''.join([FOLDED_EXTENSIONS.get(k, k) for k in text])
+    return LEGACY[direction](text)
+
+
+def reference_timing(text, direction):
+    """
+    Timing of the codes Ver 1.3.0 gives for every word
+    :return: array('H')
+    """
+    return morse_timing(' / '.join(reference(word, direction) for word in text.split()))
+
+
+# Declare functions for engines ====================================
+def run_stream(text, direction, rng):
+    """
+    :return: Output of convert_stream on the text cut at random places
+    """
+    return ''.join(convert_stream(random_pieces(rng, text), direction, rng.choice((1, 4, 64, 1 << 16))))
+
+
+def run_parallel(text, direction, rng):
+    """
+    :return: Output of translate_parallel with small chunks, in this process
+    """
+    return translate_parallel(text, direction, workers=1, chunk_size=rng.choice((1, 2, 8, 32, 1024)))
+
+
+def run_live(text, direction, rng):
+    """
+    :return: Output of an IncrementalTranslator edited from a random text into the text
+    :raise AssertionError: If an edit does not turn the old output into the new one
+    """
+    translator = IncrementalTranslator(direction, block_size=rng.choice((4, 16, 256)))
+    start = rng.randrange(len(text) + 1)
+    end = rng.randrange(start, len(text) + 1)
+    before = text[:start] + random_input(rng, direction, 20)[:rng.randrange(8)] + text[end:]
+    output = ''
+    for state in (before, text):
+        edit = translator.update(state)
+        if edit is not None:
+            a, b, replacement = edit
+            output = output[:a] + replacement + output[b:]
+        if output != translator.output:
+            raise AssertionError('the edit does not match the output')
+    return output
+
+
+def run_tree(text, direction, rng):
+    """
+    :return: Output of decode_tree
+    """
+    return decode_tree(text, parse_direction(direction)[1])
+
+
+def run_mmap(text, direction, rng):
+    """
+    :return: Output of decode_bytes with a random window
+    """
+    window = rng.choice((1, 2, 3, 5, 8, 64, 1 << 16))
+    return decode_bytes(text.encode('ascii'), parse_direction(direction)[1], window).decode('utf-8')
+
+
+def run_numpy(text, direction, rng):
+    """
+    :return: Output of encode_batch
+    """
+    return encode_batch([text], parse_direction(direction)[1])[0]
+
+
+def run_timing(text, direction, rng):
+    """
+    :return: Timing from encode_timing
+    """
+    return encode_timing(text, parse_direction(direction)[1])
+
+
+# name, directions, function of (text, direction, rng), expected output, input accepted, or None
+ENCODE = ('eng2morse', 'jpn2morse')
+DECODE = ('morse2eng', 'morse2jpn')
+ENGINES = [('codec', DIRECTIONS, lambda t, d, rng: convert(t, d), reference, None),
+           ('stream', DIRECTIONS, run_stream, reference, None),
+           ('parallel', DIRECTIONS, run_parallel, reference, None),
+           ('live', DIRECTIONS, run_live, reference, None),
+           ('alphabets', DIRECTIONS, lambda t, d, rng: convert_alphabet(t, d), reference, None),
+           ('tree', DECODE, run_tree, reference, None),
+           ('mmap', DECODE, run_mmap, reference, str.isascii),
+           ('numpy', ENCODE, run_numpy, reference, None),
+           ('timing', ENCODE, run_timing, reference_timing, None)]
+
+
+# Declare classes ==================================================
+class EngineResult:
+    """
+    Counters of one engine
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.cases = 0
+        self.mismatches = 0
+        self.chars = 0
+        self.seconds = 0.0
+        self.reference_seconds = 0.0
+
+    def as_dict(self):
+        """
+        :return: Dictionary of the counters and rates
+        """
+        return {'cases': self.cases, 'mismatches': self.mismatches, 'chars': self.chars,
+                'seconds': self.seconds, 'reference_seconds': self.reference_seconds,
+                'chars_per_s': self.chars / self.seconds if self.seconds else 0.0,
+                'reference_chars_per_s': self.chars / self.reference_seconds if self.reference_seconds else 0.0,
+                'speedup': self.reference_seconds / self.seconds if self.seconds else 0.0}
+
+
+# Declare functions for harness ====================================
+def timed(func, *args):
+    """
+    :return: Tuple of (result, seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def check_round_trips(rng, cases, max_length, failures):
+    """
+    Check that the round trips are stable
+    :param failures: List to which (check, direction, input, expected, output) are added
+    :return: Number of checks
+    """
+    checks = 0
+    for _ in range(cases):
+        for select in ('eng', 'jpn'):
+            text = random_text(rng, select, case_length(rng, max_length), known=True)
+            once = convert(convert(text, select + '2morse'), 'morse2' + select)
+            if select == 'eng':
+                expected = ''.join(text.lower().split())
+            else:
+                expected = convert(convert(once, 'jpn2morse'), 'morse2jpn')
+            if once != expected:
+                failures.append(('roundtrip-text', select, text, expected, once))
+
+            code = random_morse(rng, select, case_length(rng, max_length), known=True)
+            again = convert(convert(code, 'morse2' + select), select + '2morse')
+            expected = ' '.join(code.split()) + ' ' if code.split() else ''
+            if again != expected:
+                failures.append(('roundtrip-morse', select, code, expected, again))
+            checks += 2
+    return checks
+
+
+def run_engines(rng, cases, max_length, names, failures):
+    """
+    Run every engine on random inputs and compare them with the reference
+    :param names: Names of the engines to run
+    :param failures: List to which (engine, direction, input, expected, output) are added
+    :return: Tuple of (list of EngineResult, cases skipped)
+    """
+    engines = [e for e in ENGINES if e[0] in names]
+    if decode_bytes is None:
+        engines = [e for e in engines if e[0] not in ('mmap', 'numpy')]
+    results = {e[0]: EngineResult(e[0]) for e in engines}
+    skipped = 0
+    for n in range(cases):
+        direction = DIRECTIONS[n % len(DIRECTIONS)]
+        text = random_input(rng, direction, max_length)
+        try:
+            expected, reference_seconds = timed(reference, text, direction)
+        except IndexError:
+            skipped += 1  # Ver 1.3.0 failed on this input
+            continue
+        for name, directions, run, expect, accepts in engines:
+            if direction not in directions or (accepts is not None and not accepts(text)):
+                continue
+            result = results[name]
+            wanted = expected if expect is reference else expect(text, direction)
+            try:
+                output, seconds = timed(run, text, direction, random.Random(rng.random()))
+            except Exception as error:
+                output, seconds = '%s: %s' % (type(error).__name__, error), 0.0
+            result.cases += 1
+            result.chars += len(text)
+            result.seconds += seconds
+            result.reference_seconds += reference_seconds
+            if output != wanted:
+                result.mismatches += 1
+                failures.append((name, direction, text, wanted, output))
+    return list(results.values()), skipped
+
+
+def short(value, limit=120):
+    """
+    :return: repr of a value, cut to a limit
+    """
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + '...'
+
+
+def main():
+    """
+    Run the harness and print a table
+    :return: Exit status
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--cases', type=int, default=4000, help='random inputs (default: 4000)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generator (default: 0)')
+    parser.add_argument('--max-length', type=int, default=5000, help='longest input (default: 5000)')
+    parser.add_argument('--engines', nargs='+', default=[e[0] for e in ENGINES], metavar='NAME',
+                        help='engines to check (default: all)')
+    parser.add_argument('--show', type=int, default=5, help='differences printed (default: 5)')
+    parser.add_argument('--save', help='save the results as JSON')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = []
+    results, skipped = run_engines(rng, args.cases, args.max_length, set(args.engines), failures)
+    checks = check_round_trips(rng, args.cases // 4, args.max_length // 10, failures)
+
+    print('seed %d, %d cases (%d skipped where Ver 1.3.0 fails), %d round trips'
+          % (args.seed, args.cases, skipped, checks))
+    print('%-10s %7s %9s %12s %14s %14s %9s' % ('engine', 'cases', 'differ', 'chars', 'chars/s',
+                                                 'reference/s', 'speedup'))
+    for result in results:
+        r = result.as_dict()
+        print('%-10s %7d %9d %12d %14.0f %14.0f %9.2f' % (result.name, r['cases'], r['mismatches'], r['chars'],
+                                                           r['chars_per_s'], r['reference_chars_per_s'],
+                                                           r['speedup']))
+    if decode_bytes is None:
+        print('mmap and numpy skipped: NumPy is not installed')
+
+    for name, direction, text, expected, output in failures[:args.show]:
+        print('\n%s %s\n  input:    %s\n  expected: %s\n  output:   %s'
+              % (name, direction, short(text), short(expected), short(output)))
+    print('\n%s' % ('%d difference(s)' % len(failures) if failures else 'no difference'))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'cases': args.cases, 'skipped': skipped, 'round_trips': checks,
+                       'differences': len(failures), 'engines': {r.name: r.as_dict() for r in results}}, f, indent=2)
+            f.write('\n')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
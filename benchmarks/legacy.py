@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""
+Reference implementation of Ver 1.3.0
+
+The conversion functions exactly as they were written in
+morse_code_translator_v1.3.0.py (a blank input returns '' instead of
+opening the warning dialog). Benchmarks use them as the baseline the
+optimized codec is compared against.
+"""
+
+# Import modules ===================================================
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_codec import (dakuten_to_kana, handakuten_to_kana, kana_to_dakuten, kana_to_handakuten,
+                         katakana_to_hiragana, morse_eng, morse_eng_sym, morse_jpn, morse_jpn_sym,
+                         reverse_morse_eng, reverse_morse_eng_sym, reverse_morse_jpn, reverse_morse_jpn_sym,
+                         small_kana)
+
+
+# Declare functions for codec ======================================
+def text_to_morse(text, select):
+    """
+    Convert text to morse code
+    :param text: String to convert
+    :param select: A parameter for language
+    :return: Converted code
+    """
+    text = text.lower()
+    output = ''
+    if select == 'eng':
+        for t in text:
+            if t in reverse_morse_eng.keys():
+                output += reverse_morse_eng[t] + ' '
+            elif t.isspace():
+                continue
+            else:
+                output += reverse_morse_eng_sym.get(t, '[?]') + ' '
+    else:
+        for t in text:
+            if t in reverse_morse_jpn.keys():
+                output += reverse_morse_jpn[t] + ' '
+            elif t.isspace():
+                continue
+            else:
+                output += reverse_morse_jpn_sym.get(t, '[?]') + ' '
+    return output
+
+
+def morse_to_text(text, select):
+    """
+    Convert morse code to text
+    :param text: String to convert
+    :param select: A parameter for language
+    :return: Converted text
+    """
+    output = ''
+    if select == 'eng':
+        for t in text:
+            if t in morse_eng.keys():
+                output += morse_eng[t]
+            else:
+                output += morse_eng_sym.get(t, '[?]')
+    elif select == 'jpn':
+        for t in text:
+            if t in morse_jpn.keys():
+                output += morse_jpn[t]
+            else:
+                output += morse_jpn_sym.get(t, '[?]')
+    return output
+
+
+def attach_ten(kana, ten):
+    """
+    Attach a detached point in Japanese conversion
+    :param kana: Japanese character for convert
+    :param ten: The type of dot to attach to the letter
+    :return: Dotted character
+    """
+    if ten == '゛' and kana in kana_to_dakuten.keys():
+        return kana_to_dakuten[kana]
+    elif ten == '゜' and kana in kana_to_handakuten.keys():
+        return kana_to_handakuten[kana]
+    else:
+        return kana + ten
+
+
+def release_ten(kana, select):
+    """
+    Release the attached point in Japanese conversion
+    :param kana: Japanese character for convert
+    :param select: The type of dot to detach to the letter
+    :return: Undotted character
+    """
+    if select == 'handaku':
+        return handakuten_to_kana[kana] + '゜'
+    if select == 'daku':
+        return dakuten_to_kana[kana] + '゛'
+
+
+# Declare functions for converting =================================
+def change_english_to_morse(text):
+    """
+    Main function for convert English to morse code
+    :param text: String for convert
+    :return: converted code
+    """
+    text = text.lower()
+    if not text:
+        return ''
+    output = text_to_morse(text, 'eng')
+    return output
+
+
+def change_japanese_to_morse(text):
+    """
+    Main function for convert Japanese to morse code
+    :param text: String for convert
+    :return: converted code
+    """
+    output = ''
+    if not text:
+        return ''
+    for k in text:
+        if k in katakana_to_hiragana.keys():
+            k = katakana_to_hiragana[k]
+        if k in dakuten_to_kana.keys():
+            output += release_ten(k, 'daku')
+        elif k in handakuten_to_kana.keys():
+            output += release_ten(k, 'handaku')
+        elif k in small_kana.keys():
+            output += small_kana[k]
+        else:
+            output += k
+
+    encoding = text_to_morse(output, 'jpn')
+    return encoding
+
+
+def change_morse_to_english(text):
+    """
+    Main function for convert morse code to English
+    :param text: String for convert
+    :return: converted text
+    """
+    text = text.lower().split()
+    if not text:
+        return ''
+    output = morse_to_text(text, 'eng')
+    return output
+
+
+def change_morse_to_japanese(text):
+    """
+    Main function for convert morse code to Japanese
+    :param text: String for convert
+    :return: converted text
+    """
+    text = text.lower().split()
+    if not text:
+        return ''
+
+    temp = morse_to_text(text, 'jpn')  # need to think another variation name
+    output = []
+    for n, k in enumerate(temp):
+        if k in ('゛', '゜') and temp[n - 1].isalpha():
+            output.pop()
+            output.append(attach_ten(temp[n - 1], k))
+        else:
+            output.append(k)
+    return ''.join(output)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""
+Load test of the translation service
+
+Opens concurrent keep-alive connections to morse_server (HTTP or the TCP
+line protocol) and sends requests of every direction, several in flight
+per connection when --pipeline is above 1. Prints the throughput and the
+p50/p99 latency. Starts a server in this process unless --host is given.
+
+Usage: python benchmarks/load_test.py [--protocol http|tcp] [--clients N] [--requests N]
+                                      [--pipeline N] [--large N] [--host H --port P]
+"""
+
+# Import modules ===================================================
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morse_codec import encode_text
+from morse_server import TranslationServer
+
+
+SAMPLES = [('eng2morse', 'CQ CQ DE JA1XYZ PSE K'),
+           ('eng2morse', 'The quick brown fox jumps over the lazy dog 0123456789.'),
+           ('morse2eng', encode_text('the quick brown fox jumps over the lazy dog', 'eng')),
+           ('jpn2morse', 'カタカナ ガギグ パピプ ヨロシク'),
+           ('morse2jpn', encode_text('がぎぐ ぱぴぷ よろしく', 'jpn'))]
+
+
+# Declare functions for clients ====================================
+def build_requests(count, large, seed):
+    """
+    Pick the requests of one client
+    :param count: Number of requests
+    :param large: Characters of the occasional large request (0 for none)
+    :param seed: Seed of the choice
+    :return: List of (direction, text)
+    """
+    chooser = random.Random(seed)
+    requests = [chooser.choice(SAMPLES) for _ in range(count)]
+    if large:
+        for n in range(0, count, 50):  # one request in 50 goes to the process pool
+            requests[n] = ('eng2morse', ('lorem ipsum dolor sit amet %d ' % n) * (large // 30 + 1))
+    return requests
+
+
+async def read_http_response(reader):
+    """
+    Read one response with a Content-Length
+    :return: Status code
+    """
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def http_client(host, port, requests, pipeline, latencies):
+    """
+    Send requests on one connection, keeping up to pipeline of them in flight
+    :return: Number of failed requests
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 24)
+    sent = {}
+    slots = asyncio.Semaphore(pipeline)
+    failures = 0
+
+    async def receive():
+        nonlocal failures
+        for n in range(len(requests)):
+            if await read_http_response(reader) != 200:
+                failures += 1
+            latencies.append(time.perf_counter() - sent.pop(n))
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for n, (direction, text) in enumerate(requests):
+        await slots.acquire()
+        body = text.encode('utf-8')
+        sent[n] = time.perf_counter()
+        writer.write(b'POST /convert/%s HTTP/1.1\r\nHost: %s\r\nContent-Length: %d\r\n\r\n%s'
+                     % (direction.encode('ascii'), host.encode('ascii'), len(body), body))
+        await writer.drain()
+    await receiver
+    writer.close()
+    return failures
+
+
+async def tcp_client(host, port, requests, pipeline, latencies):
+    """
+    Send lines on one connection, keeping up to pipeline of them in flight
+    :return: Number of failed requests
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 24)
+    sent = {}
+    slots = asyncio.Semaphore(pipeline)
+    failures = 0
+
+    async def receive():
+        nonlocal failures
+        for n in range(len(requests)):
+            if not (await reader.readline()).startswith(b'OK '):
+                failures += 1
+            latencies.append(time.perf_counter() - sent.pop(n))
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for n, (direction, text) in enumerate(requests):
+        await slots.acquire()
+        sent[n] = time.perf_counter()
+        writer.write(('%s %s\n' % (direction, text)).encode('utf-8'))
+        await writer.drain()
+    await receiver
+    writer.close()
+    return failures
+
+
+def percentile(values, share):
+    """
+    Value below which a share of the sorted values lies
+    :return: Value
+    """
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+async def run(args):
+    """
+    Run the load test
+    :return: None
+    """
+    server = None
+    host, port = args.host, args.port
+    if host is None:
+        server = TranslationServer(http_port=0, tcp_port=0, workers=args.workers)
+        await server.start()
+        host = server.host
+        port = server.http_port if args.protocol == 'http' else server.tcp_port
+
+    client = http_client if args.protocol == 'http' else tcp_client
+    latencies = []
+    start = time.perf_counter()
+    failures = await asyncio.gather(*(client(host, port, build_requests(args.requests, args.large, args.seed + n),
+                                             args.pipeline, latencies)
+                                      for n in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        offloaded = server.offloaded
+        await server.close()
+
+    latencies.sort()
+    print('%s: %d clients x %d requests, pipeline %d, large %d'
+          % (args.protocol, args.clients, args.requests, args.pipeline, args.large))
+    print('%d requests in %.3f s (%.0f requests/s), %d failed'
+          % (len(latencies), elapsed, len(latencies) / elapsed, sum(failures)))
+    print('latency p50 %.2f ms, p99 %.2f ms, max %.2f ms'
+          % (1000 * percentile(latencies, 0.5), 1000 * percentile(latencies, 0.99), 1000 * latencies[-1]))
+    if server is not None:
+        print('%d requests ran on the process pool' % offloaded)
+
+
+def main():
+    """
+    Parse the arguments and run the load test
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--protocol', choices=('http', 'tcp'), default='http', help='front end (default: http)')
+    parser.add_argument('--clients', type=int, default=50, help='concurrent connections (default: 50)')
+    parser.add_argument('--requests', type=int, default=200, help='requests per connection (default: 200)')
+    parser.add_argument('--pipeline', type=int, default=1, help='requests in flight per connection (default: 1)')
+    parser.add_argument('--large', type=int, default=0,
+                        help='characters of one request in 50, to load the process pool (default: 0)')
+    parser.add_argument('--workers', type=int, default=None, help='processes of the local server')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the request mix (default: 1)')
+    parser.add_argument('--host', help='address of a running server (default: start one here)')
+    parser.add_argument('--port', type=int, help='port of a running server')
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite of the four conversion directions
+
+Times every direction, and the functions they are built from, on the
+corpora of benchmarks/corpora.py at several input sizes. Reports ops/s,
+MB/s (UTF-8 input) and peak memory, and can save the results as JSON and
+compare them with a saved baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py --save before.json
+    python benchmarks/run_benchmarks.py --baseline before.json [--tolerance 0.1]
+"""
+
+# Import modules ===================================================
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import CORPORA
+from morse_codec import attach_ten, convert, merge_ten, morse_to_text, text_to_morse
+
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+
+# Declare cases ====================================================
+def prepare_tokens(text):
+    """
+    Split morse code into the list morse_to_text takes
+    :param text: Morse code
+    :return: List of codes
+    """
+    return text.lower().split()
+
+
+def prepare_pairs(text):
+    """
+    Collect the (kana, point) pairs of Japanese morse code
+    :param text: Morse code
+    :return: List of (kana, point)
+    """
+    kana = morse_to_text(text.lower().split(), 'jpn')
+    return [(k, t) for k, t in zip(kana, kana[1:]) if t in '゛゜']
+
+
+def prepare_detached(text):
+    """
+    Decode Japanese morse code without attaching the points
+    :param text: Morse code
+    :return: Text with detached points
+    """
+    return morse_to_text(text.lower().split(), 'jpn')
+
+
+def attach_all(pairs):
+    """
+    Attach every point of a list of pairs
+    :param pairs: List of (kana, point)
+    :return: None
+    """
+    for kana, ten in pairs:
+        attach_ten(kana, ten)
+
+
+# (name, corpus, prepare, function); prepare turns the corpus into the input of function
+CASES = [('eng2morse', 'english-prose', None, lambda t: convert(t, 'eng2morse')),
+         ('eng2morse', 'symbol-heavy', None, lambda t: convert(t, 'eng2morse')),
+         ('morse2eng', 'morse-english', None, lambda t: convert(t, 'morse2eng')),
+         ('morse2eng', 'morse-symbols', None, lambda t: convert(t, 'morse2eng')),
+         ('morse2eng', 'malformed-english', None, lambda t: convert(t, 'morse2eng')),
+         ('jpn2morse', 'katakana-dakuten', None, lambda t: convert(t, 'jpn2morse')),
+         ('morse2jpn', 'morse-katakana', None, lambda t: convert(t, 'morse2jpn')),
+         ('morse2jpn', 'malformed-japanese', None, lambda t: convert(t, 'morse2jpn')),
+         ('text_to_morse', 'english-prose', None, lambda t: text_to_morse(t, 'eng')),
+         ('morse_to_text', 'morse-english', prepare_tokens, lambda t: morse_to_text(t, 'eng')),
+         ('attach_ten', 'morse-katakana', prepare_pairs, attach_all),
+         ('merge_ten', 'morse-katakana', prepare_detached, merge_ten)]
+
+
+# Declare functions for benchmark ==================================
+def measure(func, data, min_time):
+    """
+    Call a function repeatedly for at least min_time seconds
+    :param func: Function to time
+    :param data: Argument of the function
+    :param min_time: Least total time in seconds
+    :return: Tuple of (calls, seconds of the fastest call)
+    """
+    calls = 0
+    best = float('inf')
+    deadline = time.perf_counter() + min_time
+    while calls < 3 or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+        calls += 1
+    return calls, best
+
+
+def peak_memory(func, data):
+    """
+    Peak memory allocated by one call
+    :param func: Function to measure
+    :param data: Argument of the function
+    :return: Peak in bytes
+    """
+    tracemalloc.start()
+    try:
+        func(data)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, pattern, min_time, seed, echo=True):
+    """
+    Run every case matching a pattern
+    :param sizes: Input sizes in characters
+    :param pattern: Shell pattern of 'name/corpus' to run
+    :param min_time: Least time per measurement in seconds
+    :param seed: Seed of the corpora
+    :param echo: Print every result as soon as it is measured
+    :return: List of result dictionaries
+    """
+    results = []
+    for name, corpus, prepare, func in CASES:
+        case = '%s/%s' % (name, corpus)
+        if not fnmatch.fnmatch(case, pattern):
+            continue
+        for size in sizes:
+            text = CORPORA[corpus](size, seed)
+            data = prepare(text) if prepare else text
+            calls, best = measure(func, data, min_time)
+            mb = len(text.encode('utf-8')) / 1e6
+            results.append({'case': case, 'size': size, 'calls': calls, 'seconds': best,
+                            'ops_per_s': 1 / best, 'mb_per_s': mb / best,
+                            'peak_kib': peak_memory(func, data) / 1024})
+            if echo:
+                print_result(results[-1])
+    return results
+
+
+def print_result(result, baseline=None):
+    """
+    Print one line of the table
+    :param result: Result dictionary
+    :param baseline: Result dictionary of the baseline, if any
+    :return: None
+    """
+    line = '%-36s %9d %12.1f %9.2f %11.0f' % (result['case'], result['size'], result['ops_per_s'],
+                                              result['mb_per_s'], result['peak_kib'])
+    if baseline is not None:
+        line += ' %+8.1f%%' % ((result['mb_per_s'] / baseline['mb_per_s'] - 1) * 100)
+    print(line)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare the results with a baseline
+    :param results: List of result dictionaries
+    :param baseline: Loaded JSON of an earlier run
+    :param tolerance: Slowdown allowed before a case counts as a regression
+    :return: List of regressed 'case@size'
+    """
+    old = {(r['case'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print('%-36s %9s %12s %9s %11s %9s' % ('case', 'size', 'ops/s', 'MB/s', 'peak KiB', 'vs base'))
+    for result in results:
+        before = old.get((result['case'], result['size']))
+        print_result(result, before)
+        if before is not None and result['mb_per_s'] < before['mb_per_s'] * (1 - tolerance):
+            regressions.append('%s@%d' % (result['case'], result['size']))
+    return regressions
+
+
+def main():
+    """
+    Run the suite
+    :return: Exit status (1 if a case regressed against the baseline)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='input sizes in characters (default: 1000 100000 1000000)')
+    parser.add_argument('--filter', default='*', help="shell pattern of cases, e.g. 'morse2*' (default: *)")
+    parser.add_argument('--min-time', type=float, default=0.2, help='least seconds per measurement')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the corpora (default: 0)')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='slowdown allowed vs the baseline')
+    args = parser.parse_args()
+
+    if not args.baseline:
+        print('%-36s %9s %12s %9s %11s' % ('case', 'size', 'ops/s', 'MB/s', 'peak KiB'))
+    results = run(args.sizes, args.filter, args.min_time, args.seed, echo=not args.baseline)
+
+    if args.save:
+        meta = {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                'machine': platform.machine(), 'platform': platform.platform(),
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'sizes': list(args.sizes), 'seed': args.seed}
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({'meta': meta, 'results': results}, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print('\nRegressions over %d%%: %s' % (args.tolerance * 100, ', '.join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
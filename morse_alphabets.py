@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - alphabet registry
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Alphabets beyond the built-in English and Japanese ones are defined in
+JSON files in the 'alphabets' directory, one file per alphabet, and are
+only read when they are first used. Adding an alphabet needs no code:
+
+    {"title": "...",              name shown to the user
+     "extends": "eng",            optional alphabet whose codes are inherited
+     "normalize": "NFD",          optional Unicode form for unknown characters
+     "letters": {".-": "a"},      codes of letters, as in morse_eng
+     "symbols": {".----": "1"},   codes of symbols (letters take priority)
+     "aliases": {"ё": "е"}}       characters encoded as other characters
+
+The name of an alphabet is the name of its file. A character of several
+letters (such as the prosign '<AR>') is encoded when it is written as is.
+
+Each alphabet is compiled once into an encode table (one lookup per
+character, like the Japanese one in morse_codec) and a decode table, and
+the compiled tables are pickled in alphabets/__pycache__. The pickle is
+used as long as the files it was compiled from are unchanged.
+"""
+
+# Import modules ===================================================
+import json
+import os
+import pickle
+import re
+import unicodedata
+
+import morse_codec
+from morse_codec import (EncodeTable, build_decode_table, build_encode_table, decode_tables,
+                         encode_tables, japanese_encode_table, merge_ten)
+
+
+ALPHABET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alphabets')
+CACHE_VERSION = 1  # changed when the pickled classes change
+
+
+# Declare exceptions ===============================================
+class AlphabetError(ValueError):
+    """
+    Raised for an unknown alphabet or a broken definition
+    """
+
+
+# Declare classes ==================================================
+class FoldingEncodeTable(EncodeTable):
+    """
+    Encode table which normalizes characters it does not hold
+    A character missing from the table is converted to a Unicode normal
+    form first, so an accented letter or a Hangul syllable is encoded as
+    the letters it is made of.
+    """
+
+    def __init__(self, entries=(), form=None):
+        """
+        :param entries: Dictionary or pairs of character and 'code '
+        :param form: Unicode normal form ('NFD', 'NFKD', ...) or None
+        """
+        super().__init__(entries)
+        self.form = form
+
+    def __missing__(self, key):
+        if self.form is not None:
+            folded = unicodedata.normalize(self.form, key)
+            if folded != key:
+                return self.remember(key, ''.join(map(self.__getitem__, folded)))
+        return super().__missing__(key)
+
+
+class Alphabet:
+    """
+    Compiled alphabet
+    """
+
+    def __init__(self, name, title, encode_table, decode_table, merge=None):
+        """
+        :param name: Name of the alphabet
+        :param title: Name shown to the user
+        :param encode_table: EncodeTable mapping characters to 'code '
+        :param decode_table: Dictionary mapping codes to characters
+        :param merge: Function applied to the decoded text (merge_ten for Japanese) or None
+        """
+        self.name = name
+        self.title = title
+        self.encode_table = encode_table
+        self.decode_table = decode_table
+        self.merge = merge
+        sequences = sorted((k for k in encode_table if len(k) > 1), key=len, reverse=True)
+        self.sequence_pattern = re.compile('(%s)' % '|'.join(map(re.escape, sequences))) if sequences else None
+
+    def encode(self, text):
+        """
+        Convert text to morse code
+        :param text: String to convert
+        :return: Converted code
+        """
+        table = self.encode_table
+        text = text.lower()
+        if self.sequence_pattern is None:
+            return ''.join(map(table.__getitem__, text))
+        parts = self.sequence_pattern.split(text)  # odd items are characters of several letters
+        return ''.join([table[part] if n % 2 else ''.join(map(table.__getitem__, part))
+                        for n, part in enumerate(parts)])
+
+    def decode(self, text):
+        """
+        Convert morse code to text
+        :param text: String of codes separated by whitespace
+        :return: Converted text
+        """
+        get = self.decode_table.get
+        output = ''.join([get(t, '[?]') for t in text.lower().split()])
+        return self.merge(output) if self.merge is not None else output
+
+
+class AlphabetRegistry:
+    """
+    Alphabets by name, loaded on first use
+    """
+
+    def __init__(self, path=ALPHABET_DIR, cache_dir=None):
+        """
+        :param path: Directory of the JSON definitions
+        :param cache_dir: Directory of the compiled tables (default: path/__pycache__),
+                          or '' to compile every time
+        """
+        self.path = path
+        self.cache_dir = os.path.join(path, '__pycache__') if cache_dir is None else cache_dir
+        self.alphabets = {'eng': Alphabet('eng', 'English', encode_tables['eng'], decode_tables['eng']),
+                          'jpn': Alphabet('jpn', 'Japanese', japanese_encode_table, decode_tables['jpn'],
+                                          merge_ten)}
+        self.sources = {}  # files each loaded alphabet was compiled from
+
+    def names(self):
+        """
+        Names of the built-in, registered and defined alphabets, without loading them
+        :return: Sorted list of names
+        """
+        names = set(self.alphabets)
+        if os.path.isdir(self.path):
+            names.update(f[:-5] for f in os.listdir(self.path) if f.endswith('.json'))
+        return sorted(names)
+
+    def title(self, name):
+        """
+        Name shown to the user, read from the definition without compiling it
+        :param name: Name of the alphabet
+        :return: Title (the name if the definition has none)
+        :raise AlphabetError: If it is unknown or its definition cannot be read
+        """
+        alphabet = self.alphabets.get(name)
+        if alphabet is not None:
+            return alphabet.title
+        path = os.path.join(self.path, name + '.json')
+        if not re.fullmatch(r'\w+', name) or not os.path.isfile(path):
+            raise AlphabetError('Unknown alphabet: %r' % (name,))
+        try:
+            with open(path, encoding='utf-8') as f:
+                definition = json.load(f)
+        except (OSError, ValueError) as e:
+            raise AlphabetError('Cannot read alphabet %r: %s' % (name, e)) from e
+        title = definition.get('title', name) if isinstance(definition, dict) else name
+        return str(title)
+
+    def register(self, alphabet):
+        """
+        Add a compiled alphabet
+        :param alphabet: Alphabet
+        :return: None
+        """
+        self.alphabets[alphabet.name] = alphabet
+
+    def get(self, name):
+        """
+        Find an alphabet, loading it on first use
+        :param name: Name of the alphabet
+        :return: Alphabet
+        :raise AlphabetError: If it is unknown or its definition is broken
+        """
+        alphabet = self.alphabets.get(name)
+        if alphabet is None:
+            alphabet = self.load(name, ())
+        return alphabet
+
+    def load(self, name, children):
+        """
+        Load an alphabet from the cache, or compile its definition
+        :param name: Name of the alphabet
+        :param children: Names of the alphabets waiting for it (to find loops)
+        :return: Alphabet
+        :raise AlphabetError: If it is unknown or its definition is broken
+        """
+        path = os.path.join(self.path, name + '.json')
+        if not re.fullmatch(r'\w+', name) or not os.path.isfile(path):
+            raise AlphabetError('Unknown alphabet: %r' % (name,))
+        cache = os.path.join(self.cache_dir, '%s.%d.pickle' % (name, CACHE_VERSION)) if self.cache_dir else None
+        cached = read_cache(cache) if cache else None
+        if cached is not None:
+            alphabet, sources = cached
+        else:
+            alphabet, sources = self.compile(name, path, children)
+            if cache:
+                write_cache(cache, alphabet, sources)
+        self.alphabets[name] = alphabet
+        self.sources[name] = sources
+        return alphabet
+
+    def compile(self, name, path, children):
+        """
+        Compile the definition of an alphabet
+        :param name: Name of the alphabet
+        :param path: Path of its JSON file
+        :param children: Names of the alphabets waiting for it
+        :return: Tuple of (Alphabet, list of the files it was compiled from)
+        :raise AlphabetError: If the definition is broken
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                definition = json.load(f)
+        except (OSError, ValueError) as e:
+            raise AlphabetError('Cannot read alphabet %r: %s' % (name, e)) from e
+        letters = definition.get('letters', {})
+        symbols = definition.get('symbols', {})
+        aliases = definition.get('aliases', {})
+        sources = [path]
+
+        encode = FoldingEncodeTable(form=definition.get('normalize'))
+        decode = {}
+        merge = None
+        base = definition.get('extends')
+        if base is not None:
+            if base == name or base in children:
+                raise AlphabetError('Alphabet %r extends itself' % (name,))
+            parent = self.alphabets.get(base) or self.load(base, children + (name,))
+            sources.extend(self.sources.get(base, [morse_codec.__file__]))  # built-in: the codec itself
+            encode.update((k, v) for k, v in parent.encode_table.items() if v != '[?] ')
+            decode.update(parent.decode_table)
+            merge = parent.merge
+
+        encode.update(build_encode_table({v.lower(): k for k, v in letters.items()},
+                                         {v.lower(): k for k, v in symbols.items()}))
+        decode.update(build_decode_table(letters, symbols))
+
+        def resolve(character, seen):
+            if character in aliases and character not in seen:
+                return ''.join(resolve(c, seen + (character,)) for c in aliases[character])
+            if character in encode:
+                return encode[character]
+            raise AlphabetError('Alias %r of alphabet %r uses %r, which has no code'
+                                % (seen[0], name, character))
+
+        for k in aliases:
+            encode[k.lower()] = resolve(k, ())
+        return Alphabet(name, definition.get('title', name), encode, decode, merge), sources
+
+
+# Declare functions for the cache ==================================
+def file_stamp(path):
+    """
+    :return: Tuple of (path, modification time, size) of a file
+    """
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def read_cache(cache):
+    """
+    Load a compiled alphabet if none of its files changed since it was pickled
+    :param cache: Path of the pickle
+    :return: Tuple of (Alphabet, list of its files), or None if the pickle is missing or stale
+    """
+    try:
+        with open(cache, 'rb') as f:
+            stamps, alphabet = pickle.load(f)
+        if all(file_stamp(stamp[0]) == tuple(stamp) for stamp in stamps):
+            return alphabet, [stamp[0] for stamp in stamps]
+    except (OSError, pickle.PickleError, AttributeError, EOFError, ImportError, TypeError, ValueError):
+        pass
+    return None
+
+
+def write_cache(cache, alphabet, sources):
+    """
+    Pickle a compiled alphabet (silently skipped if the directory is read-only)
+    :param cache: Path of the pickle
+    :param alphabet: Alphabet
+    :param sources: Files it was compiled from
+    :return: None
+    """
+    temporary = '%s.%d.tmp' % (cache, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(temporary, 'wb') as f:
+            pickle.dump(([file_stamp(s) for s in sources], alphabet), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, cache)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+registry = AlphabetRegistry()
+
+
+# Declare functions for conversion =================================
+def alphabet_names():
+    """
+    :return: Sorted list of the names of every alphabet
+    """
+    return registry.names()
+
+
+def alphabet_title(name):
+    """
+    Name of an alphabet shown to the user, without loading it
+    :param name: Name of the alphabet
+    :return: Title
+    :raise AlphabetError: If it is unknown or its definition cannot be read
+    """
+    return registry.title(name)
+
+
+def get_alphabet(name):
+    """
+    Find an alphabet of the default registry, loading it on first use
+    :param name: Name of the alphabet
+    :return: Alphabet
+    :raise AlphabetError: If it is unknown or its definition is broken
+    """
+    return registry.get(name)
+
+
+def parse_alphabet_direction(direction):
+    """
+    Split a direction such as 'kor2morse' or 'morse2kor'
+    :param direction: '<name>2morse' or 'morse2<name>'
+    :return: Tuple of (True if it converts to morse code, Alphabet)
+    :raise AlphabetError: If the direction or the alphabet is unknown
+    """
+    source, _, target = direction.partition('2')
+    if target == 'morse' and source != 'morse':
+        return True, registry.get(source)
+    if source == 'morse' and target:
+        return False, registry.get(target)
+    raise AlphabetError('Unknown direction: %r' % (direction,))
+
+
+def convert_alphabet(text, direction):
+    """
+    Convert text in a direction of any alphabet (a blank input gives a blank output)
+    :param text: String to convert
+    :param direction: '<name>2morse' or 'morse2<name>'
+    :return: Converted text
+    """
+    encode, alphabet = parse_alphabet_direction(direction)
+    return alphabet.encode(text) if encode else alphabet.decode(text)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - audio synthesis
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Renders morse code as 16-bit mono PCM or WAV. One dit, one dah and the
+gaps are synthesized once per setting (with raised-cosine edges so the
+keying does not click), and the waveform of every code is put together
+from them once and reused. The output is only a sequence of references
+to these buffers: write_wav writes them one by one, so an hour-long
+transmission never sits in memory in full.
+"""
+
+# Import modules ===================================================
+import math
+import struct
+import wave
+
+from morse_codec import encode_text, iter_chunks
+
+
+WPM = 20
+FREQUENCY = 700  # Hz
+SAMPLE_RATE = 8000  # Hz
+VOLUME = 0.8
+RAMP = 0.005  # seconds of the rising and falling edges
+WORD_SEPARATOR = '/'  # word gap in morse input
+
+
+# Declare classes ==================================================
+class ToneSet:
+    """
+    Precomputed waveforms of one keying setting
+    dit, dah: Tones of one and three units
+    element_gap, char_gap, word_gap: Silences after an element, a character and a word
+    """
+
+    def __init__(self, wpm=WPM, farnsworth_wpm=None, frequency=FREQUENCY, sample_rate=SAMPLE_RATE,
+                 volume=VOLUME, ramp=RAMP):
+        """
+        :param wpm: Speed of the characters in words per minute (PARIS)
+        :param farnsworth_wpm: Slower overall speed reached by longer gaps, or None
+        :param frequency: Frequency of the tone in Hz
+        :param sample_rate: Samples per second
+        :param volume: Amplitude between 0 and 1
+        :param ramp: Seconds of the rising and falling edges
+        """
+        self.wpm = wpm
+        self.sample_rate = sample_rate
+        unit = 1.2 / wpm
+        char_gap, word_gap = 3 * unit, 7 * unit
+        if farnsworth_wpm and farnsworth_wpm < wpm:
+            delay = (60 * wpm - 37.2 * farnsworth_wpm) / (farnsworth_wpm * wpm)  # ARRL Farnsworth timing
+            char_gap, word_gap = 3 * delay / 19, 7 * delay / 19
+
+        self.dit = self.tone(unit, frequency, volume, ramp)
+        self.dah = self.tone(3 * unit, frequency, volume, ramp)
+        self.element_gap = self.silence(unit)
+        self.char_gap = self.silence(char_gap - unit)  # follows an element gap
+        self.word_gap = self.silence(word_gap - unit)
+        self.codes = {}
+
+    def samples(self, seconds):
+        """
+        Number of samples of a duration
+        :param seconds: Duration
+        :return: Number of samples
+        """
+        return max(int(round(seconds * self.sample_rate)), 0)
+
+    def silence(self, seconds):
+        """
+        Synthesize silence
+        :param seconds: Duration
+        :return: PCM bytes
+        """
+        return bytes(2 * self.samples(seconds))
+
+    def tone(self, seconds, frequency, volume, ramp):
+        """
+        Synthesize a sine tone with raised-cosine edges
+        :param seconds: Duration
+        :param frequency: Frequency in Hz
+        :param volume: Amplitude between 0 and 1
+        :param ramp: Seconds of each edge
+        :return: PCM bytes
+        """
+        count = self.samples(seconds)
+        edge = min(self.samples(ramp), count // 2)
+        step = 2 * math.pi * frequency / self.sample_rate
+        peak = 32767 * volume
+        values = []
+        for n in range(count):
+            gain = 1.0
+            if n < edge:
+                gain = 0.5 - 0.5 * math.cos(math.pi * n / edge)
+            elif n >= count - edge:
+                gain = 0.5 - 0.5 * math.cos(math.pi * (count - 1 - n) / edge)
+            values.append(int(peak * gain * math.sin(step * n)))
+        return struct.pack('<%dh' % count, *values)
+
+    def code(self, code):
+        """
+        Waveform of one code, elements and element gaps included
+        :param code: Morse code such as '.-'
+        :return: PCM bytes, or None for an invalid code
+        """
+        buffer = self.codes.get(code)
+        if buffer is None:
+            if not code or code.strip('.-'):
+                return None
+            parts = []
+            for element in code:
+                parts.append(self.dit if element == '.' else self.dah)
+                parts.append(self.element_gap)
+            buffer = self.codes[code] = b''.join(parts)
+        return buffer
+
+
+# Declare functions for rendering ==================================
+def iter_words(source, chunk_size=1 << 16):
+    """
+    Iterate over the whitespace-separated words of a source
+    :param source: File-like object, string or iterable of strings
+    :param chunk_size: Number of characters to read at once from a file
+    :return: Iterator of words
+    """
+    carry = ''
+    for chunk in iter_chunks(source, chunk_size):
+        words = (carry + chunk).split()
+        carry = ''
+        if words and not chunk[-1:].isspace():
+            carry = words.pop()
+        yield from words
+    if carry:
+        yield carry
+
+
+def iter_buffers(words, tones):
+    """
+    Turn words of morse code into the buffers to play
+    :param words: Iterable of lists of codes
+    :param tones: ToneSet
+    :return: Iterator of PCM bytes (references to precomputed buffers)
+    """
+    first = True
+    for codes in words:
+        started = False
+        for code in codes:
+            buffer = tones.code(code)
+            if buffer is None:
+                continue  # '[?]' and broken codes are not keyed
+            if started:
+                yield tones.char_gap
+            elif not first:
+                yield tones.word_gap
+            yield buffer
+            started = True
+            first = False
+
+
+def text_words(source, select='eng'):
+    """
+    Encode the words of a text
+    :param source: File-like object, string or iterable of strings
+    :param select: A parameter for language
+    :return: Iterator of lists of codes
+    """
+    for word in iter_words(source):
+        yield encode_text(word, select).split()
+
+
+def morse_words(source):
+    """
+    Group morse code into words at WORD_SEPARATOR
+    :param source: File-like object, string or iterable of strings of morse code
+    :return: Iterator of lists of codes
+    """
+    codes = []
+    for token in iter_words(source):
+        if token == WORD_SEPARATOR:
+            if codes:
+                yield codes
+            codes = []
+        else:
+            codes.append(token)
+    if codes:
+        yield codes
+
+
+def render(text, select='eng', **options):
+    """
+    Render text as PCM
+    :param text: String to key
+    :param select: A parameter for language
+    :param options: Arguments of ToneSet
+    :return: 16-bit little-endian mono PCM bytes
+    """
+    return b''.join(iter_buffers(text_words(text, select), ToneSet(**options)))
+
+
+def render_morse(morse, **options):
+    """
+    Render morse code as PCM
+    :param morse: Codes separated by spaces, words separated by ' / '
+    :param options: Arguments of ToneSet
+    :return: 16-bit little-endian mono PCM bytes
+    """
+    return b''.join(iter_buffers(morse_words(morse), ToneSet(**options)))
+
+
+def timing_buffers(timing, tones):
+    """
+    Turn a timing of morse_timing into the buffers to play
+    :param timing: array('H') of (state, units) pairs
+    :param tones: ToneSet
+    :return: Iterator of PCM bytes (references to precomputed buffers)
+    """
+    marks = {1: tones.dit, 3: tones.dah}
+    spaces = {1: (tones.element_gap,), 3: (tones.element_gap, tones.char_gap),
+              7: (tones.element_gap, tones.word_gap)}  # the gaps of ToneSet follow an element gap
+    pairs = iter(timing)
+    for state, units in zip(pairs, pairs):
+        if state:
+            yield marks[units]
+        else:
+            yield from spaces[units]
+    if timing:
+        yield tones.element_gap
+
+
+def render_timing(timing, **options):
+    """
+    Render a timing as PCM, the same as render gives for the same text
+    :param timing: array('H') of (state, units) pairs from morse_timing
+    :param options: Arguments of ToneSet
+    :return: 16-bit little-endian mono PCM bytes
+    """
+    return b''.join(timing_buffers(timing, ToneSet(**options)))
+
+
+def write_wav(target, source, select='eng', morse=False, **options):
+    """
+    Write a WAV file buffer by buffer
+    :param target: Path or binary file object
+    :param source: File-like object, string or iterable of strings
+    :param select: A parameter for language (ignored for morse input)
+    :param morse: True if the source is morse code instead of text
+    :param options: Arguments of ToneSet
+    :return: Number of samples written
+    """
+    tones = ToneSet(**options)
+    words = morse_words(source) if morse else text_words(source, select)
+    size = 0
+    with wave.open(target, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(tones.sample_rate)
+        for buffer in iter_buffers(words, tones):
+            wav.writeframesraw(buffer)
+            size += len(buffer)
+    return size // 2
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - audio decoder
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Decodes recorded CW from WAV files or raw PCM. The samples (memory-mapped
+when they come from a file) are cut into short blocks, and the power of
+the tone in every block is measured at once with a single-bin DFT (the
+Goertzel filter as a matrix product). The keyed blocks are turned into
+on/off runs, the dit length is tracked as the runs come, and the codes
+are passed to the codec.
+
+This module needs NumPy; the rest of the translator does not.
+"""
+
+# Import modules ===================================================
+import struct
+
+import numpy as np
+
+from morse_audio import FREQUENCY
+from morse_codec import decode_text
+
+
+BLOCK_SECONDS = 0.003  # length of one analysis block
+SEGMENT_BLOCKS = 1 << 16  # blocks analyzed at once, to bound memory
+MIN_FREQUENCY = 200  # Hz, range searched for the tone
+MAX_FREQUENCY = 3000
+SEARCH_SECONDS = 10  # audio used to find the tone
+
+PCM_TYPES = {1: np.uint8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+PCM_SCALE = {1: 128.0, 2: 32768.0, 4: 2147483648.0}
+
+
+# Declare functions for reading ====================================
+def wav_layout(path):
+    """
+    Read the format and the place of the samples in a WAV file
+    :param path: Path of a PCM WAV file
+    :return: Tuple of (sample rate, channels, bytes per sample, data offset, data size)
+    :raise ValueError: If the file is not a PCM WAV file
+    """
+    with open(path, 'rb') as file:
+        riff, _, kind = struct.unpack('<4sI4s', file.read(12))
+        if riff != b'RIFF' or kind != b'WAVE':
+            raise ValueError('Not a WAV file: %s' % path)
+        layout = None
+        while True:
+            header = file.read(8)
+            if len(header) < 8:
+                raise ValueError('No data chunk in %s' % path)
+            name, size = struct.unpack('<4sI', header)
+            if name == b'fmt ':
+                fmt, channels, rate, _, _, bits = struct.unpack('<HHIIHH', file.read(16))
+                file.seek(size - 16 + (size & 1), 1)
+                if fmt != 1 or bits // 8 not in PCM_TYPES:
+                    raise ValueError('Only 8, 16 and 32-bit PCM is supported: %s' % path)
+                layout = (rate, channels, bits // 8)
+            elif name == b'data':
+                if layout is None:
+                    raise ValueError('No format chunk before the data in %s' % path)
+                return layout + (file.tell(), size)
+            else:
+                file.seek(size + (size & 1), 1)
+
+
+def read_wav(path):
+    """
+    Memory-map the samples of a WAV file
+    :param path: Path of a PCM WAV file
+    :return: Tuple of (samples of the first channel, sample rate)
+    """
+    rate, channels, width, offset, size = wav_layout(path)
+    return read_pcm(path, rate, width, channels, offset, size // width)
+
+
+def read_pcm(path, sample_rate, width=2, channels=1, offset=0, count=None):
+    """
+    Memory-map raw little-endian PCM samples
+    :param path: Path of the raw file
+    :param sample_rate: Samples per second
+    :param width: Bytes per sample (1, 2 or 4)
+    :param channels: Interleaved channels
+    :param offset: Bytes before the first sample
+    :param count: Number of samples of all channels (default: up to the end)
+    :return: Tuple of (samples of the first channel, sample rate)
+    """
+    data = np.memmap(path, dtype=PCM_TYPES[width], mode='r', offset=offset,
+                     shape=None if count is None else (count - count % channels,))
+    return data[::channels], sample_rate
+
+
+# Declare functions for detection ==================================
+def to_float(samples, width=None):
+    """
+    Convert integer samples to floats between -1 and 1
+    :param samples: Array of samples
+    :param width: Bytes per sample (default: from the array)
+    :return: float32 array
+    """
+    if samples.dtype.kind == 'f':
+        return samples.astype(np.float32, copy=False)
+    width = width or samples.dtype.itemsize
+    values = samples.astype(np.float32)
+    if width == 1:
+        values -= 128.0
+    return values / PCM_SCALE[width]
+
+
+def detect_frequency(samples, sample_rate):
+    """
+    Find the frequency of the tone
+    :param samples: Array of samples
+    :param sample_rate: Samples per second
+    :return: Frequency in Hz (the frequency of morse_audio if the audio is too short to tell)
+    """
+    part = to_float(samples[:int(SEARCH_SECONDS * sample_rate)])
+    if len(part) == 0:
+        return float(FREQUENCY)
+    spectrum = np.abs(np.fft.rfft(part * np.hanning(len(part))))
+    frequencies = np.fft.rfftfreq(len(part), 1.0 / sample_rate)
+    band = (frequencies >= MIN_FREQUENCY) & (frequencies <= min(MAX_FREQUENCY, sample_rate / 2))
+    if not band.any():
+        return float(FREQUENCY)
+    return float(frequencies[band][np.argmax(spectrum[band])])
+
+
+def tone_envelope(samples, sample_rate, frequency, block):
+    """
+    Measure the amplitude of the tone in every block
+    :param samples: Array of samples
+    :param sample_rate: Samples per second
+    :param frequency: Frequency of the tone in Hz
+    :param block: Samples per block
+    :return: float32 array of one amplitude per block
+    """
+    phase = 2 * np.pi * frequency / sample_rate * np.arange(block)
+    basis = np.stack([np.cos(phase), np.sin(phase)], axis=1).astype(np.float32)  # (block, 2)
+    blocks = len(samples) // block
+    envelope = np.empty(blocks, dtype=np.float32)
+    for start in range(0, blocks, SEGMENT_BLOCKS):
+        stop = min(start + SEGMENT_BLOCKS, blocks)
+        frame = to_float(samples[start * block:stop * block]).reshape(stop - start, block)
+        power = frame @ basis
+        envelope[start:stop] = np.sqrt((power * power).sum(axis=1)) * (2.0 / block)
+    return envelope
+
+
+def key_states(envelope):
+    """
+    Decide in which blocks the key is down
+    The threshold lies between the noise floor and the tone level, with
+    hysteresis, and single-block glitches are removed.
+    :param envelope: Amplitude of every block
+    :return: Boolean array
+    """
+    if len(envelope) == 0:
+        return np.zeros(0, dtype=bool)
+    floor, level = np.percentile(envelope, [10, 99])
+    if level <= floor * 2:
+        return np.zeros(len(envelope), dtype=bool)  # no tone
+    high = floor + (level - floor) * 0.5
+    low = floor + (level - floor) * 0.3
+
+    states = envelope > high
+    uncertain = (envelope > low) & ~states
+    if uncertain.any():  # keep the previous state between the two thresholds
+        decided = np.where(uncertain, 0, np.where(states, 1, -1))
+        index = np.where(decided != 0, np.arange(len(decided)), 0)
+        np.maximum.accumulate(index, out=index)
+        states = decided[index] > 0
+    if len(states) > 2:
+        middle = states[:-2].astype(np.int8) + states[1:-1] + states[2:]
+        states[1:-1] = middle >= 2
+    return states
+
+
+def runs(states):
+    """
+    Lengths of the on and off runs
+    :param states: Boolean array
+    :return: Tuple of (array of states, array of lengths in blocks)
+    """
+    if len(states) == 0:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+    edges = np.flatnonzero(states[1:] != states[:-1]) + 1
+    starts = np.concatenate(([0], edges))
+    lengths = np.diff(np.concatenate((starts, [len(states)])))
+    return states[starts], lengths
+
+
+def initial_dit(on_lengths):
+    """
+    First estimate of the dit length by splitting the marks into two groups
+    :param on_lengths: Lengths of the marks
+    :return: Dit length in blocks
+    """
+    values = np.sort(on_lengths.astype(np.float64))
+    if len(values) == 0:
+        return 1.0
+    short, long = values[0], values[-1]
+    if long < short * 2:  # one kind of element only; guess from the gaps later
+        return float(np.median(values))
+    for _ in range(10):
+        is_short = np.abs(values - short) <= np.abs(values - long)
+        short, long = values[is_short].mean(), values[~is_short].mean()
+    return float(short)
+
+
+# Declare functions for decoding ===================================
+def audio_to_morse(samples, sample_rate, frequency=None, block_seconds=BLOCK_SECONDS):
+    """
+    Turn audio into morse code
+    :param samples: Array of samples (integers or floats)
+    :param sample_rate: Samples per second
+    :param frequency: Frequency of the tone, or None to detect it
+    :param block_seconds: Length of one analysis block
+    :return: Codes separated by spaces, words separated by ' / ' ('' for audio shorter than a block)
+    """
+    block = max(int(round(block_seconds * sample_rate)), 8)
+    if len(samples) < block:
+        return ''
+    if frequency is None:
+        frequency = detect_frequency(samples, sample_rate)
+    states, lengths = runs(key_states(tone_envelope(samples, sample_rate, frequency, block)))
+
+    dit = initial_dit(lengths[states])
+    words = []
+    codes = []
+    code = []
+    for state, length in zip(states.tolist(), lengths.tolist()):
+        if state:
+            if length < 2 * dit:
+                code.append('.')
+                dit += (length - dit) * 0.2  # follow the speed of the sender
+            else:
+                code.append('-')
+                dit += (length / 3 - dit) * 0.2
+        elif code:
+            if length >= 5 * dit:
+                codes.append(''.join(code))
+                words.append(' '.join(codes))
+                code, codes = [], []
+            elif length >= 2 * dit:
+                codes.append(''.join(code))
+                code = []
+    if code:
+        codes.append(''.join(code))
+    if codes:
+        words.append(' '.join(codes))
+    return ' / '.join(words)
+
+
+def decode_audio(samples, sample_rate, select='eng', frequency=None):
+    """
+    Convert audio to English or Japanese text
+    :param samples: Array of samples
+    :param sample_rate: Samples per second
+    :param select: A parameter for language
+    :param frequency: Frequency of the tone, or None to detect it
+    :return: Converted text, words separated by spaces
+    """
+    morse = audio_to_morse(samples, sample_rate, frequency)
+    return ' '.join(decode_text(word, select) for word in morse.split(' / ') if word)
+
+
+def decode_wav(path, select='eng', frequency=None):
+    """
+    Convert a WAV file to English or Japanese text
+    :param path: Path of a PCM WAV file
+    :param select: A parameter for language
+    :param frequency: Frequency of the tone, or None to detect it
+    :return: Converted text
+    """
+    samples, sample_rate = read_wav(path)
+    return decode_audio(samples, sample_rate, select, frequency)
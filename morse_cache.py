@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - translation cache
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+An optional memoization layer in front of the four conversion functions.
+Results are kept per (direction, input) with least-recently-used
+eviction, bounded both by the number of entries and by their size, so
+repeated messages (call signs, Q-codes, beacons...) skip the conversion.
+"""
+
+# Import modules ===================================================
+import sys
+import threading
+from collections import OrderedDict
+
+from morse_codec import converters
+
+
+# Declare classes ==================================================
+class TranslationCache:
+    """
+    LRU cache of conversion results
+    A blank input still raises BlankInputError and is not cached.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=16 << 20):
+        """
+        :param max_entries: Largest number of results kept
+        :param max_bytes: Largest memory (inputs and results) kept, in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (direction, text) -> (output, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def convert(self, direction, text):
+        """
+        Convert text, reusing the result of an earlier identical call
+        :param direction: One of DIRECTIONS
+        :param text: String to convert
+        :return: Converted text
+        """
+        key = (direction, text)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        output = converters[direction](text)
+        self.store(key, output)
+        return output
+
+    def store(self, key, output):
+        """
+        Keep a result, evicting the least recently used ones if needed
+        :param key: Tuple of (direction, text)
+        :param output: Converted text
+        :return: None
+        """
+        size = sys.getsizeof(key[1]) + sys.getsizeof(output)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self.entries[key] = (output, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def converter(self, direction):
+        """
+        Cached function of one direction, to use in place of change_*
+        :param direction: One of DIRECTIONS
+        :return: Function of text
+        """
+        converters[direction]  # fail early on an unknown direction
+        return lambda text: self.convert(direction, text)
+
+    def clear(self):
+        """
+        Drop every result (the counters are kept)
+        :return: None
+        """
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """
+        Counters of the cache
+        :return: Dictionary of hits, misses, evictions, entries, bytes and hit_rate
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.entries), 'bytes': self.bytes,
+                    'hit_rate': self.hits / lookups if lookups else 0.0}
@@ -15,155 +15,27 @@ Ver 1.2.1 // 2022-08-16
 
 # Import modules ===================================================
 import tkinter as tk
+from collections import deque
 from tkinter import messagebox as msg
 from tkinter import ttk
 import pyperclip as clip
 
+import morse_metrics
+from morse_cache import TranslationCache
+from morse_codec import BlankInputError
+from morse_codelist import CodeList
+from morse_live import IncrementalTranslator
+from morse_worker import CANCELLED, DONE, ERROR, OUTPUT, PROGRESS, ConversionWorker
 
-# Declare Necessary Dictionaries ===================================
-morse_eng = {'.-': 'a', '-...': 'b', '-.-.': 'c', '-..': 'd', '.': 'e', '..-.': 'f', '--.': 'g',
-             '....': 'h', '..': 'i', '.---': 'j', '-.-': 'k', '.-..': 'l', '--': 'm', '-.': 'n',
-             '---': 'o', '.--.': 'p', '--.-': 'q', '.-.': 'r', '...': 's', '-': 't', '..-': 'u',
-             '...-': 'v', '.--': 'w', '-..-': 'x', '-.--': 'y', '--..': 'z'}
-morse_eng_sym = {'.----': '1', '..---': '2', '...--': '3', '....-': '4', '.....': '5', '-....': '6',
-                 '--...': '7', '---..': '8', '----.': '9', '-----': '0',
-                 '.-.-.-': '.', '--..--': ',', '---...': ':', '-.-.-.': ';', '..--..': '?', '-.-.--': '!',
-                 '.----.': "'", '.-..-.': '"', '-..-.': '/', '-.--.': '(', '-.--.-': ')',
-                 '.-.-.': '+', '-....-': '-', '-...-': '=', '..--.-': '_',
-                 '.-...': '&', '.--.-.': '@', '...-..-': '$'}
-morse_jpn = {'--.--': 'あ', '.-': 'い', '..-': 'う', '-.---': 'え', '.-...': 'お',
-             '.-..': 'か', '-.-..': 'き', '...-': 'く', '-.--': 'け', '----': 'こ',
-             '-.-.-': 'さ', '--.-.': 'し', '---.-': 'す', '.---.': 'せ', '---.': 'そ',
-             '-.': 'た', '..-.': 'ち', '.--.': 'つ', '.-.--': 'て', '..-..': 'と',
-             '.-.': 'な', '-.-.': 'に', '....': 'ぬ', '--.-': 'ね', '..--': 'の',
-             '-...': 'は', '--..-': 'ひ', '--..': 'ふ', '.': 'へ', '-..': 'ほ',
-             '-..-': 'ま', '..-.-': 'み', '-': 'む', '-...-': 'め', '-..-.': 'も',
-             '.--': 'や', '-..--': 'ゆ', '--': 'よ',
-             '...': 'ら', '--.': 'り', '-.--.': 'る', '---': 'れ', '.-.-': 'ろ',
-             '-.-': 'わ', '.-..-': 'ゐ', '.--..': 'ゑ', '.---': 'を', '.-.-.': 'ん', '.--.-': 'ー'}
-morse_jpn_sym = {'.----': '１', '..---': '２', '...--': '３', '....-': '４', '.....': '５', '-....': '６',
-                 '--...': '７', '---..': '８', '----.': '９', '-----': '０',
-                 '..': '゛', '..--.': '゜', '.-.-..': '。', '.-.-.-': '、',
-                 '---...': '：', '-.-.-.': '；', '..--..': '？', '-.-.--': '！',
-                 '.----.': "‘", '.-..-.': '”', '-..-.': '・', '-.--.': '（', '-.--.-': '）',
-                 '.-.-.': '＋', '-....-': '－', '-...-': '＝', '..--.-': '＿',
-                 '.-...': '＆', '.--.-.': '＠', '...-..-': '＄'}  # em-size characters
-
-reverse_morse_eng = {v: k for k, v in morse_eng.items()}
-reverse_morse_jpn = {v: k for k, v in morse_jpn.items()}
-reverse_morse_eng_sym = {v: k for k, v in morse_eng_sym.items()}
-reverse_morse_jpn_sym = {v: k for k, v in morse_jpn_sym.items()}
-
-kana_to_dakuten = {'か': 'が', 'き': 'ぎ', 'く': 'ぐ', 'け': 'げ', 'こ': 'ご',
-                   'さ': 'ざ', 'し': 'じ', 'す': 'ず', 'せ': 'ぜ', 'そ': 'ぞ',
-                   'た': 'だ', 'ち': 'ぢ', 'つ': 'づ', 'て': 'で', 'と': 'ど',
-                   'は': 'ば', 'ひ': 'び', 'ふ': 'ぶ', 'へ': 'べ', 'ほ': 'ぼ', 'う': 'ゔ'}
-kana_to_handakuten = {'は': 'ぱ', 'ひ': 'ぴ', 'ふ': 'ぷ', 'へ': 'ぺ', 'ほ': 'ぽ'}
-
-dakuten_to_kana = {v: k for k, v in kana_to_dakuten.items()}
-handakuten_to_kana = {v: k for k, v in kana_to_handakuten.items()}
-
-small_kana = {'ぁ': 'あ', 'ぃ': 'い', 'ぅ': 'う', 'ぇ': 'え', 'ぉ': 'お', 'ヵ': 'か',
-              'ヶ': 'け', 'っ': 'つ', 'ゃ': 'や', 'ゅ': 'ゆ', 'ょ': 'よ', 'ゎ': 'わ'}
-
-katakana_to_hiragana = {'ア': 'あ', 'イ': 'い', 'ウ': 'う', 'エ': 'え', 'オ': 'お', 'ヴ': 'ゔ',
-                        'カ': 'か', 'キ': 'き', 'ク': 'く', 'ケ': 'け', 'コ': 'こ',
-                        'ガ': 'が', 'ギ': 'ぎ', 'グ': 'ぐ', 'ゲ': 'げ', 'ゴ': 'ご',
-                        'サ': 'さ', 'シ': 'し', 'ス': 'す', 'セ': 'せ', 'ソ': 'そ',
-                        'ザ': 'ざ', 'ジ': 'じ', 'ズ': 'ず', 'ゼ': 'ぜ', 'ゾ': 'ぞ',
-                        'タ': 'た', 'チ': 'ち', 'ツ': 'つ', 'テ': 'て', 'ト': 'と', 'ッ': 'っ',
-                        'ダ': 'だ', 'ヂ': 'ぢ', 'ヅ': 'づ', 'デ': 'で', 'ド': 'ど',
-                        'ナ': 'な', 'ニ': 'に', 'ヌ': 'ぬ', 'ネ': 'ね', 'ノ': 'の',
-                        'ハ': 'は', 'ヒ': 'ひ', 'フ': 'ふ', 'ヘ': 'へ', 'ホ': 'ほ',
-                        'バ': 'ば', 'ビ': 'び', 'ブ': 'ぶ', 'ベ': 'べ', 'ボ': 'ぼ',
-                        'パ': 'ぱ', 'ピ': 'ぴ', 'プ': 'ぷ', 'ペ': 'ぺ', 'ポ': 'ぽ',
-                        'マ': 'ま', 'ミ': 'み', 'ム': 'む', 'メ': 'め', 'モ': 'も',
-                        'ヤ': 'や', 'ユ': 'ゆ', 'ヨ': 'よ', 'ャ': 'ゃ', 'ュ': 'ゅ', 'ョ': 'ょ',
-                        'ラ': 'ら', 'リ': 'り', 'ル': 'る', 'レ': 'れ', 'ロ': 'ろ',
-                        'ワ': 'わ', 'ヰ': 'ゐ', 'ヱ': 'ゑ', 'ヲ': 'を', 'ン': 'ん', 'ヮ': 'ゎ',
-                        'ァ': 'ぁ', 'ィ': 'ぃ', 'ゥ': 'ぅ', 'ェ': 'ぇ', 'ォ': 'ぉ'}
 
-
-# Declare functions for program ====================================
-def text_to_morse(text, select):
-    """
-    Convert text to morse code
-    :param text: String to convert
-    :param select: A parameter for language
-    :return: Converted code
-    """
-    text = text.lower()
-    output = ''
-    if select == 'eng':
-        for t in text:
-            if t in reverse_morse_eng.keys():
-                output += reverse_morse_eng[t] + ' '
-            elif t.isspace():
-                continue
-            else:
-                output += reverse_morse_eng_sym.get(t, '[?]') + ' '
-    else:
-        for t in text:
-            if t in reverse_morse_jpn.keys():
-                output += reverse_morse_jpn[t] + ' '
-            elif t.isspace():
-                continue
-            else:
-                output += reverse_morse_jpn_sym.get(t, '[?]') + ' '
-    return output
-
-
-def morse_to_text(text, select):
-    """
-    Convert morse code to text
-    :param text: String to convert
-    :param select: A parameter for language
-    :return: Converted text
-    """
-    output = ''
-    if select == 'eng':
-        for t in text:
-            if t in morse_eng.keys():
-                output += morse_eng[t]
-            else:
-                output += morse_eng_sym.get(t, '[?]')
-    elif select == 'jpn':
-        for t in text:
-            if t in morse_jpn.keys():
-                output += morse_jpn[t]
-            else:
-                output += morse_jpn_sym.get(t, '[?]')
-    return output
-
-
-def attach_ten(kana, ten):
-    """
-    Attach a detached point in Japanese conversion
-    :param kana: Japanese character for convert
-    :param ten: The type of dot to attach to the letter
-    :return: Dotted character
-    """
-    if ten == '゛' and kana in kana_to_dakuten.keys():
-        return kana_to_dakuten[kana]
-    elif ten == '゜' and kana in kana_to_handakuten.keys():
-        return kana_to_handakuten[kana]
-    else:
-        return kana + ten
-
-
-def release_ten(kana, select):
-    """
-    Release the attached point in Japanese conversion
-    :param kana: Japanese character for convert
-    :param select: The type of dot to detach to the letter
-    :return: Undotted character
-    """
-    if select == 'handaku':
-        return handakuten_to_kana[kana] + '゜'
-    if select == 'daku':
-        return dakuten_to_kana[kana] + '゛'
+POLL_MS = 30  # interval of checking the worker
+INSERT_BATCH = 1 << 15  # characters inserted into the output box per check
+DISPLAY_WIDTH = 1000  # characters per line of the output box (long lines make Tk slow)
+LIVE_DELAY_MS = 150  # pause in typing before the live translation is updated
+CODE_LIST_BATCH = 200  # rows inserted into the code list between two redraws
 
 
+# Declare functions for program ====================================
 def occur_error():
     """
     Display a messagebox when an error occurs
@@ -186,105 +58,217 @@ def exit_window(_=None):
         root.destroy()
 
 
-# Declare functions for converting =================================
-def change_english_to_morse(text):
+def display_lines(text):
     """
-    Main function for convert English to morse code
-    :param text: String for convert
-    :return: converted code
+    Break text into lines for the output box (at spaces when possible)
+    Only the display is broken; the copied output is unchanged.
+    :param text: Piece of the output
+    :return: Text with new lines
     """
-    text = text.lower()
-    if not text:
-        return occur_error()
-    output = text_to_morse(text, 'eng')
-    return output
+    lines = []
+    start = 0
+    while len(text) - start > DISPLAY_WIDTH:
+        cut = text.find(' ', start + DISPLAY_WIDTH, start + DISPLAY_WIDTH + 100)
+        cut = start + DISPLAY_WIDTH if cut < 0 else cut + 1
+        lines.append(text[start:cut])
+        start = cut
+    lines.append(text[start:])
+    return '\n'.join(lines)
 
 
-def change_japanese_to_morse(text):
+def clear_output():
     """
-    Main function for convert Japanese to morse code
-    :param text: String for convert
-    :return: converted code
+    Empty the output box and the output kept for copying
+    :return: None
     """
-    output = ''
-    if not text:
-        return occur_error()
-    for k in text:
-        if k in katakana_to_hiragana.keys():
-            k = katakana_to_hiragana[k]
-        if k in dakuten_to_kana.keys():
-            output += release_ten(k, 'daku')
-        elif k in handakuten_to_kana.keys():
-            output += release_ten(k, 'handaku')
-        elif k in small_kana.keys():
-            output += small_kana[k]
-        else:
-            output += k
+    output_parts.clear()
+    pending_parts.clear()
+    text_output['state'] = 'normal'
+    text_output.delete('1.0', tk.END)
+    text_output['state'] = 'disabled'
+    progress_bar['value'] = 0
 
-    encoding = text_to_morse(output, 'jpn')
-    return encoding
 
-
-def change_morse_to_english(text):
+def stop_worker():
     """
-    Main function for convert morse code to English
-    :param text: String for convert
-    :return: converted text
+    Cancel the running conversion, if any
+    :return: None
     """
-    text = text.lower().split()
-    if not text:
-        return occur_error()
-    output = morse_to_text(text, 'eng')
-    return output
+    global worker
+    if worker is not None:
+        worker.cancel()
+        worker = None
+    button_convert['text'] = buttons[0]
 
 
-def change_morse_to_japanese(text):
+def poll_worker(current):
     """
-    Main function for convert morse code to Japanese
-    :param text: String for convert
-    :return: converted text
+    Take the messages of the worker and insert its output batch by batch
+    :param current: ConversionWorker being shown
+    :return: None
     """
-    text = text.lower().split()
-    if not text:
-        return occur_error()
-
-    temp = morse_to_text(text, 'jpn')  # need to think another variation name
-    output = []
-    for n, k in enumerate(temp):
-        if k in ('゛', '゜') and temp[n - 1].isalpha():
-            output.pop()
-            output.append(attach_ten(temp[n - 1], k))
-        else:
-            output.append(k)
-    return ''.join(output)
+    if current is not shown:
+        return  # replaced or cleared
+    if current is worker:
+        for kind, value in current.poll():
+            if kind == OUTPUT:
+                output_parts.append(value)
+                pending_parts.append(value)
+            elif kind == PROGRESS:
+                progress_bar['value'] = 100 * value
+            elif kind == ERROR:
+                stop_worker()
+                if isinstance(value, BlankInputError):
+                    occur_error()
+                else:
+                    msg.showwarning(titles[4], str(value))
+            elif kind in (DONE, CANCELLED):
+                stop_worker()
+
+    # > insert at most one batch, so the window can redraw between batches
+    batch = []
+    size = 0
+    while pending_parts and size < INSERT_BATCH:
+        part = pending_parts.popleft()
+        if size + len(part) > INSERT_BATCH:
+            pending_parts.appendleft(part[INSERT_BATCH - size:])
+            part = part[:INSERT_BATCH - size]
+        batch.append(part)
+        size += len(part)
+    if batch:
+        text_output['state'] = 'normal'
+        text_output.insert(tk.END, display_lines(''.join(batch)))
+        text_output['state'] = 'disabled'
+
+    if current is worker or pending_parts:
+        root.after(POLL_MS, poll_worker, current)
+
+
+def copy_output():
+    """
+    Copy the whole output (without the line breaks of the output box)
+    :return: None
+    """
+    if live_translator is not None:
+        clip.copy(live_translator.output)
+    else:
+        clip.copy(''.join(output_parts))
 
 
-# Declare functions for button event ===============================
-def start_convert(_=None):
+def select_direction():
     """
-    Start conversion
-    :param _: Key binding (Return)
-    :return: None
+    Read the direction chosen in the menu and show it on the labels
+    :return: One of DIRECTIONS
     """
-    code = entry_input.get()
-    entry_output.delete(0, tk.END)
     if menu_var.get() == 1:
         label_input['text'] = 'Input - English'
         label_output['text'] = 'Output - Morse code'
-        output = change_english_to_morse(code)
+        direction = 'eng2morse'
     elif menu_var.get() == 2:
         label_input['text'] = 'Input - Morse code'
         label_output['text'] = 'Output - English'
-        output = change_morse_to_english(code)
+        direction = 'morse2eng'
     elif menu_var.get() == 3:
         label_input['text'] = 'Input - Japanese'
         label_output['text'] = 'Output - Morse code'
-        output = change_japanese_to_morse(code)
+        direction = 'jpn2morse'
     else:
         label_input['text'] = 'Input - Morse code'
         label_output['text'] = 'Output - Japanese'
-        output = change_morse_to_japanese(code)
-    entry_output.insert(tk.END, output)
+        direction = 'morse2jpn'
+    return direction
+
+
+def schedule_live(*_):
+    """
+    Update the live translation once the typing pauses
+    :param _: Arguments of the menu
+    :return: None
+    """
+    global live_after
+    if live_after is not None:
+        root.after_cancel(live_after)
+        live_after = None
+    if live_var.get():
+        live_after = root.after(LIVE_DELAY_MS, update_live)
+
+
+def record_edit(action, index, changed):
+    """
+    Keep an edit of the input for the live translation (validatecommand of the entry)
+    :param action: '1' for an insertion, '0' for a deletion
+    :param index: Index of the edit in the entry
+    :param changed: Characters inserted or deleted
+    :return: True, so the edit is always allowed
+    """
+    if live_var.get():
+        start = int(index)
+        end = start if action == '1' else start + len(changed)
+        live_edits.append((start, end, changed if action == '1' else ''))
+        schedule_live()
+    return True
+
+
+def update_live():
+    """
+    Convert the changed part of the input and replace only the lines of the blocks it touches
+    Every block has one line of the output box, so its lines stay short
+    and an edit replaces whole lines instead of counting characters.
+    :return: None
+    """
+    global live_translator, live_after, shown
+    live_after = None
+    direction = select_direction()
+    if live_translator is None or live_translator.direction != direction:
+        stop_worker()
+        shown = None
+        clear_output()
+        live_edits.clear()
+        live_translator = IncrementalTranslator(direction)
+        live_edits.append((0, 0, entry_input.get()))
+    text_output['state'] = 'normal'
+    while live_edits:
+        first, count, outputs = live_translator.edit(*live_edits.popleft())
+        text_output.delete('%d.0' % (first + 1), '%d.0' % (first + count + 1))
+        text_output.insert('%d.0' % (first + 1), ''.join(output + '\n' for output in outputs))
+    text_output['state'] = 'disabled'
+
+
+def toggle_live():
+    """
+    Turn the live translation on or off
+    The running conversion is cancelled either way, so its output never
+    lands in the box after the switch.
+    :return: None
+    """
+    global live_translator, shown
+    stop_worker()
+    shown = None
+    live_translator = None
+    clear_output()
+    schedule_live()
+
+
+# Declare functions for button event ===============================
+def start_convert(_=None):
+    """
+    Start conversion on a worker thread, or cancel the running one
+    :param _: Key binding (Return)
+    :return: None
+    """
+    global worker, shown, live_translator
+    if worker is not None:
+        stop_worker()
+        return
+    if live_var.get():
+        return  # the output is already up to date
+    live_translator = None
+    code = entry_input.get()
+    clear_output()
+    direction = select_direction()
+    worker = shown = ConversionWorker(direction, code, translation_cache.convert).start()
+    button_convert['text'] = buttons[4]
+    root.after(POLL_MS, poll_worker, worker)
 
 
 def clear_all(_=None):
@@ -293,8 +277,12 @@ def clear_all(_=None):
     :param _: Key binding (Escape)
     :return: None
     """
+    global shown, live_translator
+    stop_worker()
+    shown = None
+    live_translator = None
     entry_input.delete(0, tk.END)
-    entry_output.delete(0, tk.END)
+    clear_output()
     label_input['text'] = 'Input'
     label_output['text'] = 'Output'
 
@@ -302,71 +290,138 @@ def clear_all(_=None):
 def view_code(_=None):
     """
     Show whole code
+    The window is built once and hidden when closed, so it opens again at once.
     :param _: Key binding (Ctrl + W)
     :return: None
     """
+    global code_window
+    if code_window is None:
+        code_window = build_code_window()
+    table, label_tip, button_exit = code_window
+    table.title(titles[1])
+    label_tip['text'] = shortcuts[1]
+    label_tip['font'] = font, 9
+    button_exit['text'] = buttons[3]
+    table.deiconify()
+    table.lift()
+    table.focus_set()
+
+
+def build_code_window():
+    """
+    Build the code list window
+    :return: Tuple of (window, tip label, exit button), the widgets whose text follows the language
+    """
     # main window
     table = tk.Toplevel(root)
     table.title(titles[1])
-    table.geometry('250x270+500+300')
+    table.geometry('340x300+500+300')
     table.resizable(False, False)
     table['bg'] = COLOR_BG1
 
-    table.focus_set()
+    languages = code_list.languages()
+    state = {'language': None, 'after': None}
+    items = {}  # language -> ids of the rows inserted so far
 
     # listbox
-    language_list = tk.Listbox(table, exportselection=False, selectmode='extended', width=0, height=0)
-    language_list.insert(0, 'English')
-    language_list.insert(1, 'Japanese')
-    language_list.place(x=10, y=10)
+    language_list = tk.Listbox(table, exportselection=False, selectmode='browse')
+    for _, title in languages:
+        language_list.insert(tk.END, title)
+    language_list.place(x=10, y=10, width=120, height=180)
 
     # label
     label_tip = tk.Label(table, text=shortcuts[1],
                          font=(font, 9), fg=COLOR_FG2, bg=COLOR_BG1)
-    label_tip.place(x=10, y=240)
+    label_tip.place(x=10, y=270)
 
     # button
     button_exit = tk.Button(table, text=buttons[3], font=(font, 10), width=6,
-                            command=table.destroy, fg=COLOR_FG1, bg=COLOR_BG2)
+                            command=table.withdraw, fg=COLOR_FG1, bg=COLOR_BG2)
     button_exit.place(x=10, y=200)
 
+    # search box
+    search_var = tk.StringVar()
+    entry_search = tk.Entry(table, font=(font, 10), textvariable=search_var)
+    entry_search.place(x=140, y=10, width=175, height=20)
+
     # treeview
     column = ['alphabet', 'code']
-    code_table = ttk.Treeview(table, columns=column, displaycolumns=column)
-    code_table.place(x=75, y=10)
+    code_table = ttk.Treeview(table, columns=column, displaycolumns=column, height=9)
+    code_table.place(x=140, y=35)
     code_table.column(column[0], width=80, anchor='center')
     code_table.heading(column[0], text='Language', anchor='center')
-    code_table.column(column[1], width=80, anchor='center')
+    code_table.column(column[1], width=95, anchor='center')
     code_table.heading(column[1], text='Morse', anchor='center')
     code_table['show'] = 'headings'
 
+    # scrollbar
+    scroll = ttk.Scrollbar(table, orient='vertical', command=code_table.yview)
+    scroll.place(x=315, y=35, height=225)
+    code_table.configure(yscrollcommand=scroll.set)
+
     # functions
+    def show_rows(*_):
+        """
+        Show the rows of the selected language which match the search box
+        :param _: Arguments of the variable trace
+        :return: None
+        """
+        name = state['language']
+        if name is None:
+            return
+        created = items.get(name, [])
+        positions = code_list.search(name, search_var.get())
+        code_table.set_children('', *[created[n] for n in positions if n < len(created)])
+
+    def insert_rows(name):
+        """
+        Insert the next batch of rows of a language, then let the window redraw
+        :param name: Name of the language
+        :return: None
+        """
+        state['after'] = None
+        rows = code_list.get_rows(name)
+        created = items.setdefault(name, [])
+        start = len(created)
+        for n in range(start, min(start + CODE_LIST_BATCH, len(rows))):
+            iid = '%s:%d' % (name, n)
+            code_table.insert('', 'end', iid=iid, values=rows[n])
+            created.append(iid)
+        if search_var.get().strip():  # hide the new rows which do not match, only them
+            matching = set(code_list.search_between(name, search_var.get(), start, len(created)))
+            hidden = [created[n] for n in range(start, len(created)) if n not in matching]
+            if hidden:
+                code_table.detach(*hidden)
+        if len(created) < len(rows):
+            state['after'] = table.after(1, insert_rows, name)
+
     def select_language(_):
         """
         Show the selected language on the table
         :param _: Key binding (Select listbox)
         :return: None
         """
-        # > initializing
-        code_table.delete(*code_table.get_children())  # initialize the treeview
-        code_table.yview_moveto(0)  # initialize the scrollbar
-
-        # > show the table
-        value = language_list.get(language_list.curselection())  # selected language
-        if value == 'English':
-            code_table.heading(column[0], text='English', anchor='center')
-            tree_value = list(reverse_morse_eng.items()) + list(reverse_morse_eng_sym.items())
+        selection = language_list.curselection()
+        if not selection:
+            return
+        name, title = languages[selection[0]]
+        try:
+            rows = code_list.get_rows(name)
+        except ValueError as error:  # a broken alphabet definition
+            msg.showwarning(titles[4], str(error))
+            return
+        if state['after'] is not None:
+            table.after_cancel(state['after'])
+            state['after'] = None
+        state['language'] = name
+        code_table.heading(column[0], text=title, anchor='center')
+        code_table.set_children('')  # the rows of the other languages are kept, detached
+        code_table.yview_moveto(0)
+        if len(items.get(name, ())) < len(rows):
+            show_rows()  # the rows inserted before another language was shown
+            insert_rows(name)
         else:
-            code_table.heading(column[0], text='Japanese', anchor='center')
-            tree_value = list(reverse_morse_jpn.items()) + list(reverse_morse_jpn_sym.items())
-
-        for i, v in enumerate(tree_value):
-            code_table.insert('', 'end', text='', values=v, iid=i)
-
-        # > set scrollbar
-        scroll = ttk.Scrollbar(table, orient='vertical', command=code_table.yview)
-        scroll.place(x=237, y=10, height=225)
-        code_table.configure(yscrollcommand=scroll.set)
+            show_rows()
 
     def copy_in_clipboard(_):
         """
@@ -375,19 +430,86 @@ def view_code(_=None):
         :return: None
         """
         selections = code_table.selection()
-        copy_word = code_table.item(selections, 'values')
-        clip.copy(copy_word[1] + ' ')
+        if selections:
+            clip.copy(code_table.item(selections[0], 'values')[1] + ' ')
 
     # binding
     language_list.bind('<<ListboxSelect>>', select_language)
+    search_var.trace_add('write', show_rows)
     code_table.bind('<Double-Button-1>', copy_in_clipboard)
     code_table.bind('<Control-Key-c>', copy_in_clipboard)
-    table.bind('<Escape>', lambda _: table.destroy())
+    table.bind('<Escape>', lambda _: table.withdraw())
+    table.protocol('WM_DELETE_WINDOW', table.withdraw)
 
-    table.mainloop()
+    return table, label_tip, button_exit
 
 
 # Declare functions for menu =======================================
+def toggle_metrics():
+    """
+    Turn the measurement of the conversions on or off
+    :return: None
+    """
+    if metrics_var.get():
+        morse_metrics.enable()
+    else:
+        morse_metrics.disable()
+
+
+def view_metrics(_=None):
+    """
+    Open menu 'Metrics'
+    :param _: Key binding (F11)
+    :return: None
+    """
+    # main window
+    table = tk.Toplevel(root)
+    table.title('Metrics')
+    table.geometry('620x260+500+300')
+    table.resizable(False, False)
+    table['bg'] = COLOR_BG1
+
+    table.focus_set()
+
+    # text
+    text_metrics = tk.Text(table, font=('Courier', 9), fg=COLOR_FG2, wrap='none', undo=False)
+    text_metrics.place(x=10, y=10, width=600, height=200)
+
+    def refresh():
+        """
+        Show the current counters
+        :return: None
+        """
+        text_metrics['state'] = 'normal'
+        text_metrics.delete('1.0', tk.END)
+        text_metrics.insert(tk.END, morse_metrics.report())
+        text_metrics['state'] = 'disabled'
+
+    def reset():
+        """
+        Set the counters back to zero
+        :return: None
+        """
+        morse_metrics.reset()
+        refresh()
+
+    # button
+    button_refresh = tk.Button(table, text='refresh', font=(font, 10), width=8,
+                               command=refresh, fg=COLOR_FG1, bg=COLOR_BG2)
+    button_refresh.place(x=10, y=220)
+    button_reset = tk.Button(table, text='reset', font=(font, 10), width=8,
+                             command=reset, fg=COLOR_FG1, bg=COLOR_BG2)
+    button_reset.place(x=100, y=220)
+    button_close = tk.Button(table, text=buttons[3], font=(font, 10), width=8,
+                             command=table.destroy, fg=COLOR_FG1, bg=COLOR_BG2)
+    button_close.place(x=530, y=220)
+
+    # key binding
+    table.bind('<Escape>', lambda _: table.destroy())
+
+    refresh()
+
+
 def open_help(_=None):
     """
     Open menu 'Help'
@@ -458,7 +580,7 @@ def change_language():
         titles = ['Morse Code Translator', 'Code List', 'Help', 'Info', 'Error', 'Quit']
         messages = ['The input column is blank.', 'Really quit?']
         translate = ['Eng → Morse', 'Morse → Eng', 'Jpn → Morse', 'Morse → Jpn']
-        buttons = ['convert', 'clear', 'copy output', 'exit']
+        buttons = ['convert', 'clear', 'copy output', 'exit', 'cancel']
         shortcuts = ['[Ctrl + Q] to quit the program / [Ctrl + W] to view the codes',
                      '[Ctrl + C] or Double click to copy the code']
         explain = '1. From the menu, choose the language (or code) you wish to convert.\n' \
@@ -475,7 +597,7 @@ def change_language():
         titles = ['モールス信号翻訳機', 'コード一覧', 'ヘルプ', '情報', 'エラー', '終了']
         messages = ['Input欄が空白です。', '終了しますか？']
         translate = ['英語 → モールス', 'モールス → 英語', '日本語 → モールス', 'モールス → 日本語']
-        buttons = ['変換', '初期化', 'コピー', '閉じる']
+        buttons = ['変換', '初期化', 'コピー', '閉じる', '中止']
         shortcuts = ['［Ctrl + Q］でプログラムが終了 / ［Ctrl + W］でコード一覧',
                      '［Ctrl + C］やダブルクリックでコピー']
         explain = '1. メニューから変換するものを選んでください。\n' \
@@ -493,7 +615,7 @@ def change_language():
         titles = ['모스부호 번역기', '모스부호 표', '도움말', '정보', '오류', '종료']
         messages = ['입력이 공백입니다.', '종료하시겠습니까?']
         translate = ['영어 → 모스부호', '모스부호 → 영어', '일어 → 모스부호', '모스부호 → 일어']
-        buttons = ['변환', '초기화', '복사', '닫기']
+        buttons = ['변환', '초기화', '복사', '닫기', '취소']
         shortcuts = ['[Ctrl + Q]로 종료 / [Ctrl + W]로 모스부호 표 일람',
                      '[Ctrl + C]나 더블클릭으로 복사']
         explain = '1. 메뉴에서 무엇을 변환할지 선택해주세요.\n' \
@@ -517,7 +639,7 @@ def change_language():
     btn_jpn_to_morse['font'] = font, 9
     btn_morse_to_jpn['font'] = font, 9
 
-    button_convert['text'] = buttons[0]
+    button_convert['text'] = buttons[0] if worker is None else buttons[4]
     button_clear['text'] = buttons[1]
     button_copy['text'] = buttons[2]
 
@@ -542,7 +664,7 @@ COLOR_FG3 = '#1e80c1'  # blue
 titles = ['Morse Code Translator', 'Code List', 'Help', 'Info', 'Error', 'Quit']
 messages = ['The input column is blank.', 'Really quit?']
 translate = ['Eng → Morse', 'Morse → Eng', 'Jpn → Morse', 'Morse → Jpn']
-buttons = ['convert', 'clear', 'copy output', 'exit']
+buttons = ['convert', 'clear', 'copy output', 'exit', 'cancel']
 shortcuts = ['[Ctrl + Q] to quit the program / [Ctrl + W] to view the codes',
              '[Ctrl + C] or Double click to copy the code']
 explain = '1. From the menu, choose the language (or code) you wish to convert.\n' \
@@ -555,10 +677,28 @@ info = '[Morse code translator]\n'\
 
 
 # Main code ========================================================
+# > repeated inputs are answered from the cache
+translation_cache = TranslationCache()
+
+# > conversion running in the background, and its output
+worker = None
+shown = None  # conversion whose output is in the box
+output_parts = []  # whole output, for copying
+pending_parts = deque()  # output not inserted into the box yet
+
+# > code list window, built on first use
+code_list = CodeList()
+code_window = None
+
+# > live translation while typing
+live_translator = None
+live_after = None  # pending update of the live translation
+live_edits = deque()  # edits of the input not translated yet
+
 # > main window
 root = tk.Tk()
 root.title(titles[0])
-root.geometry('500x315+100+100')
+root.geometry('500x435+100+100')
 root.resizable(False, False)
 root['bg'] = COLOR_BG1
 
@@ -580,6 +720,12 @@ menu_config_lang.add_radiobutton(label='English', value=1, variable=language, co
 menu_config_lang.add_radiobutton(label='日本語', value=2, variable=language, command=change_language)
 menu_config_lang.add_radiobutton(label='한국어', value=3, variable=language, command=change_language)
 menu_config.add_cascade(label='Languages', menu=menu_config_lang)
+live_var = tk.BooleanVar(value=False)
+menu_config.add_checkbutton(label='Live translation', variable=live_var, command=toggle_live)
+menu_config.add_separator()
+metrics_var = tk.BooleanVar(value=False)
+menu_config.add_checkbutton(label='Record metrics', variable=metrics_var, command=toggle_metrics)
+menu_config.add_command(label='Metrics..', command=view_metrics, accelerator='F11')
 menubar.add_cascade(label='Options', menu=menu_config)
 
 root.config(menu=menubar)
@@ -589,7 +735,7 @@ menu_frame = tk.Frame(root, height=85, width=300, relief='ridge', bd=2, bg=COLOR
 menu_frame.place(x=5, y=5)
 input_frame = tk.Frame(root, height=57, width=490, relief='ridge', bd=2, bg=COLOR_BG1, padx=2, pady=2)
 input_frame.place(x=5, y=95)
-output_frame = tk.Frame(root, height=57, width=490, relief='ridge', bd=2, bg=COLOR_BG1, padx=2, pady=2)
+output_frame = tk.Frame(root, height=177, width=490, relief='ridge', bd=2, bg=COLOR_BG1, padx=2, pady=2)
 output_frame.place(x=5, y=215)
 
 # > selection
@@ -597,10 +743,14 @@ label_menu = tk.Label(root, text='Menu', font=(font, 11), fg=COLOR_FG1, bg=COLOR
 label_menu.place(x=10, y=10)
 
 menu_var = tk.IntVar()
-btn_eng_to_morse = tk.Radiobutton(root, text=translate[0], font=(font, 9), value=1, variable=menu_var, bg=COLOR_BG1)
-btn_morse_to_eng = tk.Radiobutton(root, text=translate[1], font=(font, 9), value=2, variable=menu_var, bg=COLOR_BG1)
-btn_jpn_to_morse = tk.Radiobutton(root, text=translate[2], font=(font, 9), value=3, variable=menu_var, bg=COLOR_BG1)
-btn_morse_to_jpn = tk.Radiobutton(root, text=translate[3], font=(font, 9), value=4, variable=menu_var, bg=COLOR_BG1)
+btn_eng_to_morse = tk.Radiobutton(root, text=translate[0], font=(font, 9), value=1, variable=menu_var, bg=COLOR_BG1,
+                                  command=schedule_live)
+btn_morse_to_eng = tk.Radiobutton(root, text=translate[1], font=(font, 9), value=2, variable=menu_var, bg=COLOR_BG1,
+                                  command=schedule_live)
+btn_jpn_to_morse = tk.Radiobutton(root, text=translate[2], font=(font, 9), value=3, variable=menu_var, bg=COLOR_BG1,
+                                  command=schedule_live)
+btn_morse_to_jpn = tk.Radiobutton(root, text=translate[3], font=(font, 9), value=4, variable=menu_var, bg=COLOR_BG1,
+                                  command=schedule_live)
 btn_eng_to_morse.select()
 
 btn_eng_to_morse.place(x=10, y=40)
@@ -611,31 +761,36 @@ btn_morse_to_jpn.place(x=150, y=60)
 # > input entry
 label_input = tk.Label(root, text='Input', font=(font, 11), fg=COLOR_FG1, bg=COLOR_BG2)
 label_input.place(x=10, y=100)
-entry_input = tk.Entry(width=59, font=(font, 11))
+entry_input = tk.Entry(width=59, font=(font, 11), validate='key')
+entry_input['validatecommand'] = (root.register(record_edit), '%d', '%i', '%S')
 entry_input.place(x=10, y=125, height=20)
 
-# > output entry
+# > output box
 label_output = tk.Label(root, text='Output', font=(font, 11), fg=COLOR_FG1, bg=COLOR_BG2)
 label_output.place(x=10, y=220)
-entry_output = tk.Entry(width=59, font=(font, 11), fg=COLOR_FG3)
-entry_output.place(x=10, y=245, height=20)
+progress_bar = ttk.Progressbar(root, orient='horizontal', mode='determinate', maximum=100)
+progress_bar.place(x=285, y=222, width=200, height=18)
+text_output = tk.Text(root, font=(font, 11), fg=COLOR_FG3, wrap='word', state='disabled', undo=False)
+text_output.place(x=10, y=245, width=460, height=140)
+scroll_output = ttk.Scrollbar(root, orient='vertical', command=text_output.yview)
+scroll_output.place(x=470, y=245, height=140)
+text_output.configure(yscrollcommand=scroll_output.set)
 
 # > buttons
 button_convert = tk.Button(text=buttons[0], font=(font, 10), command=start_convert, fg=COLOR_FG1, bg=COLOR_BG2)
 button_clear = tk.Button(text=buttons[1], font=(font, 10), command=clear_all, fg=COLOR_FG1, bg=COLOR_BG2)
-button_copy = tk.Button(text=buttons[2], font=(font, 10),
-                        command=lambda: clip.copy(entry_output.get()), fg=COLOR_FG1, bg=COLOR_BG2)
+button_copy = tk.Button(text=buttons[2], font=(font, 10), command=copy_output, fg=COLOR_FG1, bg=COLOR_BG2)
 button_convert.place(x=80, y=168, width=100)
 button_clear.place(x=200, y=168, width=100)
 button_copy.place(x=320, y=168, width=100)
 
 # > shortcuts
 label_shortcut = tk.Label(root, text=shortcuts[0], font=(font, 9), fg=COLOR_FG2, bg=COLOR_BG1)
-label_shortcut.place(x=10, y=289)
+label_shortcut.place(x=10, y=409)
 
 # > version
 label_version = tk.Label(root, text='Ver 1.3.0', font=(font, 10), fg='blue', bg=COLOR_BG1)
-label_version.place(x=440, y=289)
+label_version.place(x=440, y=409)
 
 # > key binding
 root.bind('<Return>', start_convert)
@@ -643,6 +798,7 @@ root.bind('<Escape>', clear_all)
 root.bind('<Control-q>', exit_window)
 root.bind('<Control-w>', view_code)
 root.bind('<F1>', open_help)
+root.bind('<F11>', view_metrics)
 root.bind('<F12>', open_program_info)
 
 # > quit program
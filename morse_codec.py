@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - codec core
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Conversion tables and functions of the translator, without any GUI.
+This module only uses the standard library, so it can be imported by
+batch workers and scripts on machines without a display.
+"""
+
+# Import modules ===================================================
+import re
+import unicodedata
+from itertools import chain
+
+
+CHUNK_SIZE = 1 << 16  # characters read at once by the streaming functions
+TABLE_LIMIT = 1 << 12  # entries of a lookup table past which unknown characters are not remembered
+
+# Directions of conversion, in the order of the menu (1 to 4)
+DIRECTIONS = ('eng2morse', 'morse2eng', 'jpn2morse', 'morse2jpn')
+
+
+# Declare Necessary Dictionaries ===================================
+morse_eng = {'.-': 'a', '-...': 'b', '-.-.': 'c', '-..': 'd', '.': 'e', '..-.': 'f', '--.': 'g',
+             '....': 'h', '..': 'i', '.---': 'j', '-.-': 'k', '.-..': 'l', '--': 'm', '-.': 'n',
+             '---': 'o', '.--.': 'p', '--.-': 'q', '.-.': 'r', '...': 's', '-': 't', '..-': 'u',
+             '...-': 'v', '.--': 'w', '-..-': 'x', '-.--': 'y', '--..': 'z'}
+morse_eng_sym = {'.----': '1', '..---': '2', '...--': '3', '....-': '4', '.....': '5', '-....': '6',
+                 '--...': '7', '---..': '8', '----.': '9', '-----': '0',
+                 '.-.-.-': '.', '--..--': ',', '---...': ':', '-.-.-.': ';', '..--..': '?', '-.-.--': '!',
+                 '.----.': "'", '.-..-.': '"', '-..-.': '/', '-.--.': '(', '-.--.-': ')',
+                 '.-.-.': '+', '-....-': '-', '-...-': '=', '..--.-': '_',
+                 '.-...': '&', '.--.-.': '@', '...-..-': '$'}
+morse_jpn = {'--.--': 'あ', '.-': 'い', '..-': 'う', '-.---': 'え', '.-...': 'お',
+             '.-..': 'か', '-.-..': 'き', '...-': 'く', '-.--': 'け', '----': 'こ',
+             '-.-.-': 'さ', '--.-.': 'し', '---.-': 'す', '.---.': 'せ', '---.': 'そ',
+             '-.': 'た', '..-.': 'ち', '.--.': 'つ', '.-.--': 'て', '..-..': 'と',
+             '.-.': 'な', '-.-.': 'に', '....': 'ぬ', '--.-': 'ね', '..--': 'の',
+             '-...': 'は', '--..-': 'ひ', '--..': 'ふ', '.': 'へ', '-..': 'ほ',
+             '-..-': 'ま', '..-.-': 'み', '-': 'む', '-...-': 'め', '-..-.': 'も',
+             '.--': 'や', '-..--': 'ゆ', '--': 'よ',
+             '...': 'ら', '--.': 'り', '-.--.': 'る', '---': 'れ', '.-.-': 'ろ',
+             '-.-': 'わ', '.-..-': 'ゐ', '.--..': 'ゑ', '.---': 'を', '.-.-.': 'ん', '.--.-': 'ー'}
+morse_jpn_sym = {'.----': '１', '..---': '２', '...--': '３', '....-': '４', '.....': '５', '-....': '６',
+                 '--...': '７', '---..': '８', '----.': '９', '-----': '０',
+                 '..': '゛', '..--.': '゜', '.-.-..': '。', '.-.-.-': '、',
+                 '---...': '：', '-.-.-.': '；', '..--..': '？', '-.-.--': '！',
+                 '.----.': "‘", '.-..-.': '”', '-..-.': '・', '-.--.': '（', '-.--.-': '）',
+                 '.-.-.': '＋', '-....-': '－', '-...-': '＝', '..--.-': '＿',
+                 '.-...': '＆', '.--.-.': '＠', '...-..-': '＄'}  # em-size characters
+
+reverse_morse_eng = {v: k for k, v in morse_eng.items()}
+reverse_morse_jpn = {v: k for k, v in morse_jpn.items()}
+reverse_morse_eng_sym = {v: k for k, v in morse_eng_sym.items()}
+reverse_morse_jpn_sym = {v: k for k, v in morse_jpn_sym.items()}
+
+kana_to_dakuten = {'か': 'が', 'き': 'ぎ', 'く': 'ぐ', 'け': 'げ', 'こ': 'ご',
+                   'さ': 'ざ', 'し': 'じ', 'す': 'ず', 'せ': 'ぜ', 'そ': 'ぞ',
+                   'た': 'だ', 'ち': 'ぢ', 'つ': 'づ', 'て': 'で', 'と': 'ど',
+                   'は': 'ば', 'ひ': 'び', 'ふ': 'ぶ', 'へ': 'べ', 'ほ': 'ぼ', 'う': 'ゔ'}
+kana_to_handakuten = {'は': 'ぱ', 'ひ': 'ぴ', 'ふ': 'ぷ', 'へ': 'ぺ', 'ほ': 'ぽ'}
+
+dakuten_to_kana = {v: k for k, v in kana_to_dakuten.items()}
+handakuten_to_kana = {v: k for k, v in kana_to_handakuten.items()}
+
+small_kana = {'ぁ': 'あ', 'ぃ': 'い', 'ぅ': 'う', 'ぇ': 'え', 'ぉ': 'お', 'ヵ': 'か',
+              'ヶ': 'け', 'っ': 'つ', 'ゃ': 'や', 'ゅ': 'ゆ', 'ょ': 'よ', 'ゎ': 'わ'}
+
+katakana_to_hiragana = {'ア': 'あ', 'イ': 'い', 'ウ': 'う', 'エ': 'え', 'オ': 'お', 'ヴ': 'ゔ',
+                        'カ': 'か', 'キ': 'き', 'ク': 'く', 'ケ': 'け', 'コ': 'こ',
+                        'ガ': 'が', 'ギ': 'ぎ', 'グ': 'ぐ', 'ゲ': 'げ', 'ゴ': 'ご',
+                        'サ': 'さ', 'シ': 'し', 'ス': 'す', 'セ': 'せ', 'ソ': 'そ',
+                        'ザ': 'ざ', 'ジ': 'じ', 'ズ': 'ず', 'ゼ': 'ぜ', 'ゾ': 'ぞ',
+                        'タ': 'た', 'チ': 'ち', 'ツ': 'つ', 'テ': 'て', 'ト': 'と', 'ッ': 'っ',
+                        'ダ': 'だ', 'ヂ': 'ぢ', 'ヅ': 'づ', 'デ': 'で', 'ド': 'ど',
+                        'ナ': 'な', 'ニ': 'に', 'ヌ': 'ぬ', 'ネ': 'ね', 'ノ': 'の',
+                        'ハ': 'は', 'ヒ': 'ひ', 'フ': 'ふ', 'ヘ': 'へ', 'ホ': 'ほ',
+                        'バ': 'ば', 'ビ': 'び', 'ブ': 'ぶ', 'ベ': 'べ', 'ボ': 'ぼ',
+                        'パ': 'ぱ', 'ピ': 'ぴ', 'プ': 'ぷ', 'ペ': 'ぺ', 'ポ': 'ぽ',
+                        'マ': 'ま', 'ミ': 'み', 'ム': 'む', 'メ': 'め', 'モ': 'も',
+                        'ヤ': 'や', 'ユ': 'ゆ', 'ヨ': 'よ', 'ャ': 'ゃ', 'ュ': 'ゅ', 'ョ': 'ょ',
+                        'ラ': 'ら', 'リ': 'り', 'ル': 'る', 'レ': 'れ', 'ロ': 'ろ',
+                        'ワ': 'わ', 'ヰ': 'ゐ', 'ヱ': 'ゑ', 'ヲ': 'を', 'ン': 'ん', 'ヮ': 'ゎ',
+                        'ァ': 'ぁ', 'ィ': 'ぃ', 'ゥ': 'ぅ', 'ェ': 'ぇ', 'ォ': 'ぉ'}
+
+combining_to_ten = {'\u3099': '゛', '\u309a': '゜'}  # also what NFKC gives for half-width ﾞ and ﾟ
+fullwidth_to_jpn_sym = {'．': '。', '，': '、', '／': '・', '＇': '‘', '＂': '”'}
+
+
+
+# Declare exceptions ===============================================
+class ConversionError(ValueError):
+    """
+    Base class of the errors raised by a conversion
+    """
+
+
+class BlankInputError(ConversionError):
+    """
+    Raised when the text to convert is blank
+    """
+
+
+# Declare lookup tables ============================================
+class EncodeTable(dict):
+    """
+    Lookup table for encoding
+    Characters which are not in the table are converted on first use
+    (whitespace is dropped, others become '[?] ') and remembered until the
+    table holds TABLE_LIMIT entries, so arbitrary input in a long-lived
+    process cannot grow it without bound.
+    """
+
+    def __missing__(self, key):
+        return self.remember(key, '' if key.isspace() else '[?] ')
+
+    def remember(self, key, value):
+        """
+        Store the value of a missing character while there is room
+        :param key: Character
+        :param value: Its 'code ' (or '' / '[?] ')
+        :return: The value
+        """
+        if len(self) < TABLE_LIMIT:
+            self[key] = value
+        return value
+
+
+def build_encode_table(letters, symbols):
+    """
+    Merge the reversed dictionaries of a language into one encode table
+    :param letters: Reversed dictionary of letters
+    :param symbols: Reversed dictionary of symbols
+    :return: EncodeTable mapping characters to 'code '
+    """
+    table = EncodeTable()
+    for k, v in symbols.items():
+        table[k] = v + ' '
+    for k, v in letters.items():  # letters take priority, as in text_to_morse
+        table[k] = v + ' '
+    return table
+
+
+def build_decode_table(letters, symbols):
+    """
+    Merge the dictionaries of a language into one decode table
+    :param letters: Dictionary of letters
+    :param symbols: Dictionary of symbols
+    :return: Dictionary mapping codes to characters
+    """
+    table = dict(symbols)
+    table.update(letters)  # letters take priority, as in morse_to_text
+    return table
+
+
+encode_tables = {'eng': build_encode_table(reverse_morse_eng, reverse_morse_eng_sym),
+                 'jpn': build_encode_table(reverse_morse_jpn, reverse_morse_jpn_sym)}
+decode_tables = {'eng': build_decode_table(morse_eng, morse_eng_sym),
+                 'jpn': build_decode_table(morse_jpn, morse_jpn_sym)}
+
+def fold_kana(kana):
+    """
+    Fold one Japanese character into characters of the code table
+    :param kana: Japanese character
+    :return: Hiragana with a detached point, or the character itself
+    """
+    kana = katakana_to_hiragana.get(kana, kana)
+    if kana in dakuten_to_kana:
+        return dakuten_to_kana[kana] + '゛'
+    if kana in handakuten_to_kana:
+        return handakuten_to_kana[kana] + '゜'
+    return small_kana.get(kana, kana)
+
+
+def build_japanese_folding():
+    """
+    Fold every Japanese character which is not in the code table
+    Covers katakana, voiced and small kana, half-width katakana,
+    combining points and full-width punctuation.
+    :return: Dictionary of character to folded characters
+    """
+    folding = {}
+    for k in chain(katakana_to_hiragana, dakuten_to_kana, handakuten_to_kana, small_kana):
+        folding[k] = fold_kana(k)
+    for c in range(0xFF61, 0xFFA0):  # half-width katakana and punctuation
+        k = chr(c)
+        wide = unicodedata.normalize('NFKC', k)
+        wide = combining_to_ten.get(wide, wide)
+        if len(wide) == 1 and wide != k:
+            folding[k] = fold_kana(wide)
+    folding.update(combining_to_ten)
+    folding.update(fullwidth_to_jpn_sym)
+    return folding
+
+
+def build_folded_encode_table(table, folding):
+    """
+    Extend an encode table with the codes of folded characters
+    :param table: EncodeTable of a language
+    :param folding: Dictionary of character to folded characters
+    :return: EncodeTable which converts every character in one lookup
+    """
+    folded = EncodeTable(table)
+    for k, v in folding.items():
+        folded[k] = ''.join(map(table.__getitem__, v))
+    return folded
+
+
+japanese_folding = build_japanese_folding()
+japanese_encode_table = build_folded_encode_table(encode_tables['jpn'], japanese_folding)
+
+longest_code = max(len(k) for table in decode_tables.values() for k in table)
+
+ten_pattern = re.compile('(.)([゛゜])', re.DOTALL)
+
+
+# Declare functions for codec ======================================
+def text_to_morse(text, select):
+    """
+    Convert text to morse code
+    :param text: String to convert
+    :param select: A parameter for language
+    :return: Converted code
+    """
+    table = encode_tables['eng' if select == 'eng' else 'jpn']
+    return ''.join(map(table.__getitem__, text.lower()))
+
+
+def morse_to_text(text, select):
+    """
+    Convert morse code to text
+    :param text: List of codes to convert
+    :param select: A parameter for language
+    :return: Converted text
+    """
+    table = decode_tables.get(select)
+    if table is None:
+        return ''
+    get = table.get
+    return ''.join([get(t, '[?]') for t in text])
+
+
+def attach_ten(kana, ten):
+    """
+    Attach a detached point in Japanese conversion
+    :param kana: Japanese character for convert
+    :param ten: The type of dot to attach to the letter
+    :return: Dotted character
+    """
+    if ten == '゛' and kana in kana_to_dakuten.keys():
+        return kana_to_dakuten[kana]
+    elif ten == '゜' and kana in kana_to_handakuten.keys():
+        return kana_to_handakuten[kana]
+    else:
+        return kana + ten
+
+
+def release_ten(kana, select):
+    """
+    Release the attached point in Japanese conversion
+    :param kana: Japanese character for convert
+    :param select: The type of dot to detach to the letter
+    :return: Undotted character
+    """
+    if select == 'handaku':
+        return handakuten_to_kana[kana] + '゜'
+    if select == 'daku':
+        return dakuten_to_kana[kana] + '゛'
+
+
+def merge_ten(text):
+    """
+    Attach every detached point to the character before it
+    :param text: Converted Japanese text
+    :return: Text with dotted characters
+    """
+    if '゛' not in text and '゜' not in text:
+        return text
+
+    def attach(match):
+        kana, ten = match.groups()
+        return attach_ten(kana, ten) if kana.isalpha() else match.group()
+
+    return ten_pattern.sub(attach, text)
+
+
+def normalize_japanese(text):
+    """
+    Convert katakana to hiragana, release the points and enlarge small kana
+    :param text: Japanese text
+    :return: Text which only uses the characters of the code table
+    """
+    get = japanese_folding.get
+    return ''.join([get(k, k) for k in text])
+
+
+def encode_text(text, select):
+    """
+    Convert English or Japanese text to morse code
+    Japanese is folded and encoded in one lookup per character.
+    :param text: String to convert
+    :param select: A parameter for language
+    :return: Converted code
+    """
+    if select == 'eng':
+        return text_to_morse(text, 'eng')
+    return ''.join(map(japanese_encode_table.__getitem__, text.lower()))
+
+
+def decode_text(text, select):
+    """
+    Convert morse code to English or Japanese text
+    :param text: String of codes separated by whitespace
+    :param select: A parameter for language
+    :return: Converted text
+    """
+    output = morse_to_text(text.lower().split(), select)
+    if select == 'jpn':
+        return merge_ten(output)
+    return output
+
+
+def parse_direction(direction):
+    """
+    Split a direction into the way of conversion and the language
+    :param direction: One of DIRECTIONS
+    :return: Tuple of (True if it converts to morse code, language)
+    :raise ValueError: If the direction is unknown
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError('Unknown direction: %r' % (direction,))
+    source, target = direction.split('2')
+    if target == 'morse':
+        return True, source
+    return False, target
+
+
+def convert(text, direction):
+    """
+    Convert text in a direction (a blank input gives a blank output)
+    :param text: String to convert
+    :param direction: One of DIRECTIONS
+    :return: Converted text
+    """
+    encode, select = parse_direction(direction)
+    if encode:
+        return encode_text(text, select)
+    return decode_text(text, select)
+
+
+# Declare functions for streaming ==================================
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    Iterate over the text of a source
+    :param source: File-like object with read(), a string or an iterable of strings
+    :param chunk_size: Number of characters to read at once from a file
+    :return: Iterator of strings
+    """
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, 'read'):
+        read = source.read
+        chunk = read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = read(chunk_size)
+    else:
+        yield from source
+
+
+def encode_stream(source, select, chunk_size=CHUNK_SIZE):
+    """
+    Convert English or Japanese text to morse code chunk by chunk
+    :param source: File-like object, string or iterable of strings
+    :param select: A parameter for language
+    :param chunk_size: Number of characters to read at once from a file
+    :return: Iterator of converted code
+    """
+    for chunk in iter_chunks(source, chunk_size):
+        output = encode_text(chunk, select)
+        if output:
+            yield output
+
+
+def decode_stream(source, select, chunk_size=CHUNK_SIZE):
+    """
+    Convert morse code to English or Japanese text chunk by chunk
+    A code split between two chunks is joined before it is converted, and
+    in Japanese the last character is held back until the next chunk shows
+    whether a detached point follows it.
+    :param source: File-like object, string or iterable of strings
+    :param select: A parameter for language
+    :param chunk_size: Number of characters to read at once from a file
+    :return: Iterator of converted text
+    """
+    carry = ''  # unfinished code at the end of the last chunk
+    pending = ''  # last Japanese character, waiting for a point
+    for chunk in iter_chunks(source, chunk_size):
+        text = carry + chunk
+        if text[-1:].isspace():
+            carry = ''
+        else:
+            parts = text.rsplit(None, 1)
+            text = parts[0] if len(parts) == 2 else ''
+            carry = parts[-1][:longest_code + 1] if parts else ''  # a longer code is unknown anyway
+
+        output = morse_to_text(text.lower().split(), select)
+        if select == 'jpn':
+            output = merge_ten(pending + output)
+            output, pending = output[:-1], output[-1:]
+        if output:
+            yield output
+
+    output = morse_to_text(carry.lower().split(), select)
+    if select == 'jpn':
+        output = merge_ten(pending + output)
+    if output:
+        yield output
+
+
+def convert_stream(source, direction, chunk_size=CHUNK_SIZE):
+    """
+    Convert text in a direction chunk by chunk
+    :param source: File-like object, string or iterable of strings
+    :param direction: One of DIRECTIONS
+    :param chunk_size: Number of characters to read at once from a file
+    :return: Iterator of converted text
+    """
+    encode, select = parse_direction(direction)
+    if encode:
+        return encode_stream(source, select, chunk_size)
+    return decode_stream(source, select, chunk_size)
+
+
+# Declare functions for converting =================================
+def check_blank(text, direction):
+    """
+    Refuse a blank input: an empty text, or only whitespace for morse code
+    :param text: String to convert
+    :param direction: One of DIRECTIONS
+    :return: None
+    :raise BlankInputError: If the text is blank
+    """
+    if not text or (not parse_direction(direction)[0] and text.isspace()):
+        raise BlankInputError('The input is blank.')
+
+
+def change_english_to_morse(text):
+    """
+    Main function for convert English to morse code
+    :param text: String for convert
+    :return: converted code
+    :raise BlankInputError: If the text is blank
+    """
+    check_blank(text, 'eng2morse')
+    output = encode_text(text.lower(), 'eng')
+    return output
+
+
+def change_japanese_to_morse(text):
+    """
+    Main function for convert Japanese to morse code
+    :param text: String for convert
+    :return: converted code
+    :raise BlankInputError: If the text is blank
+    """
+    check_blank(text, 'jpn2morse')
+    encoding = encode_text(text, 'jpn')
+    return encoding
+
+
+def change_morse_to_english(text):
+    """
+    Main function for convert morse code to English
+    :param text: String for convert
+    :return: converted text
+    :raise BlankInputError: If the text is blank
+    """
+    check_blank(text, 'morse2eng')
+    output = decode_text(text, 'eng')
+    return output
+
+
+def change_morse_to_japanese(text):
+    """
+    Main function for convert morse code to Japanese
+    :param text: String for convert
+    :return: converted text
+    :raise BlankInputError: If the text is blank
+    """
+    check_blank(text, 'morse2jpn')
+    output = decode_text(text, 'jpn')
+    return output
+
+
+# Main functions of every direction, in the order of DIRECTIONS
+converters = dict(zip(DIRECTIONS, (change_english_to_morse, change_morse_to_english,
+                                   change_japanese_to_morse, change_morse_to_japanese)))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - code list data
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Rows of the code list window, without any GUI. The (character, code)
+rows of a language are built once, together with an index of every
+prefix of every character and code, so a search is one dictionary
+lookup however long the list is. Besides English and Japanese, every
+alphabet of morse_alphabets can be listed.
+"""
+
+# Import modules ===================================================
+from bisect import bisect_left
+
+from morse_codec import reverse_morse_eng, reverse_morse_eng_sym, reverse_morse_jpn, reverse_morse_jpn_sym
+
+
+BUILTIN_LANGUAGES = [('eng', 'English'), ('jpn', 'Japanese')]
+
+
+# Declare functions for rows =======================================
+def language_rows(name):
+    """
+    Rows of a language, in the order of the code list
+    :param name: 'eng', 'jpn' or the name of an alphabet of morse_alphabets
+    :return: List of (character, code)
+    :raise AlphabetError: If the alphabet is unknown or broken
+    """
+    if name == 'eng':
+        return list(reverse_morse_eng.items()) + list(reverse_morse_eng_sym.items())
+    if name == 'jpn':
+        return list(reverse_morse_jpn.items()) + list(reverse_morse_jpn_sym.items())
+    from morse_alphabets import get_alphabet
+    return [(char, code) for code, char in get_alphabet(name).decode_table.items()]
+
+
+def build_row_index(rows):
+    """
+    Index every prefix of the characters and codes of rows
+    :param rows: List of (character, code)
+    :return: Dictionary of lower-case prefix to the sorted tuple of positions of the rows
+    """
+    index = {}
+    for n, row in enumerate(rows):
+        keys = set()
+        for value in row:
+            value = value.lower()
+            keys.update(value[:end] for end in range(1, len(value) + 1))
+        for key in keys:
+            index.setdefault(key, []).append(n)
+    return {key: tuple(positions) for key, positions in index.items()}
+
+
+# Declare classes ==================================================
+class CodeList:
+    """
+    Rows and search indexes of the languages, built on first use
+    """
+
+    def __init__(self):
+        self.rows = {}  # name -> list of (character, code)
+        self.indexes = {}  # name -> prefix index of the rows
+
+    def languages(self):
+        """
+        Languages which can be listed
+        Only the titles of the alphabets are read; an alphabet is compiled
+        when its rows are first shown. Alphabets whose definition cannot
+        be read are left out.
+        :return: List of (name, title)
+        """
+        languages = list(BUILTIN_LANGUAGES)
+        try:
+            from morse_alphabets import AlphabetError, alphabet_names, alphabet_title
+        except ImportError:
+            return languages
+        builtin = {name for name, _ in languages}
+        for name in alphabet_names():
+            if name in builtin:
+                continue
+            try:
+                languages.append((name, alphabet_title(name)))
+            except AlphabetError:
+                continue
+        return languages
+
+    def get_rows(self, name):
+        """
+        Rows of a language
+        :param name: Name of the language
+        :return: List of (character, code)
+        """
+        rows = self.rows.get(name)
+        if rows is None:
+            rows = self.rows[name] = language_rows(name)
+        return rows
+
+    def search(self, name, query):
+        """
+        Rows whose character or code starts with a query (case-insensitive)
+        :param name: Name of the language
+        :param query: Text typed in the search box
+        :return: Sequence of positions in get_rows(name)
+        """
+        query = query.strip().lower()
+        if not query:
+            return range(len(self.get_rows(name)))
+        index = self.indexes.get(name)
+        if index is None:
+            index = self.indexes[name] = build_row_index(self.get_rows(name))
+        return index.get(query, ())
+
+    def search_between(self, name, query, start, stop):
+        """
+        Rows between two positions which match a query, for rows inserted in batches
+        :param name: Name of the language
+        :param query: Text typed in the search box
+        :param start: First position
+        :param stop: Position after the last one
+        :return: Sequence of positions
+        """
+        positions = self.search(name, query)
+        return positions[bisect_left(positions, start):bisect_left(positions, stop)]
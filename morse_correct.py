@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - error-tolerant decoding
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Decodes a code which is not in the table as the most likely valid code
+within a small edit distance (a dot or dash dropped, added or swapped)
+instead of '[?]'. Tokens which are not made of dots and dashes are not
+corrected.
+
+The neighbours are found with a deletion index built once per alphabet:
+every valid code is stored under each string obtained by deleting up to
+max_distance of its elements. Two codes within that distance share at
+least one such string, so a token only looks up its own deletions (a
+handful of dictionary lookups, whatever the size of the alphabet), and
+the candidates found are checked with the real edit distance. Among the
+nearest candidates, the one whose character is the most frequent in the
+language wins. The correction of each distinct token is remembered.
+"""
+
+# Import modules ===================================================
+from morse_codec import decode_tables, merge_ten
+from morse_segment import default_model
+
+
+MAX_DISTANCE = 1  # edits corrected by default
+MEMO_LIMIT = 1 << 16  # corrections remembered before the memo is cleared
+
+
+# Declare functions for distances ==================================
+def deletions(code, distance):
+    """
+    Strings obtained by deleting up to a number of elements of a code
+    :param code: Morse code
+    :param distance: Most elements deleted
+    :return: Set of strings, including the code itself
+    """
+    variants = {code}
+    level = {code}
+    for _ in range(distance):
+        level = {v[:n] + v[n + 1:] for v in level for n in range(len(v))}
+        variants |= level
+    return variants
+
+
+def edit_distance(a, b, limit=None):
+    """
+    Levenshtein distance of two short codes (a swapped element is one substitution)
+    :param a: Code
+    :param b: Code
+    :param limit: If given, any distance above it may be returned as limit + 1
+    :return: Number of edits
+    """
+    if limit is not None:
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1
+        if limit == 1:  # the usual case, without the table
+            if len(a) == len(b):
+                return min(sum(x != y for x, y in zip(a, b)), 2)
+            if len(a) < len(b):
+                a, b = b, a
+            n = 0
+            while n < len(b) and a[n] == b[n]:
+                n += 1
+            return 1 if a[n + 1:] == b[n:] else 2
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+# Declare classes ==================================================
+class CorrectionIndex:
+    """
+    Nearest valid codes of a decode table
+    """
+
+    def __init__(self, table, max_distance=MAX_DISTANCE, frequencies=None):
+        """
+        :param table: Dictionary mapping codes to characters (a decode table)
+        :param max_distance: Most edits corrected
+        :param frequencies: Dictionary of character to frequency, which breaks ties
+                            between codes at the same distance (default: all equal)
+        """
+        self.table = table
+        self.max_distance = max_distance
+        self.frequencies = frequencies or {}
+        self.longest = max(map(len, table), default=0)
+        self.index = {}  # deletion variant -> codes
+        for code in table:
+            for variant in deletions(code, max_distance):
+                self.index.setdefault(variant, []).append(code)
+        self.memo = {}
+
+    def nearest(self, token):
+        """
+        Find the most likely valid code for a token
+        :param token: Code made of dots and dashes
+        :return: Valid code, or None if none is within max_distance or the token is not
+                 made of dots and dashes (such as the '[?]' of the codec)
+        """
+        if token in self.table:
+            return token
+        if not token or token.strip('.-'):
+            return None  # not morse code: left as the plain decoder leaves it
+        if token in self.memo:
+            return self.memo[token]
+        if len(token) > self.longest + self.max_distance:
+            return None  # too far from every code
+        best = None
+        best_key = None
+        seen = set()
+        get = self.index.get
+        for variant in deletions(token, self.max_distance):
+            for code in get(variant, ()):
+                if code in seen:
+                    continue
+                seen.add(code)
+                distance = edit_distance(token, code, self.max_distance)
+                if distance > self.max_distance:
+                    continue
+                key = (distance, -self.frequencies.get(self.table[code], 0), code)
+                if best_key is None or key < best_key:
+                    best, best_key = code, key
+        if len(self.memo) >= MEMO_LIMIT:
+            self.memo.clear()
+        self.memo[token] = best
+        return best
+
+    def correct(self, token):
+        """
+        Decode one token, correcting it if needed
+        :param token: Code made of dots and dashes
+        :return: Character, or '[?]' if no valid code is near
+        """
+        code = self.nearest(token)
+        return '[?]' if code is None else self.table[code]
+
+    def decode(self, text):
+        """
+        Decode morse code, correcting the unknown codes
+        :param text: String of codes separated by whitespace
+        :return: Decoded text
+        """
+        table = self.table
+        correct = self.correct
+        return ''.join([table[t] if t in table else correct(t) for t in text.lower().split()])
+
+
+# Declare functions for decoding ===================================
+_indexes = {}
+
+
+def correction_index(select, max_distance=MAX_DISTANCE):
+    """
+    Index of a language, built on first use
+    Ties are broken by the character frequencies of the n-gram model of
+    morse_segment.
+    :param select: A parameter for language
+    :param max_distance: Most edits corrected
+    :return: CorrectionIndex
+    """
+    key = (select, max_distance)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = CorrectionIndex(decode_tables[select], max_distance,
+                                                dict(default_model(select).counts.get('', {})))
+    return index
+
+
+def decode_corrected(text, select='eng', max_distance=MAX_DISTANCE):
+    """
+    Convert morse code to text, correcting codes which are not in the table
+    :param text: String of codes separated by whitespace
+    :param select: A parameter for language
+    :param max_distance: Most edits corrected
+    :return: Converted text
+    """
+    output = correction_index(select, max_distance).decode(text)
+    return merge_ten(output) if select == 'jpn' else output
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - live keyer decoder
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Decodes a hand key or a receiver as it is being sent. KeyerDecoder takes
+key-down and key-up events one at a time and emits a character as soon
+as the gap after it is longer than an element gap, without waiting for
+the end of a line. The lengths of dits and dahs are tracked separately,
+so the speed follows the sender, and half their difference gives the
+unit even when a receiver stretches or shortens every mark by the same
+amount. ToneKeyer turns audio frames into these events with a Goertzel
+filter.
+
+Emitted characters wait in a bounded queue: a reader which falls behind
+loses the oldest characters (counted in 'dropped') instead of slowing the
+decoder down. Only the standard library is needed.
+"""
+
+# Import modules ===================================================
+import math
+from array import array
+from collections import deque, namedtuple
+
+from morse_codec import attach_ten, decode_tables
+
+
+WPM = 20  # first guess of the speed
+MAX_PENDING = 1024  # characters kept for the reader
+STATS_WINDOW = 4096  # characters in the latency statistics
+SMOOTHING = 0.2  # weight of a new mark in the dit and dah lengths
+GLITCH = 0.005  # seconds; shorter marks are ignored (a dit at 240 WPM)
+FAST = 0.5  # a mark shorter than half a dit restarts the estimate
+CHAR_GAP = 2  # units of silence which end a character
+WORD_GAP = 5  # units of silence which end a word
+
+# text: decoded character (' ' between words)
+# code: morse code it came from
+# replaces: True if it replaces the previous character (a Japanese point merged into it)
+# latency: seconds from the end of the last element to the emission
+Character = namedtuple('Character', 'text code replaces latency')
+
+
+# Declare classes ==================================================
+class KeyerDecoder:
+    """
+    Decoder of key-down and key-up events
+    Times are seconds on any clock, as long as they do not go backwards.
+    """
+
+    def __init__(self, select='eng', wpm=WPM, max_pending=MAX_PENDING):
+        """
+        :param select: A parameter for language
+        :param wpm: First guess of the speed in words per minute
+        :param max_pending: Characters kept until they are read
+        """
+        self.select = select
+        self.table = decode_tables[select]
+        self.dit = 1.2 / wpm  # tracked length of a dit mark
+        self.dah = 3 * self.dit  # tracked length of a dah mark
+        self.code = []
+        self.down = None  # time the key went down
+        self.up = None  # time the key went up after the pending code
+        self.spaced = True  # no word gap is due
+        self.last = ''  # last character emitted
+        self.output = deque(maxlen=max_pending)
+        self.latencies = deque(maxlen=STATS_WINDOW)
+        self.count = 0
+        self.dropped = 0
+
+    @property
+    def unit(self):
+        """
+        Current estimate of one unit of time
+        :return: Seconds
+        """
+        return max((self.dah - self.dit) / 2, GLITCH)
+
+    @property
+    def wpm(self):
+        """
+        Current estimate of the speed
+        :return: Words per minute
+        """
+        return 1.2 / self.unit
+
+    def gap_limit(self, units):
+        """
+        Silence which ends a character or a word
+        Marks shortened by a receiver lengthen the gaps by as much.
+        :param units: CHAR_GAP or WORD_GAP
+        :return: Seconds
+        """
+        unit = self.unit
+        return max(units * unit + unit - self.dit, unit)
+
+    def key_down(self, at):
+        """
+        Record that the key went down
+        :param at: Time of the event
+        :return: None
+        """
+        if self.down is None:
+            self.poll(at)
+            self.down = at
+
+    def key_up(self, at):
+        """
+        Record that the key went up and classify the mark
+        :param at: Time of the event
+        :return: None
+        """
+        if self.down is None:
+            return
+        length = at - self.down
+        self.down = None
+        if length < GLITCH:
+            return  # too short to be keyed; keep waiting for the gap
+        if length < FAST * self.dit:
+            self.code.append('.')
+            self.dit, self.dah = length, 3 * length  # much faster than expected: start again
+        elif length < (self.dit + self.dah) / 2:
+            self.code.append('.')
+            self.dit += (length - self.dit) * SMOOTHING
+        else:
+            self.code.append('-')
+            self.dah += (length - self.dah) * SMOOTHING
+        self.up = at
+
+    def poll(self, at):
+        """
+        Emit what the silence up to a time has completed
+        Call it regularly while the key is up, or characters are only
+        emitted at the next key-down.
+        :param at: Current time
+        :return: None
+        """
+        if self.down is not None or self.up is None:
+            return
+        gap = at - self.up
+        if self.code and gap >= self.gap_limit(CHAR_GAP):
+            code = ''.join(self.code)
+            self.code = []
+            self.emit(self.table.get(code, '[?]'), code, gap)
+            self.spaced = False
+        if not self.spaced and gap >= self.gap_limit(WORD_GAP):
+            self.emit(' ', '', gap)
+            self.spaced = True
+
+    def emit(self, text, code, latency):
+        """
+        Queue a character
+        :param text: Decoded character
+        :param code: Morse code of the character
+        :param latency: Seconds since the end of its last element
+        :return: None
+        """
+        replaces = False
+        if self.select == 'jpn' and text in ('゛', '゜') and self.last.isalpha():
+            merged = attach_ten(self.last, text)
+            if len(merged) == 1:
+                text, replaces = merged, True
+        if len(self.output) == self.output.maxlen:
+            self.dropped += 1
+        self.output.append(Character(text, code, replaces, latency))
+        self.latencies.append(latency)
+        self.count += 1
+        self.last = text
+
+    def read(self):
+        """
+        Take the queued characters
+        :return: List of Character
+        """
+        characters = list(self.output)
+        self.output.clear()
+        return characters
+
+    def stats(self):
+        """
+        Statistics of the recent characters
+        :return: Dictionary of counters, speed and latency in seconds
+        """
+        latencies = sorted(self.latencies)
+        size = len(latencies)
+        return {'characters': self.count, 'dropped': self.dropped, 'pending': len(self.output),
+                'wpm': self.wpm,
+                'latency_mean': sum(latencies) / size if size else 0.0,
+                'latency_p50': latencies[size // 2] if size else 0.0,
+                'latency_p99': latencies[min(size * 99 // 100, size - 1)] if size else 0.0,
+                'latency_max': latencies[-1] if size else 0.0}
+
+
+class ToneKeyer:
+    """
+    Key detector for audio frames feeding a KeyerDecoder
+    The level of the tone in each frame is measured with a Goertzel
+    filter and compared with a threshold between the tracked noise floor
+    and the tracked tone level. A change of state must last two frames.
+    """
+
+    def __init__(self, decoder, frequency=700, sample_rate=8000):
+        """
+        :param decoder: KeyerDecoder receiving the events
+        :param frequency: Frequency of the tone in Hz
+        :param sample_rate: Samples per second
+        """
+        self.decoder = decoder
+        self.sample_rate = sample_rate
+        self.coefficient = 2 * math.cos(2 * math.pi * frequency / sample_rate)
+        self.position = 0  # samples fed so far
+        self.floor = None
+        self.peak = 0.0
+        self.keyed = False
+        self.change = None  # time of a change of state waiting for confirmation
+
+    def level(self, samples):
+        """
+        Amplitude of the tone in a frame
+        :param samples: Sequence of samples
+        :return: Amplitude in the unit of the samples
+        """
+        coefficient = self.coefficient
+        s1 = s2 = 0.0
+        for x in samples:
+            s1, s2 = x + coefficient * s1 - s2, s1
+        power = s1 * s1 + s2 * s2 - coefficient * s1 * s2
+        return 2 * math.sqrt(max(power, 0.0)) / len(samples)
+
+    def feed(self, frame):
+        """
+        Process one frame of audio
+        :param frame: Sequence of samples, or bytes of 16-bit little-endian PCM
+        :return: None
+        """
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            frame = array('h', bytes(frame))
+        if not len(frame):
+            return
+        start = self.position / self.sample_rate
+        self.position += len(frame)
+        end = self.position / self.sample_rate
+
+        amplitude = self.level(frame)
+        if self.floor is None:
+            self.floor = amplitude
+        if amplitude < self.floor:
+            self.floor = amplitude
+        else:
+            self.floor += (amplitude - self.floor) * 0.002
+        if amplitude > self.peak:
+            self.peak = amplitude
+        else:
+            self.peak += (amplitude - self.peak) * 0.002
+
+        span = self.peak - self.floor
+        if span > self.floor * 2:  # a tone stands out of the noise
+            keyed = amplitude > self.floor + span * (0.4 if self.keyed else 0.6)
+        else:
+            keyed = False
+        if keyed == self.keyed:
+            self.change = None
+        elif self.change is None:
+            self.change = start
+        else:
+            self.keyed = keyed
+            if keyed:
+                self.decoder.key_down(self.change)
+            else:
+                self.decoder.key_up(self.change)
+            self.change = None
+        self.decoder.poll(end)
+
+
+# Declare functions for decoding ===================================
+def decode_events(events, select='eng', wpm=WPM):
+    """
+    Decode a finished list of key events
+    :param events: Iterable of (time, down) pairs, down being True for key-down
+    :param select: A parameter for language
+    :param wpm: First guess of the speed
+    :return: Decoded text
+    """
+    decoder = KeyerDecoder(select, wpm, max_pending=None)
+    at = 0.0
+    for at, down in events:
+        if down:
+            decoder.key_down(at)
+        else:
+            decoder.key_up(at)
+    decoder.poll(at + 2 * decoder.gap_limit(WORD_GAP))
+    text = []
+    for character in decoder.read():
+        if character.replaces:
+            text.pop()
+        text.append(character.text)
+    return ''.join(text).strip()
+
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - live translation
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Keeps the translation of a text which is being edited up to date without
+converting it all again. The input is kept as short blocks cut where the
+conversion of one block cannot affect its neighbours (the same rule as
+morse_parallel: between morse codes, never in front of a detached point).
+Each block keeps its own output.
+
+After an edit, only the blocks touching the changed part are converted
+again, together with the block before them when the changed part begins
+with a point code, so a point still merges with its kana. update() returns
+the change of the output as (start, end, replacement), so a text box only
+needs that range replaced. The blocks of a position are found by
+bisecting their offsets, which an edit only shifts lazily, so typing
+anywhere in the input costs the same however long it is.
+"""
+
+# Import modules ===================================================
+from bisect import bisect_right
+
+from morse_codec import convert, parse_direction
+from morse_parallel import space_pattern, ten_codes, token_pattern
+
+
+LIVE_BLOCK_SIZE = 256  # characters per block
+
+
+# Declare functions for blocks =====================================
+def common_prefix(a, b):
+    """
+    Length of the common beginning of two strings (compared slice by slice)
+    :return: Number of characters
+    """
+    size = min(len(a), len(b))
+    if a[:size] == b[:size]:
+        return size
+    low, high = 0, size  # a[:low] == b[:low] and a[:high] != b[:high]
+    while high - low > 1:
+        middle = (low + high) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def common_suffix(a, b, limit):
+    """
+    Length of the common end of two strings, at most limit
+    :return: Number of characters
+    """
+    size = min(len(a), len(b), limit)
+    if size == 0 or a[len(a) - size:] == b[len(b) - size:]:
+        return size
+    low, high = 0, size
+    while high - low > 1:
+        middle = (low + high) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def starts_with_point(text, position):
+    """
+    Check if the first code from a position is the code of a detached point
+    :param text: Morse code
+    :param position: Index to look from
+    :return: True if the code is the code of ゛ or ゜
+    """
+    code = token_pattern.search(text, position)
+    return code is not None and code.group().lower() in ten_codes
+
+
+def cut_blocks(text, encode, select, size=LIVE_BLOCK_SIZE):
+    """
+    Cut text into blocks which can be converted independently
+    :param text: Text to cut
+    :param encode: True for text to morse code
+    :param select: A parameter for language
+    :param size: Characters per block
+    :return: List of strings
+    """
+    blocks = []
+    start = 0
+    while len(text) - start > size:
+        cut = start + size
+        if not encode:  # after a run of whitespace, and not in front of a point code
+            space = space_pattern.search(text, cut - 1)
+            while space is not None and select == 'jpn' and starts_with_point(text, space.end()):
+                space = space_pattern.search(text, space.end())
+            if space is None or space.end() == len(text):
+                break
+            cut = space.end()
+        blocks.append(text[start:cut])
+        start = cut
+    blocks.append(text[start:])
+    return blocks
+
+
+# Declare classes ==================================================
+class BlockOffsets:
+    """
+    Offsets of the first characters of consecutive blocks
+    An edit moves every block after it. Instead of moving them all, the
+    shift is kept as (index, delta): the offsets from that index on are
+    all off by delta, and the shift is only carried over the blocks
+    between one edit and the next. Finding the block of a position is a
+    bisection, so editing in one place costs the same however many
+    blocks the text has.
+    """
+
+    def __init__(self):
+        self.starts = [0]  # offsets, off by delta from index on
+        self.index = 1
+        self.delta = 0
+
+    def __getitem__(self, index):
+        """
+        :param index: Block index
+        :return: Offset of the first character of the block
+        """
+        return self.starts[index] + (self.delta if index >= self.index else 0)
+
+    def find(self, offset):
+        """
+        Find the block holding an offset (the last block for an offset past the end)
+        :param offset: Offset in the text
+        :return: Block index
+        """
+        starts, index = self.starts, self.index
+        if index < len(starts) and offset >= starts[index] + self.delta:
+            return bisect_right(starts, offset - self.delta, index) - 1
+        return max(bisect_right(starts, offset, 0, index) - 1, 0)
+
+    def move(self, index):
+        """
+        Carry the shift to another block index
+        :param index: Block index from which the offsets will be off by delta
+        :return: None
+        """
+        starts, delta = self.starts, self.delta
+        if delta:
+            for n in range(self.index, index):
+                starts[n] += delta
+            for n in range(index, self.index):
+                starts[n] -= delta
+        self.index = index
+
+    def replace(self, first, last, lengths, removed):
+        """
+        Replace blocks by other blocks
+        :param first: Index of the first block replaced
+        :param last: Index of the last block replaced
+        :param lengths: Lengths of the new blocks
+        :param removed: Characters of the blocks replaced
+        :return: None
+        """
+        self.move(last + 1)
+        start = self[first]
+        offsets = []
+        for length in lengths:
+            offsets.append(start)
+            start += length
+        self.starts[first:last + 1] = offsets
+        self.index = first + len(offsets)
+        self.delta += sum(lengths) - removed
+
+
+class IncrementalTranslator:
+    """
+    Translation of a text which changes a little at a time
+    """
+
+    def __init__(self, direction, block_size=LIVE_BLOCK_SIZE):
+        """
+        :param direction: One of DIRECTIONS
+        :param block_size: Characters per block
+        """
+        self.encode, self.select = parse_direction(direction)
+        self.direction = direction
+        self.block_size = block_size
+        self.blocks = ['']  # input, cut into blocks
+        self.outputs = ['']  # output of every block
+        self.block_starts = BlockOffsets()  # offsets of the blocks in the input
+        self.output_starts = BlockOffsets()  # offsets of their outputs in the output
+        self.length = 0  # characters of the input
+        self.output_length = 0  # characters of the output
+
+    @property
+    def current(self):
+        """
+        :return: Whole input
+        """
+        return ''.join(self.blocks)
+
+    @property
+    def output(self):
+        """
+        :return: Whole output
+        """
+        return ''.join(self.outputs)
+
+    def locate(self, position):
+        """
+        Find the block holding a position of the input
+        :param position: Index in the input
+        :return: Tuple of (block index, index of the first character of the block)
+        """
+        index = self.block_starts.find(position)
+        return index, self.block_starts[index]
+
+    def output_start(self, index):
+        """
+        Index in the output of the first character of a block
+        :param index: Block index
+        :return: Number of characters of the output before the block
+        """
+        return self.output_starts[index]
+
+    def update(self, text):
+        """
+        Take the new input and convert what changed
+        The change is found by comparing the new input with the old one;
+        a caller which knows where the edit is should use edit() instead.
+        :param text: Whole new input
+        :return: Tuple of (start, end, replacement): output[start:end] becomes replacement,
+                 or None if nothing changed
+        """
+        old = self.current
+        old_length = self.length
+        prefix = common_prefix(old, text)
+        if prefix == old_length == len(text):
+            return None
+        suffix = common_suffix(old, text, min(old_length, len(text)) - prefix)
+        old_output_length = self.output_length
+        first, _, outputs = self.edit(prefix, old_length - suffix, text[prefix:len(text) - suffix])
+        start = self.output_start(first)
+        replacement = ''.join(outputs)
+        return start, start + len(replacement) - (self.output_length - old_output_length), replacement
+
+    def edit(self, start, end, replacement):
+        """
+        Replace a part of the input and convert the blocks it touches again
+        The cost depends on the size of the edit and of the blocks around
+        it, not on the length of the input.
+        :param start: Index of the first character replaced
+        :param end: Index after the last character replaced
+        :param replacement: New characters
+        :return: Tuple of (index of the first block replaced, number of blocks replaced,
+                 outputs of the blocks which replace them)
+        """
+        old_length = self.length
+
+        # > blocks touching the change, with one character of margin on each side
+        first, first_start = self.locate(max(start - 1, 0))
+        last, last_start = self.locate(min(end, max(old_length - 1, 0)))
+        end_old = last_start + len(self.blocks[last])
+        part = ''.join(self.blocks[first:last + 1])
+        part = part[:start - first_start] + replacement + part[end - first_start:]
+        if not self.encode and self.select == 'jpn':
+            while first > 0 and starts_with_point(part, 0):
+                first -= 1  # the point belongs to the character before
+                first_start = self.block_starts[first]
+                part = self.blocks[first] + part
+
+        # > convert the changed part again
+        blocks = [b for b in cut_blocks(part, self.encode, self.select, self.block_size) if b]
+        if not blocks and last - first + 1 == len(self.blocks):
+            blocks = ['']  # keep one block for an empty input
+        outputs = [convert(block, self.direction) for block in blocks]
+        removed = sum(map(len, self.outputs[first:last + 1]))
+
+        self.block_starts.replace(first, last, [len(b) for b in blocks], end_old - first_start)
+        self.output_starts.replace(first, last, [len(o) for o in outputs], removed)
+        self.blocks[first:last + 1] = blocks
+        self.outputs[first:last + 1] = outputs
+        self.length += len(replacement) - (end - start)
+        self.output_length += sum(map(len, outputs)) - removed
+        return first, last - first + 1, outputs
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - conversion metrics
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Opt-in instrumentation of the codec. enable() replaces the functions of
+morse_codec by timed wrappers, and disable() puts the originals back, so
+nothing is measured and nothing is paid while it is off. Every caller
+going through morse_codec (convert, the change_* functions, the streams,
+the cache, the worker thread) is measured, because morse_codec looks the
+functions up in its own namespace at each call.
+
+Two kinds of counters are kept:
+    stages: calls, seconds and items (characters or codes) of the steps of
+            a conversion: text_to_morse, morse_to_text and merge_ten (the
+            attachment of the points in morse2jpn)
+    directions: calls, seconds, UTF-8 bytes read and written, symbols and
+                unknown symbols ('[?]') of each of the four directions
+jpn2morse folds and encodes every character in one table lookup, so the
+folding of the kana is not a stage of its own: its time is the time of
+the direction.
+
+Only this process is measured: conversions run by a process pool
+(morse_parallel, the server) are not.
+"""
+
+# Import modules ===================================================
+import functools
+import json
+import threading
+import time
+
+import morse_codec
+from morse_codec import CHUNK_SIZE, iter_chunks
+
+
+STAGES = ('text_to_morse', 'morse_to_text', 'merge_ten')
+UNKNOWN = '[?]'
+
+
+# Declare classes ==================================================
+class Metrics:
+    """
+    Counters of the conversions, safe to update from several threads
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Set every counter back to zero
+        :return: None
+        """
+        with self.lock:
+            self.started = time.time()
+            self.stages = {}  # name -> [calls, seconds, items]
+            self.directions = {}  # direction -> [calls, seconds, bytes_in, bytes_out, symbols, unknown]
+
+    def record_stage(self, name, seconds, items):
+        """
+        Count one call of a stage
+        :param name: Name of the stage
+        :param seconds: Time of the call
+        :param items: Characters or codes taken by the call
+        :return: None
+        """
+        with self.lock:
+            counter = self.stages.get(name)
+            if counter is None:
+                counter = self.stages[name] = [0, 0.0, 0]
+            counter[0] += 1
+            counter[1] += seconds
+            counter[2] += items
+
+    def record_direction(self, direction, seconds, bytes_in, output):
+        """
+        Count one conversion (or one chunk of a stream)
+        :param direction: One of DIRECTIONS
+        :param seconds: Time of the conversion
+        :param bytes_in: UTF-8 bytes of the input
+        :param output: Converted text
+        :return: None
+        """
+        unknown = output.count(UNKNOWN)
+        if direction.endswith('morse'):
+            symbols = output.count(' ')  # one code per converted character
+        else:
+            symbols = len(output) - (len(UNKNOWN) - 1) * unknown
+        bytes_out = utf8_size(output)
+        with self.lock:
+            counter = self.directions.get(direction)
+            if counter is None:
+                counter = self.directions[direction] = [0, 0.0, 0, 0, 0, 0]
+            counter[0] += 1
+            counter[1] += seconds
+            counter[2] += bytes_in
+            counter[3] += bytes_out
+            counter[4] += symbols
+            counter[5] += unknown
+
+    def snapshot(self):
+        """
+        Copy of the counters, with the derived rates
+        :return: Dictionary which can be saved as JSON
+        """
+        with self.lock:
+            stages = {name: list(counter) for name, counter in self.stages.items()}
+            directions = {name: list(counter) for name, counter in self.directions.items()}
+            started = self.started
+        snapshot = {'enabled': is_enabled(), 'started': started, 'elapsed': time.time() - started,
+                    'stages': {}, 'directions': {}}
+        for name, (calls, seconds, items) in stages.items():
+            snapshot['stages'][name] = {'calls': calls, 'seconds': seconds, 'items': items,
+                                        'us_per_call': seconds / calls * 1e6 if calls else 0.0}
+        for name, (calls, seconds, bytes_in, bytes_out, symbols, unknown) in directions.items():
+            snapshot['directions'][name] = {
+                'calls': calls, 'seconds': seconds, 'bytes_in': bytes_in, 'bytes_out': bytes_out,
+                'symbols': symbols, 'unknown': unknown,
+                'unknown_rate': unknown / symbols if symbols else 0.0,
+                'mb_per_s': bytes_in / seconds / 1e6 if seconds else 0.0}
+        return snapshot
+
+    def report(self):
+        """
+        Counters as a text table
+        :return: String of several lines
+        """
+        snapshot = self.snapshot()
+        lines = ['%-10s %8s %10s %12s %12s %9s %9s' % ('direction', 'calls', 'seconds', 'bytes in',
+                                                       'bytes out', 'MB/s', 'unknown')]
+        for name in morse_codec.DIRECTIONS:
+            d = snapshot['directions'].get(name)
+            if d is not None:
+                lines.append('%-10s %8d %10.4f %12d %12d %9.2f %8.2f%%'
+                             % (name, d['calls'], d['seconds'], d['bytes_in'], d['bytes_out'],
+                                d['mb_per_s'], 100 * d['unknown_rate']))
+        lines.append('')
+        lines.append('%-18s %8s %10s %12s %10s' % ('stage', 'calls', 'seconds', 'items', 'us/call'))
+        for name in STAGES:
+            s = snapshot['stages'].get(name)
+            if s is not None:
+                lines.append('%-18s %8d %10.4f %12d %10.1f'
+                             % (name, s['calls'], s['seconds'], s['items'], s['us_per_call']))
+        if not snapshot['directions'] and not snapshot['stages']:
+            lines = ['No conversion recorded%s.' % ('' if snapshot['enabled'] else ' (metrics are off)')]
+        return '\n'.join(lines)
+
+
+# Declare functions for wrappers ===================================
+def utf8_size(text):
+    """
+    Size of a string in UTF-8, without encoding an ASCII string
+    :param text: String
+    :return: Number of bytes
+    """
+    return len(text) if text.isascii() else len(text.encode('utf-8', 'surrogatepass'))
+
+
+def timed_stage(name, func):
+    """
+    Wrap a stage of the codec
+    :param name: Name of the stage
+    :param func: Function whose first argument is a string or a list of codes
+    :return: Wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        metrics.record_stage(name, time.perf_counter() - start, len(args[0]) if args else 0)
+        return result
+    return wrapper
+
+
+def timed_conversion(encode, func):
+    """
+    Wrap encode_text or decode_text
+    :param encode: True for encode_text
+    :param func: Original function
+    :return: Wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(text, select):
+        start = time.perf_counter()
+        output = func(text, select)
+        direction = select + '2morse' if encode else 'morse2' + select
+        metrics.record_direction(direction, time.perf_counter() - start, utf8_size(text), output)
+        return output
+    return wrapper
+
+
+def timed_decode_stream(func):
+    """
+    Wrap decode_stream, counting each piece of output as it is produced
+    (encode_stream goes through encode_text and needs no wrapper)
+    :param func: Original function
+    :return: Wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(source, select, chunk_size=CHUNK_SIZE):
+        read = [0]
+
+        def counted():
+            for chunk in iter_chunks(source, chunk_size):
+                read[0] += utf8_size(chunk)
+                yield chunk
+
+        outputs = func(counted(), select, chunk_size)
+        direction = 'morse2' + select
+        while True:
+            start = time.perf_counter()
+            output = next(outputs, None)
+            seconds = time.perf_counter() - start
+            if output is None:
+                return
+            metrics.record_direction(direction, seconds, read[0], output)
+            read[0] = 0
+            yield output
+    return wrapper
+
+
+# Declare functions for metrics ====================================
+metrics = Metrics()
+_originals = {}  # name -> function of morse_codec replaced by enable()
+_switch = threading.Lock()
+
+
+def enable():
+    """
+    Start measuring the conversions (the counters are kept)
+    :return: None
+    """
+    with _switch:
+        if _originals:
+            return
+        wrappers = {name: timed_stage(name, getattr(morse_codec, name)) for name in STAGES}
+        wrappers['encode_text'] = timed_conversion(True, morse_codec.encode_text)
+        wrappers['decode_text'] = timed_conversion(False, morse_codec.decode_text)
+        wrappers['decode_stream'] = timed_decode_stream(morse_codec.decode_stream)
+        for name, wrapper in wrappers.items():
+            _originals[name] = getattr(morse_codec, name)
+            setattr(morse_codec, name, wrapper)
+
+
+def disable():
+    """
+    Stop measuring and put the original functions back (the counters are kept)
+    :return: None
+    """
+    with _switch:
+        for name, func in _originals.items():
+            setattr(morse_codec, name, func)
+        _originals.clear()
+
+
+def is_enabled():
+    """
+    :return: True while the conversions are measured
+    """
+    return bool(_originals)
+
+
+def snapshot():
+    """
+    Copy of the counters
+    :return: Dictionary, see Metrics.snapshot
+    """
+    return metrics.snapshot()
+
+
+def reset():
+    """
+    Set every counter back to zero
+    :return: None
+    """
+    metrics.reset()
+
+
+def report():
+    """
+    Counters as a text table
+    :return: String
+    """
+    return metrics.report()
+
+
+def dump(path):
+    """
+    Save a snapshot of the counters as JSON
+    :param path: Path of the file
+    :return: None
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(metrics.snapshot(), f, indent=2)
+        f.write('\n')
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - memory-mapped bulk decoder
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Decodes files of ASCII morse code ('.', '-' and whitespace bytes) without
+turning them into Python strings. The input is memory-mapped and read
+window by window through NumPy views of the mapping, so the file is
+never copied and a file larger than the memory is paged in and out by
+the system. Every code becomes the number of its node in the binary
+tree of morse_tree (the code packed as bits behind a leading 1), so the
+table is indexed by bytes of code instead of hashed. The output bytes of
+each window are gathered from a table of padded labels straight into a
+preallocated buffer, which is written out when it is full.
+
+A window ends on whitespace, and in Japanese never in front of a point
+code, so a code or a voiced kana is never cut in two. The output is
+exactly what morse_codec.decode_stream gives, encoded in UTF-8. Bytes
+other than ASCII are unknown symbols.
+
+This module needs NumPy; the rest of the translator does not.
+"""
+
+# Import modules ===================================================
+import mmap
+import os
+
+import numpy as np
+
+from morse_codec import decode_tables, kana_to_dakuten, kana_to_handakuten, longest_code
+from morse_tree import ROOT, SINK, TREE_SIZE, code_to_node
+
+
+WINDOW_SIZE = 1 << 18  # bytes of input decoded at once
+OUTPUT_SIZE = 1 << 20  # bytes of the output buffer
+
+UNKNOWN = '[?]'
+DOT, DASH, SPACE, OTHER = 0, 1, 2, 3  # kinds of input bytes
+
+byte_kinds = np.full(256, OTHER, dtype=np.uint8)
+byte_kinds[ord('.')] = DOT
+byte_kinds[ord('-')] = DASH
+for _c in range(128):
+    if chr(_c).isspace():  # same whitespace as str.split on ASCII
+        byte_kinds[_c] = SPACE
+
+
+# Declare tables ===================================================
+class ByteTable:
+    """
+    Labels of one language indexed by node number
+    words: UTF-8 bytes of every label, padded with zeros to whole 64-bit words
+    masks: The bytes of the words which belong to the label, as booleans
+    lengths: Length in bytes of every label
+    Nodes from TREE_SIZE on hold the Japanese kana with their point attached.
+    """
+
+    def __init__(self, select):
+        labels = [UNKNOWN] * TREE_SIZE
+        for code, char in decode_tables[select].items():
+            labels[code_to_node(code)] = char
+        labels[ROOT] = ''
+
+        self.points = {}  # node of a point code -> array mapping a node to the node with the point attached
+        self.voiceable = np.zeros(TREE_SIZE, dtype=bool)  # nodes which may take a point
+        if select == 'jpn':
+            for ten, table in (('゛', kana_to_dakuten), ('゜', kana_to_handakuten)):
+                codes = [code for code, char in decode_tables[select].items() if char == ten]
+                attached = np.full(TREE_SIZE, -1, dtype=np.int64)
+                for node in range(TREE_SIZE):
+                    if labels[node] in table:
+                        attached[node] = len(labels)
+                        labels.append(table[labels[node]])
+                for code in codes:
+                    self.points[code_to_node(code)] = attached
+                self.voiceable |= attached >= 0
+
+        encoded = [label.encode('utf-8') for label in labels]
+        width = -(-max(len(e) for e in encoded) // 8) * 8
+        data = np.zeros((len(encoded), width), dtype=np.uint8)
+        for n, e in enumerate(encoded):
+            data[n, :len(e)] = np.frombuffer(e, dtype=np.uint8)
+        self.words = data.view(np.uint64)  # one row of words per node, gathered at once
+        self.masks = (np.arange(width) < np.array([[len(e)] for e in encoded])).view(np.uint64)
+        self.lengths = np.array([len(e) for e in encoded], dtype=np.int64)
+
+
+byte_tables = {}
+
+
+def get_byte_table(select):
+    """
+    Build the byte table of a language on first use
+    :param select: A parameter for language
+    :return: ByteTable
+    """
+    if select not in byte_tables:
+        byte_tables[select] = ByteTable(select)
+    return byte_tables[select]
+
+
+# Declare functions for decoding ===================================
+def code_bits(flags, starts, lengths):
+    """
+    Flags of the elements of codes, packed as the bits of a number per code
+    :param flags: Boolean array, one flag per byte
+    :param starts: Array of the index where each code starts
+    :param lengths: Array of code lengths, at most longest_code
+    :return: Array of numbers, the flag of the last element in the lowest bit
+    """
+    packed = np.packbits(flags)
+    packed = np.append(packed, np.zeros(2, dtype=np.uint8)).astype(np.uint32)
+    at = starts >> 3
+    words = packed[at] << 16 | packed[at + 1] << 8 | packed[at + 2]
+    return (words >> (24 - (starts & 7) - lengths)) & ((1 << lengths) - 1)
+
+
+def token_nodes(kinds):
+    """
+    Node number of every code in a window
+    :param kinds: Array of byte kinds, beginning and ending on whitespace or the window edges
+    :return: Tuple of (array of node numbers, array of the index where each code starts)
+    """
+    symbol = np.empty(len(kinds) + 2, dtype=bool)
+    symbol[0] = symbol[-1] = False
+    np.not_equal(kinds, SPACE, out=symbol[1:-1])
+    edges = np.flatnonzero(symbol[1:] != symbol[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    lengths = np.minimum(ends - starts, longest_code + 1)
+
+    # > a code is its dashes as bits behind a leading 1, like morse_tree
+    clipped = np.minimum(lengths, longest_code)
+    nodes = code_bits(kinds == DASH, starts, clipped) | (1 << clipped)
+    bad = lengths > longest_code
+    other = kinds == OTHER
+    if other.any():
+        bad |= code_bits(other, starts, clipped) > 0
+    nodes[bad] = SINK
+    return nodes, starts
+
+
+def attach_points(nodes, table):
+    """
+    Replace a kana and the point code after it by the voiced kana
+    Pairs are taken from left to right, as merge_ten does.
+    :param nodes: Array of node numbers
+    :param table: ByteTable
+    :return: Array of node numbers
+    """
+    if not table.points or len(nodes) < 2:
+        return nodes
+    keep = np.ones(len(nodes), dtype=bool)
+    nodes = nodes.copy()
+    for point, attached in table.points.items():
+        after = np.flatnonzero(nodes[1:] == point) + 1
+        targets = attached[np.minimum(nodes[after - 1], TREE_SIZE - 1)]
+        targets[nodes[after - 1] >= TREE_SIZE] = -1  # already voiced
+        merge = targets >= 0
+        nodes[after[merge] - 1] = targets[merge]
+        keep[after[merge]] = False
+    return nodes[keep]
+
+
+def window_end(nodes, table, last):
+    """
+    Number of codes of a window to decode now
+    The rest is decoded again with the next window, so that in Japanese a
+    point code is never separated from the kana before it.
+    :param nodes: Node numbers of the codes of the window
+    :param table: ByteTable
+    :param last: True for the last window of the input
+    :return: Number of codes, 0 if the window must be made longer
+    """
+    count = len(nodes)
+    if last or not table.points:
+        return count
+    while count and int(nodes[count - 1]) in table.points:
+        count -= 1
+    if count == 0 or not table.voiceable[nodes[count - 1]]:
+        return len(nodes)
+    return count - 1
+
+
+def next_space(source, position, step):
+    """
+    Find the next whitespace, reading a window at a time
+    :param source: Array of input bytes
+    :param position: Index to search from
+    :param step: Bytes read at once
+    :return: Index of the whitespace, or the length of the input
+    """
+    while position < len(source):
+        spaces = np.flatnonzero(byte_kinds[source[position:position + step]] == SPACE)
+        if len(spaces):
+            return position + int(spaces[0])
+        position += step
+    return len(source)
+
+
+def decode_array(data, select, output, window_size=WINDOW_SIZE):
+    """
+    Decode a buffer of ASCII morse code window by window
+    :param data: Object with the buffer protocol (bytes, mmap, memoryview)
+    :param select: A parameter for language
+    :param output: Function receiving each piece of UTF-8 output (a memoryview of the buffer)
+    :param window_size: Bytes of input decoded at once
+    :return: Bytes of output
+    """
+    table = get_byte_table(select)
+    source = np.frombuffer(data, dtype=np.uint8) if len(data) else np.zeros(0, dtype=np.uint8)
+    buffer = np.empty(OUTPUT_SIZE, dtype=np.uint8)
+    filled = 0
+    written = 0
+    start = 0
+    reach = window_size
+    while start < len(source):
+        end = min(start + reach, len(source))
+        kinds = byte_kinds[source[start:end]]
+        last = end == len(source)
+        covered = end - start  # bytes of input the codes of kinds come from
+        if not last:
+            spaces = np.flatnonzero(kinds == SPACE)
+            if len(spaces):
+                covered = int(spaces[-1]) + 1
+                kinds = kinds[:covered]
+            else:  # the window is inside one code: take it to its end
+                covered = next_space(source, end, window_size) - start
+                last = start + covered == len(source)
+                if covered > longest_code:
+                    kinds = np.full(1, OTHER, dtype=np.uint8)  # unknown anyway
+                else:
+                    kinds = byte_kinds[source[start:start + covered]]
+
+        nodes, starts = token_nodes(kinds)
+        count = window_end(nodes, table, last)
+        if count == 0 and len(nodes):  # one kana which may still take a point
+            reach *= 2
+            continue
+        reach = window_size
+        step = covered
+        if count < len(nodes):
+            step = int(starts[count])
+            nodes = nodes[:count]
+        nodes = attach_points(nodes, table)
+
+        # > gather the labels into the buffer
+        lengths = table.lengths[nodes]
+        size = int(lengths.sum())
+        if filled + size > len(buffer):
+            if filled:
+                output(memoryview(buffer[:filled]))
+                written += filled
+                filled = 0
+            if size > len(buffer):
+                buffer = np.empty(size, dtype=np.uint8)
+        rows = table.words[nodes].view(np.uint8).ravel()
+        mask = table.masks[nodes].view(bool).ravel()
+        np.compress(mask, rows, out=buffer[filled:filled + size])
+        filled += size
+        start += step
+
+    if filled:
+        output(memoryview(buffer[:filled]))
+        written += filled
+    return written
+
+
+def decode_bytes(data, select='eng', window_size=WINDOW_SIZE):
+    """
+    Decode a buffer of ASCII morse code
+    :param data: Object with the buffer protocol (bytes, mmap, memoryview)
+    :param select: A parameter for language
+    :param window_size: Bytes of input decoded at once
+    :return: UTF-8 bytes
+    """
+    pieces = []
+    decode_array(data, select, lambda piece: pieces.append(bytes(piece)), window_size)
+    return b''.join(pieces)
+
+
+def decode_file(source, target, select='eng', window_size=WINDOW_SIZE):
+    """
+    Decode a file of ASCII morse code into a UTF-8 file through a memory map
+    :param source: Path of the input
+    :param target: Path of the output
+    :param select: A parameter for language
+    :param window_size: Bytes of input decoded at once
+    :return: Tuple of (bytes read, bytes written)
+    """
+    with open(source, 'rb') as f, open(target, 'wb') as out:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            written = decode_array(mapped, select, out.write, window_size)
+    return size, written
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - vectorized batch encoder
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Encodes whole columns of text at once with NumPy. Every code point is
+mapped to a token number through one index array, and the outputs are
+gathered from a table of token bytes, so there is no Python loop per
+character. Each row gives exactly what morse_codec.encode_text gives,
+including the '[?] ' of unknown characters.
+
+This module needs NumPy; the rest of the translator does not.
+"""
+
+# Import modules ===================================================
+import numpy as np
+
+from morse_codec import encode_text, encode_tables, japanese_encode_table
+
+
+MAX_CODE_POINT = 0x110000
+LAST_SPACE = 0x3000  # no code point above U+3000 is whitespace
+
+BLANK_ID = 0  # token of whitespace (no output)
+UNKNOWN_ID = 1  # token of unknown characters ('[?] ')
+
+
+# Declare tables ===================================================
+class TokenTable:
+    """
+    Precomputed tables of one language
+    index: Token number of every code point
+    words: Bytes of every token, padded with zeros to whole 64-bit words
+    lengths: Length of every token
+    """
+
+    def __init__(self, select):
+        table = japanese_encode_table if select == 'jpn' else encode_tables['eng']
+        candidates = sorted(c for c in list(table) if len(c) == 1)
+
+        tokens = ['', '[?] ']
+        numbers = {'': BLANK_ID, '[?] ': UNKNOWN_ID}
+        self.index = np.full(MAX_CODE_POINT, UNKNOWN_ID, dtype=np.uint16)
+        for c in candidates:
+            token = encode_text(c, select)  # lowercasing and folding, as in the codec
+            if token not in numbers:
+                numbers[token] = len(tokens)
+                tokens.append(token)
+            self.index[ord(c)] = numbers[token]
+        for c in range(LAST_SPACE + 1):
+            if chr(c).isspace():
+                self.index[c] = BLANK_ID
+
+        width = -(-max(len(t) for t in tokens) // 8) * 8
+        data = np.zeros((len(tokens), width), dtype=np.uint8)
+        for n, token in enumerate(tokens):
+            data[n, :len(token)] = np.frombuffer(token.encode('ascii'), dtype=np.uint8)
+        self.words = data.view(np.uint64)
+        self.lengths = np.array([len(t) for t in tokens], dtype=np.int64)
+
+
+token_tables = {}
+
+
+def get_token_table(select):
+    """
+    Build the token table of a language on first use
+    :param select: A parameter for language
+    :return: TokenTable
+    """
+    select = 'eng' if select == 'eng' else 'jpn'
+    if select not in token_tables:
+        token_tables[select] = TokenTable(select)
+    return token_tables[select]
+
+
+# Declare functions for encoding ===================================
+def encode_batch(texts, select='eng'):
+    """
+    Convert many texts to morse code at once
+    :param texts: List (or array) of strings
+    :param select: A parameter for language
+    :return: List of converted codes, one per text
+    """
+    table = get_token_table(select)
+    rows = [str(t).lower() for t in texts]
+    if not rows:
+        return []
+
+    joined = ''.join(rows)
+    code_points = np.frombuffer(joined.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    ids = table.index[code_points]
+    lengths = table.lengths[ids]
+
+    # gather the words of every token and drop the zero padding (tokens have no zero bytes)
+    data = table.words[ids].view(np.uint8).reshape(-1)
+    output = data[data != 0].tobytes().decode('ascii')
+
+    # cut the output back into rows
+    row_sizes = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    char_bounds = np.concatenate(([0], np.cumsum(row_sizes)))
+    byte_bounds = np.concatenate(([0], np.cumsum(lengths)))[char_bounds].tolist()
+    return [output[byte_bounds[i]:byte_bounds[i + 1]] for i in range(len(rows))]
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - parallel conversion
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Converts large texts on several processes. The input is cut into chunks
+at places where the conversion of one chunk cannot affect the next:
+between morse codes (and never in front of a detached point), or, for
+text, never between a kana and its trailing point. The chunks run on a
+process pool and the results are put back together in order.
+"""
+
+# Import modules ===================================================
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from morse_codec import convert, iter_chunks, longest_code, parse_direction, reverse_morse_jpn_sym
+
+
+PARALLEL_CHUNK_SIZE = 1 << 20  # characters per job
+TAIL_WINDOW = 4096  # characters searched from the end for a boundary first
+
+ten_marks = '゛゜ﾞﾟ\u3099\u309a'
+ten_codes = {reverse_morse_jpn_sym['゛'], reverse_morse_jpn_sym['゜']}
+ten_code_prefixes = {code[:n] for code in ten_codes for n in range(1, len(code) + 1)}
+
+space_pattern = re.compile(r'\s+')
+token_pattern = re.compile(r'\S+')
+
+
+# Declare functions for splitting ==================================
+def last_boundary(text, start, select):
+    """
+    Find the last place after start where morse code can be cut
+    :param text: Morse code
+    :param start: Index to start searching from
+    :param select: A parameter for language
+    :return: Index of the boundary, or None if there is none
+    """
+    found = None
+    previous = None  # code before the whitespace, once known
+    for match in space_pattern.finditer(text, start):
+        boundary = match.end()
+        if select == 'jpn':
+            token = token_pattern.match(text, boundary)
+            if token is None:
+                continue  # the next code is still unknown
+            code = token.group().lower()
+            after_point = previous in ten_codes  # a point never attaches to a point
+            previous = code
+            if not after_point and code in (ten_code_prefixes if token.end() == len(text) else ten_codes):
+                continue  # the code may be a point for the character before
+        found = boundary
+    return found
+
+
+def split_safe(text, direction):
+    """
+    Split text into a part which can be converted alone and the rest
+    :param text: Text to split
+    :param direction: One of DIRECTIONS
+    :return: Tuple of (head, tail)
+    """
+    encode, select = parse_direction(direction)
+    if encode:
+        cut = max(len(text.rstrip(ten_marks)) - 1, 0)  # the next chunk may start with a point
+        return text[:cut], text[cut:]
+
+    boundary = last_boundary(text, max(0, len(text) - TAIL_WINDOW), select)
+    if boundary is None:
+        boundary = last_boundary(text, 0, select)
+    if boundary is None:
+        return '', text
+    return text[:boundary], text[boundary:]
+
+
+def bound_carry(text, direction):
+    """
+    Shorten a part which has no place to cut, so the carry of safe_chunks stays bounded
+    Text is encoded character by character, so it can be cut anywhere.
+    Morse code without a boundary is a run of whitespace waiting for its
+    next code, or begins with one token longer than any code, which
+    decodes to '[?]' however long it grows. Runs of whitespace become one
+    space and the token is cut down to longest_code + 1 characters: the
+    codes, and so the output, stay the same.
+    :param text: Text which split_safe could not split
+    :param direction: One of DIRECTIONS
+    :return: Tuple of (head, tail)
+    """
+    encode, _ = parse_direction(direction)
+    if encode:
+        return text[:-1], text[-1:]
+    token = token_pattern.search(text)
+    if token is not None and token.end() - token.start() > longest_code + 1:
+        text = text[:token.start() + longest_code + 1] + text[token.end():]
+    return '', space_pattern.sub(' ', text)
+
+
+def safe_chunks(source, direction, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Cut a source into chunks which can be converted independently
+    :param source: File-like object, string or iterable of strings
+    :param direction: One of DIRECTIONS
+    :param chunk_size: Approximate number of characters per chunk
+    :return: Iterator of strings (a token longer than any code may come out shortened)
+    """
+    if isinstance(source, str):
+        text = source
+        source = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    buffer = []
+    size = 0
+    for chunk in iter_chunks(source, chunk_size):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            head, tail = split_safe(''.join(buffer), direction)
+            if not head and len(tail) >= chunk_size:
+                head, tail = bound_carry(tail, direction)
+            if head:
+                yield head
+            buffer = [tail]
+            size = len(tail)
+    rest = ''.join(buffer)
+    if rest:
+        yield rest
+
+
+# Declare functions for converting =================================
+def convert_chunks(chunks, direction, workers=None):
+    """
+    Convert independent chunks on a process pool, yielding the results in order
+    At most two chunks per worker are in flight, so memory stays bounded.
+    :param chunks: Iterable of strings cut by safe_chunks
+    :param direction: One of DIRECTIONS
+    :param workers: Number of processes (default: number of CPUs)
+    :return: Iterator of converted text
+    """
+    parse_direction(direction)  # fail before starting the pool
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(convert, chunk, direction))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def parallel_convert_stream(source, direction, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Convert a source on a process pool, yielding the results in order
+    :param source: File-like object, string or iterable of strings
+    :param direction: One of DIRECTIONS
+    :param workers: Number of processes (default: number of CPUs)
+    :param chunk_size: Approximate number of characters per chunk
+    :return: Iterator of converted text
+    """
+    return convert_chunks(safe_chunks(source, direction, chunk_size), direction, workers)
+
+
+def translate_parallel(text, direction, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Convert a whole text on a process pool
+    A text which fits in one chunk is converted in this process.
+    :param text: String to convert
+    :param direction: One of DIRECTIONS
+    :param workers: Number of processes (default: number of CPUs)
+    :param chunk_size: Approximate number of characters per chunk
+    :return: Converted text
+    """
+    chunks = list(safe_chunks(text, direction, chunk_size))
+    if len(chunks) <= 1 or workers == 1:
+        return ''.join(map(convert, chunks, repeat(direction)))
+    return ''.join(convert_chunks(chunks, direction, workers))
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - translation worker pool
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+A long-lived pool of processes for services which convert many texts.
+Each worker imports only the codec and the alphabets (never the GUI
+script), loads the tables once when it starts and then waits for jobs,
+so a job pays no import or table cost.
+
+Jobs (a direction and a text) are submitted to a bounded local queue and
+each gets a Future. A dispatcher thread groups the jobs waiting in the
+queue into batches of up to BATCH_JOBS jobs or BATCH_CHARS characters,
+so small jobs share one round trip to a worker, and a job waiting alone
+is sent at once. At most IN_FLIGHT batches per worker are sent ahead;
+when the workers fall behind, the local queue fills and submit() blocks
+(or raises queue.Full without blocking), which pushes back on the
+producer instead of buffering without limit.
+
+stats() reports the queue depth and, per worker, the jobs and batches
+done and the share of the time spent converting.
+"""
+
+# Import modules ===================================================
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from morse_codec import DIRECTIONS, convert
+
+
+BATCH_JOBS = 256  # most jobs sent to a worker at once
+BATCH_CHARS = 1 << 16  # characters after which a batch is sent
+QUEUE_SIZE = 4096  # jobs waiting in the pool before submit() blocks
+IN_FLIGHT = 2  # batches per worker sent ahead of the results
+CHECK_INTERVAL = 0.5  # seconds between two checks that the workers are alive
+
+
+# Declare functions for workers ====================================
+def load_tables(alphabets):
+    """
+    Load the tables a worker needs before its first job
+    :param alphabets: Names of the alphabets of morse_alphabets to load
+    :return: None
+    """
+    convert('a', 'eng2morse')  # the codec tables are built on import; warm the lookups
+    if alphabets:
+        from morse_alphabets import get_alphabet
+        for name in alphabets:
+            get_alphabet(name)
+
+
+def convert_any(text, direction):
+    """
+    Convert text in one of DIRECTIONS or in a direction of morse_alphabets
+    :param text: String to convert
+    :param direction: Direction such as 'eng2morse' or 'kor2morse'
+    :return: Converted text
+    """
+    if direction in DIRECTIONS:
+        return convert(text, direction)
+    from morse_alphabets import convert_alphabet
+    return convert_alphabet(text, direction)
+
+
+def worker_main(index, tasks, results, alphabets):
+    """
+    Main loop of a worker process
+    :param index: Number of the worker
+    :param tasks: Queue of batches, lists of (job id, direction, text); None to stop
+    :param results: Queue of (worker index, list of (job id, ok, result), busy seconds)
+    :param alphabets: Names of the alphabets to load at start
+    :return: None
+    """
+    load_tables(alphabets)
+    results.put((index, [], 0.0))  # ready
+    while True:
+        batch = tasks.get()
+        if batch is None:
+            break
+        start = time.perf_counter()
+        done = []
+        for job, direction, text in batch:
+            try:
+                done.append((job, True, convert_any(text, direction)))
+            except Exception as error:  # sent back to the Future of the job
+                done.append((job, False, error))
+        results.put((index, done, time.perf_counter() - start))
+
+
+# Declare classes ==================================================
+class WorkerStats:
+    """
+    Counters of one worker
+    """
+
+    def __init__(self):
+        self.jobs = 0
+        self.batches = 0
+        self.busy = 0.0  # seconds spent converting
+        self.ready = False
+
+
+class TranslationPool:
+    """
+    Pool of warm worker processes converting submitted jobs
+    """
+
+    def __init__(self, workers=None, alphabets=None, queue_size=QUEUE_SIZE,
+                 batch_jobs=BATCH_JOBS, batch_chars=BATCH_CHARS):
+        """
+        :param workers: Number of processes (default: number of CPUs)
+        :param alphabets: Names of the alphabets loaded by every worker at start
+                          (default: none, they are then loaded by the first job using them)
+        :param queue_size: Jobs waiting in the pool before submit() blocks
+        :param batch_jobs: Most jobs sent to a worker at once
+        :param batch_chars: Characters after which a batch is sent
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_jobs = batch_jobs
+        self.batch_chars = batch_chars
+        self.jobs = queue.Queue(queue_size)  # (job id, direction, text, Future)
+        self.futures = {}  # job id -> Future, for the jobs sent to the workers
+        self.lock = threading.Lock()
+        self.ids = itertools.count()
+        self.closed = False
+        self.broken = None
+        self.started = time.monotonic()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.in_flight = 0  # batches sent and not answered
+        self.worker_stats = [WorkerStats() for _ in range(self.workers)]
+
+        # forked workers would inherit the threads and sockets of the parent
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self.tasks = context.Queue(IN_FLIGHT * self.workers)
+        self.results = context.Queue()
+        self.processes = [context.Process(target=worker_main, daemon=True,
+                                          args=(n, self.tasks, self.results, tuple(alphabets or ())))
+                          for n in range(self.workers)]
+        for process in self.processes:
+            process.start()
+        self.dispatcher = threading.Thread(target=self.dispatch, daemon=True)
+        self.collector = threading.Thread(target=self.collect, daemon=True)
+        self.dispatcher.start()
+        self.collector.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def submit(self, direction, text, block=True, timeout=None):
+        """
+        Queue one job
+        :param direction: Direction such as 'eng2morse' or 'kor2morse'
+        :param text: String to convert
+        :param block: Wait while the queue is full (otherwise raise queue.Full)
+        :param timeout: Seconds to wait at most, or None
+        :return: Future of the converted text
+        :raise ValueError: If the direction is unknown
+        :raise RuntimeError: If the pool is closed
+        :raise queue.Full: If the queue is still full
+        """
+        if self.closed:
+            raise RuntimeError('The pool is closed.')
+        if self.broken is not None:
+            raise self.broken
+        if direction not in DIRECTIONS:
+            from morse_alphabets import parse_alphabet_direction
+            parse_alphabet_direction(direction)  # fail now rather than in a worker
+        future = Future()
+        self.jobs.put((next(self.ids), direction, text, future), block, timeout)
+        with self.lock:
+            self.submitted += 1
+        return future
+
+    def map(self, direction, texts):
+        """
+        Convert several texts, yielding the results in order
+        Texts are submitted as the results are taken, so a long iterable
+        only keeps the pool busy, not the memory.
+        :param direction: Direction of every text
+        :param texts: Iterable of strings
+        :return: Iterator of converted texts
+        """
+        pending = deque()
+        for text in texts:
+            pending.append(self.submit(direction, text))
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def dispatch(self):
+        """
+        Send the queued jobs to the workers in batches (dispatcher thread)
+        :return: None
+        """
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                break
+            batch = []
+            size = 0
+            stop = False
+            while True:
+                job, direction, text, future = item
+                if future.set_running_or_notify_cancel():
+                    with self.lock:
+                        self.futures[job] = future
+                    batch.append((job, direction, text))
+                    size += len(text)
+                if len(batch) >= self.batch_jobs or size >= self.batch_chars:
+                    break
+                try:
+                    item = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+            if batch:
+                with self.lock:
+                    self.batches += 1
+                    self.in_flight += 1
+                if not self.send(batch):
+                    self.fail(self.broken)  # the jobs taken since the workers broke
+                    return
+            if stop:
+                break
+        for _ in self.processes:
+            if not self.send(None):
+                return
+
+    def send(self, batch):
+        """
+        Put a batch on the queue of the workers, waiting while IN_FLIGHT batches per worker wait
+        :param batch: List of (job id, direction, text), or None to stop a worker
+        :return: False if the pool broke while waiting
+        """
+        while self.broken is None:
+            try:
+                self.tasks.put(batch, timeout=CHECK_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def collect(self):
+        """
+        Resolve the Futures with the results of the workers (collector thread)
+        :return: None
+        """
+        while True:
+            try:
+                item = self.results.get(timeout=CHECK_INTERVAL)
+            except queue.Empty:
+                if not self.dispatcher.is_alive() and not self.in_flight:
+                    break  # closed, and every batch answered
+                if any(process.exitcode not in (None, 0) for process in self.processes):
+                    self.fail(BrokenProcessPool('A worker process stopped unexpectedly.'))
+                    break
+                continue
+            index, done, busy = item
+            stats = self.worker_stats[index]
+            with self.lock:
+                if not done and not busy:
+                    stats.ready = True
+                    continue
+                stats.jobs += len(done)
+                stats.batches += 1
+                stats.busy += busy
+                self.in_flight -= 1
+                futures = [self.futures.pop(job) for job, _, _ in done]
+            for future, (_, ok, value) in zip(futures, done):
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            with self.lock:
+                for _, ok, _ in done:
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+    def fail(self, error):
+        """
+        Fail every job which is still waiting, after a worker died
+        :param error: Exception set on the Futures
+        :return: None
+        """
+        self.broken = error
+        with self.lock:
+            futures = list(self.futures.values())
+            self.futures.clear()
+        while True:
+            try:
+                item = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and item[3].set_running_or_notify_cancel():
+                futures.append(item[3])
+        for future in futures:
+            future.set_exception(error)
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        self.tasks.cancel_join_thread()  # nobody will read the batches left in the pipe
+
+    def stats(self):
+        """
+        Counters of the pool
+        :return: Dictionary of the queue depth, the job counters and a list of per-worker counters
+        """
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        with self.lock:
+            workers = [{'jobs': s.jobs, 'batches': s.batches, 'busy': s.busy, 'utilization': s.busy / elapsed,
+                        'ready': s.ready, 'alive': process.is_alive()}
+                       for s, process in zip(self.worker_stats, self.processes)]
+            return {'queued': self.jobs.qsize(), 'in_flight': self.in_flight, 'running': len(self.futures),
+                    'submitted': self.submitted, 'completed': self.completed, 'failed': self.failed,
+                    'batches': self.batches, 'jobs_per_batch': self.batch_size(),
+                    'uptime': elapsed, 'workers': workers}
+
+    def batch_size(self):
+        """
+        Mean number of jobs of the batches answered so far
+        :return: Jobs per batch
+        """
+        batches = sum(s.batches for s in self.worker_stats)
+        return sum(s.jobs for s in self.worker_stats) / batches if batches else 0.0
+
+    def close(self, wait=True):
+        """
+        Finish the queued jobs and stop the workers
+        :param wait: Wait until the workers have stopped
+        :return: None
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.jobs.put(None, self.broken is None)
+        except queue.Full:
+            pass  # broken: the dispatcher has stopped
+        if wait:
+            self.dispatcher.join()
+            self.collector.join()
+            for process in self.processes:
+                process.join()
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - segmentation of unspaced morse code
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Decodes a stream of dots and dashes whose spaces are missing, doubled or
+misplaced, as radio captures often are. A token between two spaces which
+is a valid code is taken as it is, so correctly spaced code decodes as
+decode_text decodes it. The runs of tokens which are not codes (a stream
+without any space is one such token) are cut into codes every possible
+way with a Viterbi search, scoring each reading with a character n-gram model of
+the language and the spaces actually seen (a space inside a code is an
+extra space, a boundary without one is a missing space). A '/' is taken
+as a sure word gap.
+
+Hypotheses ending at the same position with the same n-gram context are
+merged (the memo of the dynamic programme), and only the best 'beam' of
+them, within 'margin' of the best score, are extended, so the work per dot or dash is bounded by
+beam x longest code and a long transmission is decoded in linear time.
+"""
+
+# Import modules ===================================================
+import heapq
+import math
+import random
+from collections import defaultdict
+
+from morse_codec import decode_tables, longest_code, merge_ten, normalize_japanese
+
+
+ORDER = 4  # characters of the n-gram model (the context is ORDER - 1 of them)
+FLOOR = 0.02  # share of a uniform distribution mixed into the model
+BEAM = 16  # hypotheses extended at every position
+MARGIN = 5.0  # hypotheses scoring this much below the best one are dropped
+MISSING = 0.1  # probability that the space between two codes is missing
+EXTRA = 0.01  # probability of a space inside a code
+SAMPLE_WORDS = 20000  # words of the training stream drawn from the word lists
+WORD_GAP = '/'
+
+# alternative characters for dots and dashes
+SYMBOL_TABLE = str.maketrans({'·': '.', '•': '.', '_': '-', '−': '-', '–': '-', '—': '-'})
+
+ENGLISH_SAMPLE = (
+    'the weather here is fine and the band is open to europe this evening. thank you for the call, '
+    'your signal is strong and clear with a little fading. my name is john and my station is a small '
+    'transceiver with a dipole on the roof. we will meet again on the same frequency next week. '
+    'please send your card by mail, i will send mine as well. the antenna was built by my father many '
+    'years ago and it still works very well for most of the bands. when the sun goes down the noise '
+    'gets lower and it is much easier to hear the weak stations from far away. there is a storm '
+    'coming from the west, so i have to close the station now and pull the cable out of the radio. '
+    'it was a pleasure to talk with you, good luck in the contest and have a nice day. '
+    'cq cq de w1aw k. rst 599 qth boston name bob. tnx fer call. hr wx cloudy temp 12c. '
+    'rig ic7300 pwr 100w ant yagi. 73 es gl. qsl via bureau. qrz? pse qrs. '
+    'all of them went to the market in the morning and came back with bread, fish and fruit. '
+    'what time is it? it is about half past four. which way should we go from here? '
+    'she said that the letter would arrive before the end of the month. '
+    'numbers like 1, 2, 3, 10, 25 and 2022 appear in reports, dates and call signs.')
+
+ENGLISH_WORDS = '''
+the of and to a in is it you that he was for on are with as i his they be at one have this from
+or had by hot word but what some we can out other were all there when up use your how said an
+each she which do their time if will way about many then them write would like so these her long
+make thing see him two has look more day could go come did number sound no most people my over
+know water than call first who may down side been now find any new work part take get place made
+live where after back little only round man year came show every good me give our under name
+very through just form sentence great think say help low line differ turn cause much mean before
+move right boy old too same tell does set three want air well also play small end put home read
+hand port large spell add even land here must big high such follow act why ask men change went
+light kind off need house picture try us again animal point mother world near build self earth
+father head stand own page should country found answer school grow study still learn plant cover
+food sun four between state keep eye never last let thought city tree cross farm hard start
+might story saw far sea draw left late run while press close night real life few north open seem
+together next white children begin got walk example ease paper group always music those both
+mark often letter until mile river car feet care second book carry took science eat room friend
+began idea fish mountain stop once base hear horse cut sure watch color face wood main enough
+plain girl usual young ready above ever red list though feel talk bird soon body dog family
+direct pose leave song measure door product black short numeral class wind question happen
+complete ship area half rock order fire south problem piece told knew pass since top whole king
+space heard best hour better true during hundred five remember step early hold west ground
+interest reach fast verb sing listen six table travel less morning ten simple several vowel
+toward war lay against pattern slow center love person money serve appear road map rain rule
+govern pull cold notice voice unit power town fine certain fly fall lead cry dark machine note
+wait plan figure star box noun field rest correct able pound done beauty drive stood contain
+front teach week final gave green oh quick develop ocean warm free minute strong special mind
+behind clear tail produce fact street inch multiply nothing course stay wheel full force blue
+object decide surface deep moon island foot system busy test record boat common gold possible
+plane stead dry wonder laugh thousand ago ran check game shape equate miss brought heat snow
+tire bring yes distant fill east paint language among radio signal station antenna call report
+weather band power receive send message code operator frequency contact thanks'''.split()  # most common first
+
+JAPANESE_SAMPLE = (
+    'こんにちは。きょうはいいてんきですね。わたしのなまえはやまだです。どうぞよろしくおねがいします。'
+    'あしたはあめがふるそうです。でんぱのじょうたいはとてもよいです。'
+    'ほんじつはごこうしんありがとうございました。またおあいしましょう。'
+    'いろはにほへと ちりぬるを わかよたれそ つねならむ うゐのおくやま けふこえて あさきゆめみし ゑひもせす。'
+    'ぎんこうのまえでばすをまっています。ぱんとぎゅうにゅうをかいました。'
+    'せんせいはがっこうへいきました。こどもたちはこうえんであそんでいます。'
+    'ちょっとまってください。すみません、もういちどおねがいします。'
+    'でんしんのしんごうがつよくきこえます。ありがとう、さようなら。')
+
+
+JAPANESE_WORDS = '''
+の に は を た が で て と し れ さ ある いる も する から な こと として い や れる など なっ
+ない この ため その あっ よう また もの という あり まで られ なる へ か だ これ によって により
+おり より による ず なり られる において ば なかっ なく しかし について せ だっ できる それ う ので
+なお のみ でき き つ における および いう さらに でも ら たり たち ます ん なら せる これら とき
+では にて ほか ながら うち そして とともに ただし かつて それぞれ または お ほど ものの ほとんど
+といった です とも ところ ここ わたし あなた かれ かのじょ ひと こども せんせい がっこう でんわ でんぱ
+むせん きょく しんごう ほうこく てんき あめ ゆき かぜ そら やま かわ うみ まち くに にほん とうきょう
+おおさか きょう あした きのう いま あさ ひる よる ごぜん ごご じかん ふん びょう ねん がつ にち しゅう
+ありがとう ございます おねがい します よろしく こんにちは こんばんは さようなら すみません はい いいえ
+どうぞ ちょっと まって ください もういちど ゆっくり はやく おそく きこえます よく つよい よわい いく くる
+みる きく はなす よむ かく たべる のむ ねる おきる あう まつ かう うる つくる つかう おくる うける
+でる はいる かえる あそぶ べんきょう しごと でんしん ばんごう じゅうしょ なまえ おおきい ちいさい
+あたらしい ふるい たかい やすい ながい みじかい あつい さむい あたたかい すずしい ただしい ぜんぶ すこし
+たくさん いっしょ ひとり ふたり みんな どこ だれ なに いつ なぜ どう'''.split()  # most common first
+
+
+# Declare classes ==================================================
+class CharModel:
+    """
+    Character n-gram model with Witten-Bell smoothing
+    Probabilities of shorter contexts are mixed in, down to a uniform
+    distribution over the vocabulary, and a little of that uniform
+    distribution is mixed into every probability, so a rare symbol in
+    the middle of the text costs a bounded score.
+    """
+
+    def __init__(self, vocabulary, order=ORDER, floor=FLOOR):
+        """
+        :param vocabulary: Characters the model can give (any iterable)
+        :param order: Characters of an n-gram
+        :param floor: Share of the uniform distribution mixed in
+        """
+        self.order = order
+        self.vocabulary = set(vocabulary)
+        self.floor = floor
+        self.counts = defaultdict(lambda: defaultdict(int))  # context -> character -> count
+        self.memo = {}
+
+    def train(self, text):
+        """
+        Count the n-grams of a text
+        :param text: Training text (already folded to the characters of the vocabulary)
+        :return: self
+        """
+        text = ' ' * (self.order - 1) + text
+        for n in range(self.order - 1, len(text)):
+            for k in range(self.order):  # every context length from 0 to order - 1
+                self.counts[text[n - k:n]][text[n]] += 1
+        self.memo.clear()
+        return self
+
+    def logprob(self, context, character):
+        """
+        Log probability of a character after a context
+        :param context: Previous characters (only the last order - 1 are used)
+        :param character: Next character
+        :return: Natural logarithm of the probability
+        """
+        return self.row(context[len(context) - self.order + 1:])[character][0]
+
+    def row(self, context):
+        """
+        Scores of every character of the vocabulary after a context, computed once per context
+        :param context: The last order - 1 characters
+        :return: Dictionary of character to (log probability, context after the character)
+        """
+        row = self.memo.get(context)
+        if row is None:
+            uniform = 1.0 / (len(self.vocabulary) + 1)
+            size = self.order - 1
+            row = self.memo[context] = {
+                c: (math.log((1 - self.floor) * self.probability(context, c) + self.floor * uniform),
+                    (context + c)[-size:] if size else '')
+                for c in self.vocabulary}
+        return row
+
+    def probability(self, context, character):
+        """
+        Smoothed probability of a character after a context
+        :return: Probability
+        """
+        if context:
+            lower = self.probability(context[1:], character)
+        else:
+            lower = 1.0 / (len(self.vocabulary) + 1)
+        followers = self.counts.get(context)
+        if not followers:
+            return lower
+        total = sum(followers.values())
+        kinds = len(followers)
+        return (followers.get(character, 0) + kinds * lower) / (total + kinds)
+
+
+class Segmenter:
+    """
+    Viterbi decoder of morse code with unreliable spaces
+    """
+
+    def __init__(self, select='eng', model=None, beam=BEAM, margin=MARGIN, missing=MISSING, extra=EXTRA):
+        """
+        :param select: A parameter for language
+        :param model: CharModel of the language (default: trained on the built-in samples)
+        :param beam: Hypotheses extended at every position
+        :param margin: Hypotheses scoring this much below the best one are dropped
+        :param missing: Probability that the space between two codes is missing
+        :param extra: Probability of a space inside a code
+        """
+        self.select = select
+        self.table = decode_tables[select]
+        self.model = model or default_model(select)
+        self.beam = beam
+        self.margin = margin
+        self.spaced_end = math.log(1 - missing)  # a code ends where a space was seen
+        self.joined_end = math.log(missing)  # a code ends where no space was seen
+        self.split_cost = math.log(extra) - math.log(1 - extra)  # a code spans a space
+
+    def decode(self, text):
+        """
+        Decode morse code, finding the codes again
+        :param text: Dots and dashes, with or without spaces; '/' between words
+        :return: Decoded text
+        """
+        symbols, gaps = read_stream(text)
+        if not symbols:
+            return ''
+        spaced = 1 in gaps  # without any space, gaps tell nothing
+        table, model = self.table, self.model
+        context_size = model.order - 1
+        size = len(symbols)
+
+        first_end, last_end = code_ends(symbols, gaps, table)
+
+        # hypotheses[position] maps an n-gram context to (score, chain of decoded characters)
+        hypotheses = defaultdict(dict)
+        hypotheses[0][' ' * context_size] = (0.0, None)
+        for position in range(size):
+            states = hypotheses.pop(position, None)
+            if not states:
+                continue
+            if len(states) > 1:
+                floor = max(state[0] for state in states.values()) - self.margin
+                states = [item for item in states.items() if item[1][0] >= floor]
+                if len(states) > self.beam:
+                    states = heapq.nlargest(self.beam, states, key=lambda item: item[1][0])
+            else:
+                states = states.items()
+
+            # > codes which can start here, with the score of the spaces they imply
+            candidates = []
+            cost = 0.0
+            for end in range(first_end[position], last_end[position] + 1):
+                if end > position + 1 and gaps[end - 1]:
+                    if gaps[end - 1] == 2:
+                        break  # codes never span a word gap
+                    cost += self.split_cost
+                character = table.get(symbols[position:end])
+                if character is not None:
+                    if spaced and gaps[end] != 2:
+                        end_cost = self.spaced_end if gaps[end] else self.joined_end
+                    else:
+                        end_cost = 0.0
+                    word = gaps[end] == 2 and end < size
+                    candidates.append((character, character + ' ' if word else character,
+                                       cost + end_cost, hypotheses[end]))
+
+            for context, (score, chain) in states:
+                row = model.row(context)
+                for character, piece, cost, targets in candidates:
+                    logprob, next_context = row[character]
+                    new_score = score + cost + logprob
+                    best = targets.get(next_context)
+                    if best is None or new_score > best[0]:
+                        targets[next_context] = (new_score, (piece, chain))
+
+        final = hypotheses.get(size)
+        if not final:
+            return '[?]'
+        chain = max(final.values(), key=lambda state: state[0])[1]
+        pieces = []
+        while chain is not None:
+            pieces.append(chain[0])
+            chain = chain[1]
+        output = ''.join(reversed(pieces))
+        return merge_ten(output) if self.select == 'jpn' else output
+
+
+# Declare functions for segmentation ===============================
+def code_ends(symbols, gaps, table):
+    """
+    Ends which a code starting at each symbol may have
+    A token between two gaps which is a valid code is kept as it is; only
+    the runs of tokens which are not codes are searched, so correctly
+    spaced code decodes as decode_text decodes it and no code crosses
+    into a valid token.
+    :param symbols: String of dots and dashes
+    :param gaps: Gaps from read_stream
+    :param table: Decode table of the language
+    :return: Tuple of (first end, last end) lists, indexed by the start of a code
+    """
+    size = len(symbols)
+    first_end = [0] * size
+    last_end = [0] * size
+    starts = [n for n in range(size) if gaps[n]] + [size]
+    region = []  # starts of the tokens of the current run to search
+    for start, end in zip(starts, starts[1:]):
+        if symbols[start:end] in table:
+            first_end[start] = last_end[start] = end
+            close_region(region, start, first_end, last_end)
+            region = []
+        else:
+            if region and gaps[start] == 2:
+                close_region(region, start, first_end, last_end)
+                region = []
+            region.extend(range(start, end))
+    close_region(region, size, first_end, last_end)
+    return first_end, last_end
+
+
+def close_region(region, limit, first_end, last_end):
+    """
+    Let the codes starting in a run of symbols end anywhere before a limit
+    :param region: Positions of the run
+    :param limit: First position after the run
+    :return: None
+    """
+    for position in region:
+        first_end[position] = position + 1
+        last_end[position] = min(position + longest_code, limit)
+
+
+def read_stream(text):
+    """
+    Separate the dots and dashes of a stream from the gaps between them
+    Characters other than dots, dashes, whitespace and '/' are ignored.
+    :param text: Raw morse code
+    :return: Tuple of (string of dots and dashes, bytearray of the gap before every
+             symbol and after the last: 0 none, 1 space, 2 word gap or either end)
+    """
+    symbols = []
+    gaps = bytearray([2])
+    gap = 2
+    for c in text.translate(SYMBOL_TABLE):
+        if c == '.' or c == '-':
+            if symbols:
+                gaps.append(gap)
+            symbols.append(c)
+            gap = 0
+        elif c == WORD_GAP:
+            gap = 2
+        elif c.isspace() and gap == 0:
+            gap = 1
+    gaps.append(2)
+    return ''.join(symbols), gaps
+
+
+_models = {}
+
+
+def default_model(select):
+    """
+    Model of a language trained on the built-in samples, built on first use
+    The sentences are followed by a stream of common words drawn with
+    Zipf's law (a fixed seed, so every run builds the same model). Word
+    spaces are left out, as the encoder does not send them.
+    :param select: A parameter for language
+    :return: CharModel
+    """
+    model = _models.get(select)
+    if model is None:
+        sentences, words = (ENGLISH_SAMPLE, ENGLISH_WORDS) if select == 'eng' else (JAPANESE_SAMPLE, JAPANESE_WORDS)
+        chooser = random.Random(0)
+        stream = chooser.choices(words, weights=[1 / (rank + 10) for rank in range(len(words))], k=SAMPLE_WORDS)
+        sample = ''.join(sentences.split()) + ''.join(stream)
+        if select == 'jpn':
+            sample = normalize_japanese(sample)
+        vocabulary = set(decode_tables[select].values())
+        model = _models[select] = CharModel(vocabulary).train(sample)
+    return model
+
+
+def decode_unspaced(text, select='eng', beam=BEAM):
+    """
+    Decode morse code whose spaces cannot be trusted
+    :param text: Dots and dashes, with or without spaces; '/' between words
+    :param select: A parameter for language
+    :param beam: Hypotheses extended at every position
+    :return: Decoded text
+    """
+    return Segmenter(select, beam=beam).decode(text)
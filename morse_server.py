@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - translation service
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Serves the four conversions to several operators at once, over HTTP and
+over a line-based TCP protocol, on one asyncio event loop.
+
+HTTP (keep-alive, pipelined requests are answered in order):
+    POST /convert/<direction>   body: text            -> converted text
+    POST /stream/<direction>    body: text            -> converted text, chunked
+    POST /batch                 body: JSON list of {"direction": ..., "text": ...}
+                                                      -> JSON list of {"result": ...} or {"error": ...}
+    GET  /directions, GET /stats
+TCP, one request per line:
+    <direction> <text>  ->  OK <converted text>  or  ERR <message>
+
+The direction is a name of DIRECTIONS or its number in the menu. Short
+texts are converted on the loop through a TranslationCache; longer ones
+run on a process pool, so a large request never stalls the others.
+
+    python morse_server.py --http-port 8080 --tcp-port 8081
+"""
+
+# Import modules ===================================================
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from morse_cache import TranslationCache
+from morse_codec import DIRECTIONS, ConversionError, check_blank, convert, converters
+from morse_parallel import safe_chunks
+
+
+HOST = '127.0.0.1'
+HTTP_PORT = 8080
+TCP_PORT = 8081
+INLINE_LIMIT = 16 << 10  # characters converted on the event loop
+STREAM_CHUNK_SIZE = 256 << 10  # characters per chunk of a streamed response
+MAX_BODY = 64 << 20  # bytes
+MAX_BATCH = 10000  # items of one batch request
+PIPELINE_DEPTH = 64  # requests of one connection processed ahead of the answers
+LINE_LIMIT = 1 << 20  # bytes of one TCP line or HTTP header
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """
+    Raised for a request which cannot be answered, with its HTTP status
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Declare functions for requests ===================================
+def parse_direction_name(name):
+    """
+    Accept a direction by name or by its number in the menu
+    :param name: Direction given by the client
+    :return: One of DIRECTIONS
+    :raise RequestError: If the direction is unknown
+    """
+    if name.isdigit() and 1 <= int(name) <= len(DIRECTIONS):
+        return DIRECTIONS[int(name) - 1]
+    if name in DIRECTIONS:
+        return name
+    raise RequestError(404, 'Unknown direction: %s' % name)
+
+
+def convert_batch(items):
+    """
+    Convert the items of a batch request (runs in a worker process for large batches)
+    :param items: List of (direction, text)
+    :return: List of {'result': ...} or {'error': ...}
+    """
+    results = []
+    for direction, text in items:
+        try:
+            results.append({'result': converters[direction](text)})
+        except ConversionError as e:
+            results.append({'error': str(e)})
+    return results
+
+
+async def read_body(reader, headers):
+    """
+    Read the body of an HTTP request
+    :param reader: StreamReader of the connection
+    :param headers: Dictionary of lower-case header names to values
+    :return: Body bytes
+    :raise RequestError: If the body is too large or its length is unknown
+    """
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        parts = []
+        size = 0
+        while True:
+            length = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if length == 0:
+                while (await reader.readline()).strip():
+                    pass  # trailers
+                return b''.join(parts)
+            size += length
+            if size > MAX_BODY:
+                raise RequestError(413, 'The body is larger than %d bytes.' % MAX_BODY)
+            parts.append(await reader.readexactly(length))
+            await reader.readexactly(2)
+    if 'content-length' not in headers:
+        return b''
+    length = int(headers['content-length'])
+    if length > MAX_BODY:
+        raise RequestError(413, 'The body is larger than %d bytes.' % MAX_BODY)
+    return await reader.readexactly(length)
+
+
+def http_response(status, body, content_type='text/plain; charset=utf-8', keep_alive=True):
+    """
+    Build a complete HTTP response
+    :param status: Status code
+    :param body: Body bytes
+    :param content_type: Value of Content-Type
+    :param keep_alive: False to close the connection after it
+    :return: Response bytes
+    """
+    head = ('HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\n%s\r\n'
+            % (status, REASONS[status], content_type, len(body), '' if keep_alive else 'Connection: close\r\n'))
+    return head.encode('ascii') + body
+
+
+# Declare classes ==================================================
+class TranslationServer:
+    """
+    HTTP and TCP front end of the translator
+    """
+
+    def __init__(self, host=HOST, http_port=HTTP_PORT, tcp_port=TCP_PORT, workers=None,
+                 inline_limit=INLINE_LIMIT):
+        """
+        :param host: Address to listen on
+        :param http_port: Port of the HTTP front end, or None
+        :param tcp_port: Port of the line protocol, or None
+        :param workers: Processes for long requests (default: number of CPUs)
+        :param inline_limit: Longest text converted on the event loop
+        """
+        self.host = host
+        self.http_port = http_port
+        self.tcp_port = tcp_port
+        self.workers = workers or os.cpu_count() or 1
+        self.inline_limit = inline_limit
+        self.cache = TranslationCache()
+        self.pool = None
+        self.servers = []
+        self.connections = {}  # task of every open connection -> its writer
+        self.requests = 0
+        self.offloaded = 0
+        self.errors = 0
+        self.started = time.monotonic()
+
+    async def start(self):
+        """
+        Start listening
+        :return: None
+        """
+        # forked workers would inherit the sockets of the connections open at the time
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        if self.http_port is not None:
+            server = await asyncio.start_server(self.handle_http, self.host, self.http_port, limit=LINE_LIMIT)
+            self.http_port = server.sockets[0].getsockname()[1]
+            self.servers.append(server)
+        if self.tcp_port is not None:
+            server = await asyncio.start_server(self.handle_tcp, self.host, self.tcp_port, limit=LINE_LIMIT)
+            self.tcp_port = server.sockets[0].getsockname()[1]
+            self.servers.append(server)
+
+    async def serve_forever(self):
+        """
+        Start listening and serve until cancelled
+        :return: None
+        """
+        await self.start()
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in self.servers))
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Stop listening and shut the process pool down
+        :return: None
+        """
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+        for writer in list(self.connections.values()):
+            writer.close()  # the handlers see the end of their input and finish
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def run(self, function, *args):
+        """
+        Run a CPU-heavy function on the process pool
+        :return: Result of the function
+        """
+        self.offloaded += 1
+        return await asyncio.get_running_loop().run_in_executor(self.pool, function, *args)
+
+    async def translate(self, direction, text):
+        """
+        Convert one text, on the loop if it is short and on the pool if not
+        :param direction: One of DIRECTIONS
+        :param text: String to convert
+        :return: Converted text
+        :raise BlankInputError: If the text is blank
+        """
+        self.requests += 1
+        if len(text) <= self.inline_limit:
+            return self.cache.convert(direction, text)
+        return await self.run(converters[direction], text)
+
+    def stats(self):
+        """
+        Counters of the service
+        :return: Dictionary
+        """
+        return {'requests': self.requests, 'offloaded': self.offloaded, 'errors': self.errors,
+                'uptime': time.monotonic() - self.started, 'cache': self.cache.stats()}
+
+    # HTTP ---------------------------------------------------------
+    async def handle_http(self, reader, writer):
+        """
+        Serve one HTTP connection
+        Requests are read and started as they come; a second task writes
+        the answers in the order of the requests.
+        :return: None
+        """
+        answers = asyncio.Queue(PIPELINE_DEPTH)
+        sender = asyncio.create_task(self.send_answers(answers, writer))
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    if not line:
+                        break
+                    continue
+                method, target, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+                try:
+                    body = await read_body(reader, headers)
+                except RequestError as e:
+                    await answers.put(self.http_error(e, keep_alive=False))
+                    break
+                await answers.put(asyncio.create_task(self.answer_http(method, target, body, keep_alive)))
+                if not keep_alive:
+                    break
+        except ValueError:  # malformed or too long request line, header or length
+            await answers.put(self.http_error(RequestError(400, 'Malformed request.'), keep_alive=False))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # the client went away: answer what was read, then close
+        finally:
+            await answers.put(None)
+            await sender
+            writer.close()
+            self.connections.pop(asyncio.current_task(), None)
+
+    async def send_answers(self, answers, writer):
+        """
+        Write the answers of a connection in order
+        :param answers: Queue of tasks (or ready answers), None at the end
+        :param writer: StreamWriter of the connection
+        :return: None
+        """
+        broken = False
+        while True:
+            answer = await answers.get()
+            if answer is None:
+                return
+            if broken:
+                if asyncio.isfuture(answer):
+                    answer.cancel()
+                continue  # keep taking answers so the reading side never blocks
+            try:
+                if asyncio.isfuture(answer):
+                    answer = await answer
+                if isinstance(answer, bytes):
+                    writer.write(answer)
+                else:
+                    async for part in answer:  # streamed response
+                        writer.write(part)
+                        await writer.drain()
+                await writer.drain()
+            except Exception:  # connection lost, or a streamed response failed halfway
+                broken = True
+                writer.close()
+
+    def http_error(self, error, keep_alive=True):
+        """
+        Answer of a failed request
+        :param error: RequestError or ConversionError
+        :param keep_alive: False to close the connection after it
+        :return: Response bytes
+        """
+        self.errors += 1
+        status = getattr(error, 'status', 400)
+        return http_response(status, (str(error) + '\n').encode('utf-8'), keep_alive=keep_alive)
+
+    async def answer_http(self, method, target, body, keep_alive):
+        """
+        Answer one HTTP request
+        :return: Response bytes, or an async iterator of bytes for a streamed response
+        """
+        path = target.split('?')[0].strip('/').split('/')
+        try:
+            if method == 'GET' and path == ['directions']:
+                return http_response(200, json.dumps(DIRECTIONS).encode('utf-8'), 'application/json',
+                                     keep_alive)
+            if method == 'GET' and path == ['stats']:
+                return http_response(200, json.dumps(self.stats()).encode('utf-8'), 'application/json',
+                                     keep_alive)
+            if path[0] not in ('convert', 'stream', 'batch') or len(path) != (1 if path[0] == 'batch' else 2):
+                raise RequestError(404, 'Unknown path: %s' % target)
+            if method != 'POST':
+                raise RequestError(405, 'Use POST for %s.' % target)
+            try:
+                text = body.decode('utf-8')
+            except UnicodeDecodeError:
+                raise RequestError(400, 'The body is not UTF-8.')
+
+            if path[0] == 'batch':
+                results = await self.batch(text)
+                return http_response(200, json.dumps(results, ensure_ascii=False).encode('utf-8'),
+                                     'application/json; charset=utf-8', keep_alive)
+            direction = parse_direction_name(path[1])
+            if path[0] == 'stream':
+                check_blank(text, direction)  # before the head of the response is sent
+                return self.stream_http(direction, text, keep_alive)
+            output = await self.translate(direction, text)
+            return http_response(200, output.encode('utf-8'), keep_alive=keep_alive)
+        except (RequestError, ConversionError) as e:
+            return self.http_error(e, keep_alive)
+        except Exception as e:
+            self.errors += 1
+            return http_response(500, ('%s: %s\n' % (type(e).__name__, e)).encode('utf-8'),
+                                 keep_alive=keep_alive)
+
+    async def batch(self, text):
+        """
+        Convert the items of a batch request
+        :param text: JSON list of {"direction": ..., "text": ...}
+        :return: List of {'result': ...} or {'error': ...}
+        :raise RequestError: If the request is malformed
+        """
+        try:
+            items = [(parse_direction_name(str(item['direction'])), str(item['text']))
+                     for item in json.loads(text)]
+        except (ValueError, TypeError, KeyError):
+            raise RequestError(400, 'A batch is a JSON list of {"direction": ..., "text": ...}.')
+        if len(items) > MAX_BATCH:
+            raise RequestError(413, 'A batch has at most %d items.' % MAX_BATCH)
+        self.requests += len(items)
+        if sum(len(t) for _, t in items) <= self.inline_limit:
+            return convert_batch(items)
+        return await self.run(convert_batch, items)
+
+    async def stream_http(self, direction, text, keep_alive):
+        """
+        Converted text as a chunked response, converted chunk by chunk on the pool
+        :return: Async iterator of bytes
+        """
+        self.requests += 1
+        head = 'HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=utf-8\r\nTransfer-Encoding: chunked\r\n'
+        yield (head + ('\r\n' if keep_alive else 'Connection: close\r\n\r\n')).encode('ascii')
+        loop = asyncio.get_running_loop()
+        pending = []
+        for chunk in safe_chunks(text, direction, STREAM_CHUNK_SIZE):
+            pending.append(loop.run_in_executor(self.pool, convert, chunk, direction))
+            if len(pending) >= 2 * self.workers:
+                yield self.http_chunk(await pending.pop(0))
+        for future in pending:
+            yield self.http_chunk(await future)
+        yield b'0\r\n\r\n'
+
+    @staticmethod
+    def http_chunk(text):
+        """
+        Frame one chunk of a chunked response
+        :param text: Converted text
+        :return: Bytes (empty for an empty text, which would end the response)
+        """
+        data = text.encode('utf-8')
+        return b'%x\r\n%s\r\n' % (len(data), data) if data else b''
+
+    # TCP ----------------------------------------------------------
+    async def handle_tcp(self, reader, writer):
+        """
+        Serve one connection of the line protocol, answering lines in order
+        :return: None
+        """
+        answers = asyncio.Queue(PIPELINE_DEPTH)
+        sender = asyncio.create_task(self.send_answers(answers, writer))
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode('utf-8', 'replace').rstrip('\r\n')
+                if line.strip():
+                    await answers.put(asyncio.create_task(self.answer_line(line)))
+        except ValueError:
+            self.errors += 1
+            await answers.put(('ERR The line is longer than %d bytes.\n' % LINE_LIMIT).encode('utf-8'))
+        except ConnectionError:
+            pass
+        finally:
+            await answers.put(None)
+            await sender
+            writer.close()
+            self.connections.pop(asyncio.current_task(), None)
+
+    async def answer_line(self, line):
+        """
+        Answer one line of the TCP protocol
+        :param line: '<direction> <text>'
+        :return: Answer bytes, ending with a new line
+        """
+        name, _, text = line.partition(' ')
+        try:
+            output = await self.translate(parse_direction_name(name), text)
+            return ('OK %s\n' % output).encode('utf-8')
+        except (RequestError, ConversionError) as e:
+            self.errors += 1
+            return ('ERR %s\n' % e).encode('utf-8')
+
+
+# Declare functions for program ====================================
+def main(argv=None):
+    """
+    Run the service until interrupted
+    :param argv: Command line arguments (default: sys.argv[1:])
+    :return: Exit status
+    """
+    parser = argparse.ArgumentParser(description='Serve the translator over HTTP and a line-based TCP protocol.')
+    parser.add_argument('--host', default=HOST, help='address to listen on (default: %s)' % HOST)
+    parser.add_argument('--http-port', type=int, default=HTTP_PORT, help='HTTP port, 0 for any (default: %d)'
+                                                                          % HTTP_PORT)
+    parser.add_argument('--tcp-port', type=int, default=TCP_PORT, help='TCP port, 0 for any (default: %d)'
+                                                                        % TCP_PORT)
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='processes for long requests, 0 for one per CPU')
+    parser.add_argument('--inline-limit', type=int, default=INLINE_LIMIT,
+                        help='longest text converted without the process pool (default: %d)' % INLINE_LIMIT)
+    args = parser.parse_args(argv)
+
+    server = TranslationServer(args.host, args.http_port, args.tcp_port, args.jobs or None, args.inline_limit)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
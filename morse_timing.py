@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - keying timing
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Encodes text straight into the on/off timing of the key, without making
+the string of dots and dashes first. A timing is an array('H') of
+(state, units) pairs laid out flat: state is KEY_DOWN or KEY_UP, units
+the length in dit units (1 or 3 down, 1, 3 or 7 up). It always starts
+and ends key-down, and the states alternate. The array supports the
+buffer protocol, so np.frombuffer(timing, np.uint16).reshape(-1, 2)
+views it without a copy.
+
+The timing of every character of a language (Japanese folded characters
+included, with a voiced kana keyed as the kana and its point) is built
+once from the encode tables, preceded by a character gap. A message is
+then the join of these pieces, word by word, with the first gap of each
+word widened to a word gap. Characters which have no code are not keyed.
+"""
+
+# Import modules ===================================================
+from array import array
+
+from morse_codec import TABLE_LIMIT, encode_tables, japanese_encode_table
+
+
+KEY_UP, KEY_DOWN = 0, 1
+DIT, DAH = 1, 3  # units of the marks
+ELEMENT_GAP, CHAR_GAP, WORD_GAP = 1, 3, 7  # units of the spaces
+WPM = 20
+
+
+# Declare classes ==================================================
+class TimingTable(dict):
+    """
+    Timing of each character, as the bytes of an array('H') which begins
+    with a character gap (empty for characters which are not keyed)
+    Characters which are not in the encode table are added on first use,
+    until the table holds TABLE_LIMIT entries.
+    """
+
+    def __init__(self, encode_table):
+        """
+        :param encode_table: EncodeTable of a language
+        """
+        super().__init__()
+        self.encode_table = encode_table
+        for char in encode_table:
+            self[char] = code_timing(encode_table[char])
+
+    def __missing__(self, key):
+        value = code_timing(self.encode_table[key])
+        if len(self) < TABLE_LIMIT:
+            self[key] = value
+        return value
+
+
+# Declare functions for timing =====================================
+def code_timing(codes):
+    """
+    Timing of the codes of one character
+    :param codes: Codes followed by spaces, as in an encode table ('.- ', '-.-.. .. ')
+    :return: Bytes of an array('H'), beginning with a character gap
+    """
+    timing = array('H')
+    for code in codes.split():
+        if not code or code.strip('.-'):
+            continue  # '[?]' is not keyed
+        timing.extend((KEY_UP, CHAR_GAP))
+        for n, element in enumerate(code):
+            if n:
+                timing.extend((KEY_UP, ELEMENT_GAP))
+            timing.extend((KEY_DOWN, DIT if element == '.' else DAH))
+    return timing.tobytes()
+
+
+timing_tables = {}
+
+
+def get_timing_table(select):
+    """
+    Timing table of a language, built on first use
+    :param select: A parameter for language
+    :return: TimingTable
+    """
+    table = timing_tables.get(select)
+    if table is None:
+        table = timing_tables[select] = TimingTable(encode_tables['eng'] if select == 'eng'
+                                                    else japanese_encode_table)
+    return table
+
+
+def encode_timing(text, select='eng'):
+    """
+    Encode text into the timing of the key
+    :param text: String to key
+    :param select: A parameter for language
+    :return: array('H') of (state, units) pairs
+    """
+    get = get_timing_table(select).__getitem__
+    timing = array('H')
+    for word in text.lower().split():
+        start = len(timing)
+        timing.frombytes(b''.join(map(get, word)))
+        if len(timing) > start:
+            timing[start + 1] = WORD_GAP
+    del timing[:2]  # nothing before the first mark
+    return timing
+
+
+def morse_timing(morse):
+    """
+    Timing of morse code which is already a string
+    :param morse: Codes separated by spaces, words separated by ' / '
+    :return: array('H') of (state, units) pairs
+    """
+    timing = array('H')
+    for word in morse.split('/'):
+        start = len(timing)
+        timing.frombytes(code_timing(word))
+        if len(timing) > start:
+            timing[start + 1] = WORD_GAP
+    del timing[:2]
+    return timing
+
+
+def gap_counts(timing):
+    """
+    Count the marks and spaces of a timing
+    :param timing: array('H') of (state, units) pairs
+    :return: Tuple of (units of the marks, element gaps, character gaps, word gaps)
+    """
+    spaces = timing[3::4].tolist()
+    return sum(timing[1::4]), spaces.count(ELEMENT_GAP), spaces.count(CHAR_GAP), spaces.count(WORD_GAP)
+
+
+def duration(timing, wpm=WPM, farnsworth_wpm=None):
+    """
+    Length of a transmission
+    :param timing: array('H') of (state, units) pairs
+    :param wpm: Speed of the characters in words per minute (PARIS)
+    :param farnsworth_wpm: Slower overall speed reached by longer gaps, or None
+    :return: Seconds from the first key-down to the last key-up
+    """
+    unit = 1.2 / wpm
+    char_gap, word_gap = CHAR_GAP * unit, WORD_GAP * unit
+    if farnsworth_wpm and farnsworth_wpm < wpm:
+        delay = (60 * wpm - 37.2 * farnsworth_wpm) / (farnsworth_wpm * wpm)  # as in morse_audio.ToneSet
+        char_gap, word_gap = 3 * delay / 19, 7 * delay / 19
+    marks, element_gaps, char_gaps, word_gaps = gap_counts(timing)
+    return (marks + element_gaps) * unit + char_gaps * char_gap + word_gaps * word_gap
+
+
+def key_events(timing, wpm=WPM, start=0.0):
+    """
+    Key-down and key-up events of a timing, as a keyer would send them
+    :param timing: array('H') of (state, units) pairs
+    :param wpm: Speed in words per minute
+    :param start: Time of the first key-down
+    :return: Iterator of (time, down) pairs (the input of morse_keyer.decode_events)
+    """
+    unit = 1.2 / wpm
+    at = start
+    for n in range(0, len(timing), 2):
+        state = timing[n]
+        yield at, state == KEY_DOWN
+        at += timing[n + 1] * unit
+    if timing:
+        yield at, False
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - entry point
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Run this file without arguments to open the translator window.
+The GUI script (and with it tkinter and pyperclip) is only loaded
+when the window is actually opened.
+
+With arguments it converts files, directories or stdin in batch:
+    python morse_translator.py -d eng2morse book.txt -o book.morse
+    cat log.morse | python morse_translator.py -d morse2eng
+    python morse_translator.py -d 4 captures/ -o decoded/
+    python morse_translator.py -d 2 log.morse --metrics metrics.json
+"""
+
+# Import modules ===================================================
+import argparse
+import codecs
+import fnmatch
+import os
+import runpy
+import sys
+import time
+
+import morse_metrics
+from morse_codec import DIRECTIONS, convert_stream
+from morse_parallel import parallel_convert_stream
+
+
+GUI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'morse_code_translator_v1.3.0.py')
+BUFFER_SIZE = 1 << 20  # bytes read and written at once
+
+
+# Declare functions for program ====================================
+def launch_gui():
+    """
+    Load the GUI script and open the translator window
+    :return: None
+    """
+    runpy.run_path(GUI_SCRIPT, run_name='__main__')
+
+
+def read_chunks(file, counter, encoding='utf-8'):
+    """
+    Read a binary file in large blocks and decode them
+    :param file: Binary file object
+    :param counter: Dictionary whose 'bytes' is increased by the bytes read
+    :param encoding: Encoding of the file
+    :return: Iterator of strings
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    block = file.read(BUFFER_SIZE)
+    while block:
+        counter['bytes'] += len(block)
+        text = decoder.decode(block)
+        if text:
+            yield text
+        block = file.read(BUFFER_SIZE)
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def translate_file(source, target, direction, counter, encoding='utf-8', jobs=1):
+    """
+    Convert one binary file into another
+    :param source: Binary file object to read
+    :param target: Binary file object to write
+    :param direction: One of DIRECTIONS
+    :param counter: Dictionary of 'bytes' and 'symbols' to increase
+    :param encoding: Encoding of both files
+    :param jobs: Number of processes to convert with
+    :return: None
+    """
+    to_morse = direction.endswith('morse')
+    symbols = 0
+    chunks = read_chunks(source, counter, encoding)
+    if jobs > 1:
+        outputs = parallel_convert_stream(chunks, direction, jobs)
+    else:
+        outputs = convert_stream(chunks, direction)
+    for output in outputs:
+        if to_morse:
+            symbols += output.count(' ')  # one code per converted character
+        else:
+            symbols += len(output) - 2 * output.count('[?]')
+        target.write(output.encode(encoding))
+    counter['symbols'] += symbols
+
+
+def collect_inputs(paths, pattern):
+    """
+    Expand the input paths into (path, relative path) pairs
+    :param paths: Files, directories or '-' for stdin
+    :param pattern: Shell pattern of file names taken from directories
+    :return: List of (path, path relative to its directory argument)
+    """
+    inputs = []
+    for path in paths:
+        if path == '-' or not os.path.isdir(path):
+            inputs.append((path, os.path.basename(path)))
+            continue
+        for top, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(fnmatch.filter(files, pattern)):
+                full = os.path.join(top, name)
+                inputs.append((full, os.path.relpath(full, path)))
+    return inputs
+
+
+def run_batch(args):
+    """
+    Convert the inputs given on the command line
+    :param args: Parsed arguments
+    :return: Exit status
+    """
+    direction = DIRECTIONS[int(args.direction) - 1] if args.direction.isdigit() else args.direction
+    inputs = collect_inputs(args.inputs or ['-'], args.pattern)
+    to_directory = args.output is not None and (os.path.isdir(args.output) or len(inputs) > 1
+                                                or any(os.path.isdir(p) for p in args.inputs))
+    counter = {'bytes': 0, 'symbols': 0}
+    stdout = sys.stdout.buffer
+    if args.metrics is not None:
+        morse_metrics.enable()
+    start = time.perf_counter()
+
+    single = None
+    if args.output is not None and not to_directory:
+        single = open(args.output, 'wb', buffering=BUFFER_SIZE)
+    try:
+        for path, relative in inputs:
+            source = sys.stdin.buffer if path == '-' else open(path, 'rb', buffering=0)
+            try:
+                if to_directory:
+                    out_path = os.path.join(args.output, relative + args.suffix)
+                    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+                    with open(out_path, 'wb', buffering=BUFFER_SIZE) as target:
+                        translate_file(source, target, direction, counter, args.encoding, args.jobs)
+                else:
+                    translate_file(source, single or stdout, direction, counter, args.encoding, args.jobs)
+            finally:
+                if source is not sys.stdin.buffer:
+                    source.close()
+    finally:
+        if single is not None:
+            single.close()
+        else:
+            stdout.flush()
+
+    if not args.quiet:
+        seconds = max(time.perf_counter() - start, 1e-9)
+        sys.stderr.write('%s: %d input(s), %d bytes, %d symbols in %.3f s (%.2f MB/s, %.0f symbols/s)\n'
+                         % (direction, len(inputs), counter['bytes'], counter['symbols'], seconds,
+                            counter['bytes'] / seconds / 1e6, counter['symbols'] / seconds))
+    if args.metrics == '-':
+        sys.stderr.write(morse_metrics.report() + '\n')
+    elif args.metrics is not None:
+        morse_metrics.dump(args.metrics)
+    return 0
+
+
+def main(argv=None):
+    """
+    Main function of the entry point
+    :param argv: Command line arguments (default: sys.argv[1:])
+    :return: Exit status
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        launch_gui()
+        return 0
+
+    parser = argparse.ArgumentParser(description='Convert text and morse code in batch. '
+                                                 'Without arguments, open the translator window.')
+    parser.add_argument('inputs', nargs='*', help="files or directories to convert, '-' for stdin (default)")
+    parser.add_argument('-d', '--direction', required=True, choices=DIRECTIONS + ('1', '2', '3', '4'),
+                        help='direction of conversion, or its number in the menu')
+    parser.add_argument('-o', '--output', help='output file, or directory for several inputs (default: stdout)')
+    parser.add_argument('--pattern', default='*', help='file names taken from input directories (default: *)')
+    parser.add_argument('--suffix', default='', help='suffix added to the names in an output directory')
+    parser.add_argument('--encoding', default='utf-8', help='encoding of inputs and outputs (default: utf-8)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes, 0 for one per CPU (default: 1)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not report the throughput')
+    parser.add_argument('--metrics', nargs='?', const='-', metavar='FILE',
+                        help='measure the stages of the conversion and print them on stderr, or save them '
+                             'as JSON in FILE (only this process is measured, not the -j workers)')
+    args = parser.parse_args(argv)
+
+    for path in args.inputs:
+        if path != '-' and not os.path.exists(path):
+            parser.error('No such file or directory: %s' % path)
+    if args.jobs < 0:
+        parser.error('The number of jobs must not be negative.')
+    args.jobs = args.jobs or os.cpu_count() or 1
+    return run_batch(args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - binary tree decoder
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Decodes morse code by walking a binary tree (dot = left, dash = right)
+instead of hashing every code. The tree is stored as a heap: the root is
+node 1, and the children of node n are 2n (dot) and 2n + 1 (dash), so a
+node number is the code packed as bits behind a leading 1. One tree is
+shared by every language; each language only adds a list of labels.
+
+The decoder reads the raw string character by character and never builds
+a string per code. Codes which leave the tree, or contain anything else
+than dots and dashes, fall into node 0 and become '[?]'.
+"""
+
+# Import modules ===================================================
+from morse_codec import decode_tables, longest_code, merge_ten
+
+
+TREE_SIZE = 2 << longest_code  # nodes of a tree holding every code
+SINK = 0  # node of unknown codes
+ROOT = 1
+
+
+# Declare tables ===================================================
+def code_to_node(code):
+    """
+    Number of the node a code leads to
+    :param code: Morse code made of dots and dashes
+    :return: Node number
+    """
+    node = ROOT
+    for c in code:
+        node = 2 * node + (c == '-')
+    return node
+
+
+def build_labels(table):
+    """
+    Put the characters of a decode table on the nodes of the tree
+    :param table: Dictionary of code to character
+    :return: List of characters indexed by node ('[?]' for other nodes)
+    """
+    labels = ['[?]'] * TREE_SIZE
+    for code, char in table.items():
+        labels[code_to_node(code)] = char
+    return labels
+
+
+# next node after a dot or a dash; leaving the tree leads to the sink
+dot_child = [2 * n if 2 * n < TREE_SIZE else SINK for n in range(TREE_SIZE)]
+dash_child = [2 * n + 1 if 2 * n + 1 < TREE_SIZE else SINK for n in range(TREE_SIZE)]
+dot_child[SINK] = dash_child[SINK] = SINK
+
+tree_labels = {select: build_labels(table) for select, table in decode_tables.items()}
+
+
+# Declare functions for decoding ===================================
+def decode_tree(text, select):
+    """
+    Convert morse code to English or Japanese text on the tree
+    Gives the same result as morse_codec.decode_text.
+    :param text: String of codes separated by whitespace
+    :param select: A parameter for language
+    :return: Converted text
+    """
+    labels = tree_labels.get(select)
+    if labels is None:
+        return ''
+    dot, dash = dot_child, dash_child
+    output = []
+    append = output.append
+    node = ROOT
+    for c in text:
+        if c == '.':
+            node = dot[node]
+        elif c == '-':
+            node = dash[node]
+        elif c == ' ' or c.isspace():
+            if node != ROOT:
+                append(labels[node])
+                node = ROOT
+        else:
+            node = SINK
+    if node != ROOT:
+        append(labels[node])
+
+    output = ''.join(output)
+    if select == 'jpn':
+        return merge_ten(output)
+    return output
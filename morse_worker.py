@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+Morse Code Translator - background conversion
+Date: 2022-08-17
+Creator: JaeyoungHan
+
+Runs one conversion on a worker thread so the window stays responsive.
+The thread never touches tkinter: it puts messages on a queue, and the
+window takes them with poll() from a root.after callback. A long input is
+converted chunk by chunk with convert_stream, so the progress can be
+reported and a cancellation takes effect after the current chunk.
+"""
+
+# Import modules ===================================================
+import queue
+import threading
+
+from morse_codec import check_blank, convert_stream, converters, parse_direction
+
+
+WORKER_CHUNK_SIZE = 1 << 16  # characters converted between two progress messages
+
+# messages put on the queue, as (kind, value)
+PROGRESS = 'progress'  # value: share of the input converted, from 0 to 1
+OUTPUT = 'output'  # value: next piece of the converted text
+DONE = 'done'  # value: None
+ERROR = 'error'  # value: the exception raised
+CANCELLED = 'cancelled'  # value: None
+
+
+# Declare classes ==================================================
+class ConversionWorker:
+    """
+    One conversion on a background thread
+    """
+
+    def __init__(self, direction, text, convert=None, chunk_size=WORKER_CHUNK_SIZE):
+        """
+        :param direction: One of DIRECTIONS
+        :param text: String to convert
+        :param convert: Function of (direction, text) used for an input of one chunk,
+                        such as TranslationCache.convert (default: the change_* function)
+        :param chunk_size: Characters converted between two progress messages
+        """
+        parse_direction(direction)  # fail now on an unknown direction
+        self.direction = direction
+        self.text = text
+        self.convert = convert or (lambda d, t: converters[d](t))
+        self.chunk_size = chunk_size
+        self.messages = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """
+        Start the conversion
+        :return: self
+        """
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Ask the conversion to stop after the current chunk
+        :return: None
+        """
+        self.cancelled.set()
+
+    def is_alive(self):
+        """
+        :return: True while the conversion is running
+        """
+        return self.thread.is_alive()
+
+    def poll(self):
+        """
+        Take the messages put since the last call, without waiting
+        :return: List of (kind, value)
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def chunks(self):
+        """
+        Cut the input into chunks, reporting the progress and stopping on cancel
+        :return: Iterator of strings
+        """
+        text, size = self.text, self.chunk_size
+        for start in range(0, len(text), size):
+            if self.cancelled.is_set():
+                return
+            yield text[start:start + size]
+            self.messages.put((PROGRESS, min(start + size, len(text)) / len(text)))
+
+    def run(self):
+        """
+        Body of the thread
+        :return: None
+        """
+        put = self.messages.put
+        try:
+            if len(self.text) <= self.chunk_size:
+                put((OUTPUT, self.convert(self.direction, self.text)))
+                put((PROGRESS, 1.0))
+            else:
+                check_blank(self.text, self.direction)
+                for output in convert_stream(self.chunks(), self.direction):
+                    put((OUTPUT, output))
+                    if self.cancelled.is_set():
+                        break
+            put((CANCELLED, None) if self.cancelled.is_set() else (DONE, None))
+        except Exception as e:
+            put((ERROR, e))
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the Morse Code Translator
+
+Usage: python -m pytest tests
+"""
+
+# Import modules ===================================================
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
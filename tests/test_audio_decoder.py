@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_audio_decoder
+"""
+
+# Import modules ===================================================
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from morse_audio import FREQUENCY, SAMPLE_RATE, render, write_wav
+from morse_audio_decoder import audio_to_morse, decode_audio, decode_wav, detect_frequency
+
+
+# Declare tests ====================================================
+@pytest.mark.parametrize('count', [0, 1, 5])
+def test_too_short_audio_gives_nothing(count):
+    samples = np.zeros(count, dtype=np.int16)
+    assert audio_to_morse(samples, SAMPLE_RATE) == ''
+    assert decode_audio(samples, SAMPLE_RATE) == ''
+
+
+@pytest.mark.parametrize('count', [0, 1])
+def test_frequency_of_audio_without_a_bin(count):
+    assert detect_frequency(np.zeros(count, dtype=np.int16), SAMPLE_RATE) == FREQUENCY
+
+
+def test_silent_audio_gives_nothing():
+    assert decode_audio(np.zeros(SAMPLE_RATE, dtype=np.int16), SAMPLE_RATE) == ''
+
+
+def test_empty_wav_file(tmp_path):
+    path = str(tmp_path / 'empty.wav')
+    write_wav(path, '')
+    assert decode_wav(path) == ''
+
+
+def test_rendered_audio_decodes():
+    samples = np.frombuffer(render('cq de ja1xyz'), dtype='<i2')
+    assert decode_audio(samples, SAMPLE_RATE) == 'cq de ja1xyz'
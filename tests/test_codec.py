@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_codec
+"""
+
+# Import modules ===================================================
+import pytest
+
+from morse_codec import DIRECTIONS, BlankInputError, check_blank, converters
+
+
+# Declare tests ====================================================
+@pytest.mark.parametrize('direction', DIRECTIONS)
+@pytest.mark.parametrize('text', ['', ' ', '\n\t', 'a', '.-'])
+def test_check_blank_is_the_rule_of_the_main_functions(direction, text):
+    try:
+        converters[direction](text)
+        refused = False
+    except BlankInputError:
+        refused = True
+    blank = not text or (direction.startswith('morse2') and text.isspace())
+    assert refused == blank
+    if blank:
+        with pytest.raises(BlankInputError):
+            check_blank(text, direction)
+    else:
+        check_blank(text, direction)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_codelist
+"""
+
+# Import modules ===================================================
+import morse_alphabets
+from morse_codelist import CodeList
+
+
+# Declare tests ====================================================
+def test_languages_do_not_compile_the_alphabets(monkeypatch):
+    registry = morse_alphabets.AlphabetRegistry(cache_dir='')
+    monkeypatch.setattr(morse_alphabets, 'registry', registry)
+    code_list = CodeList()
+    languages = dict(code_list.languages())
+    assert languages['kor'] == 'Korean (SKATS)'
+    assert sorted(registry.alphabets) == ['eng', 'jpn']
+    assert ('ㄱ', '.-..') in code_list.get_rows('kor')
+    assert 'kor' in registry.alphabets
+
+
+def test_search_by_prefix():
+    code_list = CodeList()
+    rows = code_list.get_rows('eng')
+    assert [rows[n] for n in code_list.search('eng', 'A')] == [('a', '.-')]
+
+
+def test_search_between_positions():
+    code_list = CodeList()
+    everything = list(code_list.search('eng', '.'))
+    assert list(code_list.search_between('eng', '.', 0, 10)) == [n for n in everything if n < 10]
+    assert list(code_list.search_between('eng', '.', 10, 30)) == [n for n in everything if 10 <= n < 30]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_correct
+"""
+
+# Import modules ===================================================
+from morse_codec import decode_text
+from morse_correct import correction_index, decode_corrected
+
+
+# Declare tests ====================================================
+def test_one_edit_is_corrected():
+    assert decode_corrected('.... . .-.. .-.. ----', 'eng') == 'hello'  # '---' with a dash added
+
+
+def test_unknown_marker_passes_through():
+    assert decode_corrected('.- [?] -...', 'eng') == 'a[?]b'
+
+
+def test_tokens_which_are_not_morse_are_not_corrected():
+    index = correction_index('eng')
+    for token in ('[?]', 'x', '?', '.x', '.-?'):
+        assert index.nearest(token) is None
+    assert decode_corrected('.- x ? -...', 'eng') == decode_text('.- x ? -...', 'eng')
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_live
+"""
+
+# Import modules ===================================================
+import random
+
+import pytest
+
+from morse_codec import convert
+from morse_live import IncrementalTranslator
+
+
+# Declare tests ====================================================
+@pytest.mark.parametrize('direction, alphabet', [('eng2morse', 'abc .,?'),
+                                                 ('morse2eng', '.- '),
+                                                 ('jpn2morse', 'かがは゛゜ '),
+                                                 ('morse2jpn', '.-- ')])
+def test_edits_keep_the_lines_of_the_blocks(direction, alphabet):
+    rng = random.Random(direction)
+    translator = IncrementalTranslator(direction, block_size=8)
+    text = ''
+    lines = []
+    for _ in range(300):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, min(len(text), start + 10))
+        replacement = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        text = text[:start] + replacement + text[end:]
+        first, count, outputs = translator.edit(start, end, replacement)
+        lines[first:first + count] = outputs
+        assert translator.current == text
+        assert lines == translator.outputs
+        assert ''.join(lines) == translator.output == convert(text, direction)
+
+
+def test_update_returns_the_changed_range():
+    translator = IncrementalTranslator('eng2morse', block_size=4)
+    output = ''
+    for text in ['hello world', 'hello, world', 'help', '']:
+        start, end, replacement = translator.update(text)
+        output = output[:start] + replacement + output[end:]
+        assert output == convert(text, 'eng2morse')
+    assert translator.update('') is None
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_parallel
+"""
+
+# Import modules ===================================================
+import pytest
+
+from morse_codec import convert
+from morse_parallel import safe_chunks
+
+
+# Declare tests ====================================================
+@pytest.mark.parametrize('direction, text', [('morse2eng', '.- ' + '-' * 100000 + ' -...'),
+                                             ('morse2jpn', '.-.. ' + '.. ' * 30000),
+                                             ('morse2jpn', '.-.. ..' + ' ' * 100000 + '.. -...'),
+                                             ('morse2eng', '-.-. ' + ' \n' * 50000 + '.-'),
+                                             ('jpn2morse', 'か' + '゛' * 100000)])
+def test_carry_stays_bounded(direction, text):
+    chunks = list(safe_chunks(iter([text[i:i + 100] for i in range(0, len(text), 100)]), direction, 1000))
+    assert max(map(len, chunks)) < 2000
+    assert ''.join(convert(chunk, direction) for chunk in chunks) == convert(text, direction)
+
+
+def test_whitespace_carry_is_collapsed():
+    chunks = list(safe_chunks((' ' * 1000 for _ in range(50)), 'morse2jpn', chunk_size=1000))
+    assert max(map(len, chunks)) < 2000
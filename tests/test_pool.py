@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_pool
+"""
+
+# Import modules ===================================================
+import queue
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from morse_codec import convert
+from morse_pool import TranslationPool
+
+
+TEXTS = ['sos', 'cq cq de ja1xyz', 'the quick brown fox', '73', 'hello world']
+BIG_TEXT = 'the quick brown fox jumps over the lazy dog ' * 100000  # keeps a worker busy for a while
+
+
+# Declare tests ====================================================
+def test_jobs_are_batched():
+    with TranslationPool(1) as pool:
+        futures = [pool.submit('eng2morse', text) for text in TEXTS * 40]  # queued before the worker is ready
+        assert [f.result(timeout=30) for f in futures] == [convert(t, 'eng2morse') for t in TEXTS * 40]
+        stats = pool.stats()
+    assert stats['submitted'] == stats['completed'] == 200
+    assert stats['failed'] == 0
+    assert stats['batches'] < 200
+    assert stats['jobs_per_batch'] > 1
+    assert stats['workers'][0]['jobs'] == 200
+
+
+def test_map_keeps_the_order():
+    codes = [convert(text, 'eng2morse') for text in TEXTS * 20]
+    with TranslationPool(2, batch_jobs=3) as pool:
+        assert list(pool.map('morse2eng', codes)) == [convert(code, 'morse2eng') for code in codes]
+
+
+def test_full_queue_pushes_back():
+    with TranslationPool(1, queue_size=1, batch_jobs=1) as pool:
+        futures = [pool.submit('eng2morse', BIG_TEXT)]
+        with pytest.raises(queue.Full):
+            for _ in range(100):
+                futures.append(pool.submit('eng2morse', 'sos', block=False))
+        assert len(futures) < 100
+        assert futures[0].result(timeout=60) == convert(BIG_TEXT, 'eng2morse')
+        assert all(f.result(timeout=60) == '... --- ... ' for f in futures[1:])
+
+
+def test_unknown_direction_fails_on_submit():
+    with TranslationPool(1) as pool:
+        with pytest.raises(ValueError):
+            pool.submit('xyz2morse', 'sos')
+
+
+def test_close_finishes_the_queued_jobs():
+    pool = TranslationPool(1)
+    futures = [pool.submit('jpn2morse', 'カタカナ %d' % n) for n in range(50)]
+    pool.close()
+    assert [f.result(timeout=0) for f in futures] == [convert('カタカナ %d' % n, 'jpn2morse') for n in range(50)]
+    assert not any(process.is_alive() for process in pool.processes)
+    with pytest.raises(RuntimeError):
+        pool.submit('eng2morse', 'sos')
+
+
+def test_dead_worker_fails_the_pending_jobs():
+    pool = TranslationPool(1)
+    assert pool.submit('eng2morse', 'sos').result(timeout=30) == '... --- ... '
+    futures = [pool.submit('eng2morse', BIG_TEXT) for _ in range(3)]
+    pool.processes[0].kill()
+    for future in futures:
+        with pytest.raises(BrokenProcessPool):
+            future.result(timeout=30)
+    with pytest.raises(BrokenProcessPool):
+        pool.submit('eng2morse', 'sos')
+    pool.close()
+    assert not pool.stats()['workers'][0]['alive']
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_segment
+"""
+
+# Import modules ===================================================
+import random
+
+import pytest
+
+from morse_codec import decode_text, encode_text, reverse_morse_eng, reverse_morse_jpn
+from morse_segment import Segmenter
+
+
+# Declare tests ====================================================
+@pytest.mark.parametrize('select, chars', [('eng', list(reverse_morse_eng)), ('jpn', list(reverse_morse_jpn))])
+def test_spaced_code_decodes_as_decode_text(select, chars):
+    segmenter = Segmenter(select)
+    rng = random.Random(0)
+    for _ in range(200):
+        code = encode_text(''.join(rng.choice(chars) for _ in range(rng.randrange(1, 40))), select)
+        assert segmenter.decode(code) == decode_text(code, select)
+
+
+def test_spaced_words_are_kept():
+    assert Segmenter('eng').decode(encode_text('fox jumps', 'eng')) == 'foxjumps'
+
+
+def test_missing_spaces_are_found():
+    code = encode_text('the weather', 'eng').replace(' ', '', 3)
+    assert Segmenter('eng').decode(code) == 'theweather'
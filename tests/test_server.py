@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of morse_server
+"""
+
+# Import modules ===================================================
+import asyncio
+
+import pytest
+
+from morse_server import TranslationServer
+
+
+# Declare functions for requests ===================================
+async def post(port, path, body):
+    """
+    Send one HTTP request on a new connection
+    :return: Tuple of (status, headers and body as bytes)
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = body.encode('utf-8')
+    writer.write(b'POST %s HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s'
+                 % (path.encode('ascii'), len(data), data))
+    response = await reader.read()
+    writer.close()
+    return int(response.split()[1]), response
+
+
+def serve(*requests):
+    """
+    Answer requests with a server started for the test
+    :param requests: Tuples of (path, body)
+    :return: List of (status, response)
+    """
+    async def run():
+        server = TranslationServer(http_port=0, tcp_port=None, workers=1)
+        await server.start()
+        try:
+            return [await post(server.http_port, path, body) for path, body in requests]
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+# Declare tests ====================================================
+@pytest.mark.parametrize('direction, body', [('morse2eng', ''), ('morse2eng', '  \n'), ('morse2jpn', ' '),
+                                             ('eng2morse', '')])
+def test_blank_input_is_refused_by_both_endpoints(direction, body):
+    (convert_status, converted), (stream_status, streamed) = serve(('/convert/' + direction, body),
+                                                                   ('/stream/' + direction, body))
+    assert convert_status == stream_status == 400
+    assert converted.endswith(b'The input is blank.\n')
+    assert streamed.endswith(b'The input is blank.\n')
+
+
+def test_stream_converts():
+    (status, response), = serve(('/stream/eng2morse', 'sos'))
+    assert status == 200
+    assert b'Transfer-Encoding: chunked' in response
+    assert b'... --- ... ' in response